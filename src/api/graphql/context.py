@@ -17,12 +17,22 @@ from src.api.graphql.dataloaders.dataloaders import DataLoaders
 from src.application.services.auth_service import AuthService
 from src.application.services.document_service import DocumentService
 from src.application.services.search_service import SearchService
+from src.config import settings
+from src.domain.interfaces.vector_repository import IVectorRepository
 from src.domain.models.user import User
+from src.infrastructure.caching.search_result_cache import (
+    SearchResultCache,
+    get_search_result_cache,
+)
 from src.infrastructure.embeddings.base import IEmbeddingService
 from src.infrastructure.embeddings.local_embeddings import get_embedding_service
+from src.infrastructure.persistence.repositories.memory_vector_repository import (
+    InMemoryVectorRepository,
+)
 from src.infrastructure.persistence.repositories.vector_repository import (
     VectorRepository,
 )
+from src.infrastructure.reranking.cross_encoder import get_reranker
 
 
 class GraphQLContext(BaseContext):
@@ -83,17 +93,35 @@ class GraphQLContext(BaseContext):
         return get_embedding_service()
 
     @cached_property
-    def vector_repository(self) -> VectorRepository:
+    def vector_repository(self) -> IVectorRepository:
         """
         向量儲存庫（Per-Request）
 
         ABP 對比：
         - ABP: services.AddTransient<IVectorRepository, VectorRepository>()
         - Python: 每個請求建立新實例，共用 session
+        - MEMORY_INDEX_ENABLED 時以程序內索引包裝（未載入的使用者仍使用 pgvector）
         """
         if self.db_session is None:
             raise RuntimeError("Database session not available")
-        return VectorRepository(self.db_session, self.embedding_service)
+        repository = VectorRepository(self.db_session, self.embedding_service)
+        if settings.memory_index_enabled:
+            return InMemoryVectorRepository(
+                repository, self.db_session, self.embedding_service.model_name
+            )
+        return repository
+
+    @cached_property
+    def search_result_cache(self) -> SearchResultCache | None:
+        """
+        搜尋結果快取（Singleton，SEARCH_CACHE_ENABLED 為 false 時不使用）
+
+        ABP 對比：
+        - ABP: services.AddSingleton<SearchResultCache>()
+        """
+        if not settings.search_cache_enabled:
+            return None
+        return get_search_result_cache()
 
     @cached_property
     def search_service(self) -> SearchService:
@@ -102,9 +130,14 @@ class GraphQLContext(BaseContext):
 
         ABP 對比：
         - ABP: services.AddTransient<ISearchAppService, SearchAppService>()
-        - Python: 每個請求建立新實例
+        - Python: 每個請求建立新實例，重新排序器為 Singleton（分數快取跨請求共用）
         """
-        return SearchService(self.embedding_service, self.vector_repository)
+        return SearchService(
+            self.embedding_service,
+            self.vector_repository,
+            get_reranker(),
+            self.search_result_cache,
+        )
 
     @cached_property
     def document_service(self) -> DocumentService:
@@ -117,7 +150,9 @@ class GraphQLContext(BaseContext):
         """
         if self.db_session is None:
             raise RuntimeError("Database session not available")
-        return DocumentService(self.db_session, self.vector_repository)
+        return DocumentService(
+            self.db_session, self.vector_repository, self.search_result_cache
+        )
 
     @property
     def current_user(self) -> User | None:
@@ -5,6 +5,7 @@ from src.api.graphql.context import GraphQLContext
 from src.api.graphql.permissions.auth import IsAuthenticated
 from src.api.graphql.types.document import DocumentType
 from src.api.graphql.types.inputs import CreateDocumentInput, UpdateDocumentInput
+from src.domain.models.document import ChunkingStrategy
 
 
 @strawberry.type
@@ -23,9 +24,46 @@ class DocumentMutation:
             title=input.title,
             content=input.content,
             user_id=user.id,
+            chunking_strategy=ChunkingStrategy(input.chunking_strategy.value),
         )
         return DocumentType.from_domain(doc)
 
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
+    async def create_documents(
+        self,
+        info: Info[GraphQLContext, None],
+        inputs: list[CreateDocumentInput],
+    ) -> list[DocumentType]:
+        """
+        批次建立文件（同一個交易，最多 500 份）
+
+        範例：
+        mutation {
+            createDocuments(inputs: [
+                { title: "A", content: "..." },
+                { title: "README", content: "# ...", chunkingStrategy: MARKDOWN },
+            ]) {
+                id indexingStatus
+            }
+        }
+        """
+        user = info.context.current_user
+        if not user:
+            raise Exception("Not authenticated")
+
+        docs = await info.context.document_service.create_documents(
+            documents=[
+                (
+                    input.title,
+                    input.content,
+                    ChunkingStrategy(input.chunking_strategy.value),
+                )
+                for input in inputs
+            ],
+            user_id=user.id,
+        )
+        return [DocumentType.from_domain(doc) for doc in docs]
+
     @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def update_document(
         self,
@@ -41,6 +79,11 @@ class DocumentMutation:
             title=input.title,
             content=input.content,
             user_id=user.id,
+            chunking_strategy=(
+                ChunkingStrategy(input.chunking_strategy.value)
+                if input.chunking_strategy is not None
+                else None
+            ),
         )
         return DocumentType.from_domain(doc)
 
@@ -3,7 +3,8 @@ from strawberry.types import Info
 
 from src.api.graphql.context import GraphQLContext
 from src.api.graphql.permissions.auth import IsAuthenticated
-from src.api.graphql.types.document import DocumentType
+from src.api.graphql.types.document import DocumentConnection, DocumentType
+from src.api.graphql.types.pagination import PageInfoType
 
 
 @strawberry.type
@@ -33,3 +34,23 @@ class DocumentQuery:
             offset=offset,
         )
         return [DocumentType.from_domain(doc) for doc in docs]
+
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def documents_connection(
+        self,
+        info: Info[GraphQLContext, None],
+        first: int = 10,
+        after: str | None = None,
+    ) -> DocumentConnection:
+        user = info.context.current_user
+        if not user:
+            return DocumentConnection(
+                edges=[], page_info=PageInfoType(has_next_page=False)
+            )
+
+        page = await info.context.document_service.list_documents_page(
+            user_id=user.id,
+            first=first,
+            after=after,
+        )
+        return DocumentConnection.from_page(page)
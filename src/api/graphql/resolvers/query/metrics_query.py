@@ -0,0 +1,101 @@
+"""
+指標 GraphQL Resolver
+
+ABP/HotChocolate 對比：
+- ABP: 通常由 /metrics 端點（Prometheus）提供
+- Python Strawberry: 以需認證的 Query 欄位提供快照
+"""
+
+import strawberry
+from strawberry.types import Info
+
+from src.api.graphql.context import GraphQLContext
+from src.api.graphql.permissions.auth import IsAuthenticated
+from src.api.graphql.types.metrics import (
+    CacheMetricsType,
+    EmbeddingBatcherMetricsType,
+    EmbeddingExecutorMetricsType,
+    IndexingWorkerMetricsType,
+    MetricsType,
+    RerankerMetricsType,
+)
+from src.application.services.indexing_worker import get_indexing_worker_pool
+from src.config import settings
+from src.infrastructure.caching.search_result_cache import get_search_result_cache
+from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.embeddings.batcher import MicroBatchingEmbeddingService
+from src.infrastructure.embeddings.executor import get_embedding_executor
+from src.infrastructure.embeddings.query_cache import CachingEmbeddingService
+from src.infrastructure.persistence.repositories.memory_vector_repository import (
+    tenant_index_stats,
+)
+from src.infrastructure.reranking.cross_encoder import get_reranker
+
+
+def _find_layer[T: IEmbeddingService](
+    service: IEmbeddingService, layer_type: type[T]
+) -> T | None:
+    """沿著 Decorator 鏈（inner）尋找指定類型的嵌入服務"""
+    current: IEmbeddingService | None = service
+    while current is not None:
+        if isinstance(current, layer_type):
+            return current
+        current = getattr(current, "inner", None)
+    return None
+
+
+@strawberry.type
+class MetricsQuery:
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    def metrics(self, info: Info[GraphQLContext, None]) -> MetricsType:
+        """
+        服務執行期指標
+
+        範例查詢：
+        query {
+            metrics {
+                embeddingExecutor { running queueDepth peakQueueDepth rejected }
+                embeddingBatcher { batches averageBatchSize largestBatch }
+                queryEmbeddingCache { hits misses evictions hitRate }
+                reranker { batches fallbacks cache { hitRate } }
+                tenantVectorIndex { entries bytes hitRate evictions }
+                searchResultCache { entries hits misses hitRate evictions }
+                indexingWorkers { workers batches indexed retried failed }
+            }
+        }
+        """
+        embedding_service = info.context.embedding_service
+        batcher = _find_layer(embedding_service, MicroBatchingEmbeddingService)
+        query_cache = _find_layer(embedding_service, CachingEmbeddingService)
+
+        return MetricsType(
+            embedding_executor=EmbeddingExecutorMetricsType.from_stats(
+                get_embedding_executor().stats()
+            ),
+            embedding_batcher=(
+                EmbeddingBatcherMetricsType.from_stats(batcher.stats())
+                if batcher
+                else None
+            ),
+            query_embedding_cache=(
+                CacheMetricsType.from_stats(query_cache.stats())
+                if query_cache
+                else None
+            ),
+            reranker=RerankerMetricsType.from_stats(get_reranker().stats()),
+            tenant_vector_index=(
+                CacheMetricsType.from_stats(tenant_index_stats())
+                if settings.memory_index_enabled
+                else None
+            ),
+            search_result_cache=(
+                CacheMetricsType.from_stats(get_search_result_cache().stats())
+                if settings.search_cache_enabled
+                else None
+            ),
+            indexing_workers=(
+                IndexingWorkerMetricsType.from_stats(get_indexing_worker_pool().stats())
+                if settings.indexing_workers > 0
+                else None
+            ),
+        )
@@ -9,11 +9,12 @@ ABP/HotChocolate 對比：
 import strawberry
 
 from src.api.graphql.resolvers.query.document_query import DocumentQuery
+from src.api.graphql.resolvers.query.metrics_query import MetricsQuery
 from src.api.graphql.resolvers.query.search_query import SearchQuery
 
 
 @strawberry.type
-class Query(DocumentQuery, SearchQuery):
+class Query(DocumentQuery, SearchQuery, MetricsQuery):
     @strawberry.field
     def health(self) -> str:
         return "ok"
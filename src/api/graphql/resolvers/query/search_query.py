@@ -12,12 +12,16 @@ from strawberry.types import Info
 
 from src.api.graphql.context import GraphQLContext
 from src.api.graphql.permissions.auth import IsAuthenticated
+from src.api.graphql.types.pagination import PageInfoType
 from src.api.graphql.types.search import (
     FindSimilarInput,
+    SearchDocumentsConnectionInput,
     SearchDocumentsInput,
+    SearchResultConnection,
     SearchResultType,
     SimilarDocumentType,
 )
+from src.domain.models.search_result import SearchMode, SearchRequest
 
 
 @strawberry.type
@@ -63,6 +67,17 @@ class SearchQuery:
                 score
             }
         }
+
+        混合搜尋（向量 + 關鍵字）：
+        query {
+            searchDocuments(input: { query: "ERR-4021 timeout", mode: HYBRID }) {
+                documentId
+                title
+                score
+            }
+        }
+
+        範圍搜尋請使用 searchDocumentsConnection(input: { rangeSearch: true, ... })
         """
         user = info.context.current_user
         if not user:
@@ -73,6 +88,10 @@ class SearchQuery:
             user_id=user.id,
             limit=input.limit,
             threshold=input.threshold,
+            ef_search=input.ef_search,
+            probes=input.probes,
+            mode=SearchMode(input.mode.value),
+            rerank=input.rerank,
         )
 
         return [
@@ -85,6 +104,137 @@ class SearchQuery:
             for r in results
         ]
 
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def search_documents_connection(
+        self,
+        info: Info[GraphQLContext, None],
+        input: SearchDocumentsConnectionInput,
+    ) -> SearchResultConnection:
+        """
+        語意搜尋（Relay cursor 分頁）
+
+        ABP/HotChocolate 對比：
+        [Query]
+        [Authorize]
+        [UsePaging]
+        public async Task<Connection<SearchResultType>> SearchDocumentsConnection(
+            [Service] ISearchAppService searchService,
+            SearchDocumentsConnectionInput input)
+
+        範例查詢：
+        query {
+            searchDocumentsConnection(input: {
+                query: "Python API", first: 20, after: "<上一頁的 endCursor>"
+            }) {
+                edges { cursor node { documentId title score } }
+                pageInfo { hasNextPage endCursor }
+            }
+        }
+
+        範圍搜尋（精確列出相似度 >= threshold 的所有文件，逐頁取到 hasNextPage 為 false）：
+        query {
+            searchDocumentsConnection(input: {
+                query: "Python API", threshold: 0.8, rangeSearch: true, first: 100
+            }) {
+                edges { cursor node { documentId score } }
+                pageInfo { hasNextPage endCursor }
+            }
+        }
+        """
+        user = info.context.current_user
+        if not user:
+            return SearchResultConnection(
+                edges=[], page_info=PageInfoType(has_next_page=False)
+            )
+
+        if input.range_search:
+            page = await info.context.search_service.range_search_documents(
+                query=input.query,
+                user_id=user.id,
+                threshold=input.threshold,
+                limit=input.first,
+                after=input.after,
+            )
+            return SearchResultConnection.from_page(page)
+
+        page = await info.context.search_service.search_documents_page(
+            query=input.query,
+            user_id=user.id,
+            first=input.first,
+            threshold=input.threshold,
+            after=input.after,
+            ef_search=input.ef_search,
+            probes=input.probes,
+        )
+        return SearchResultConnection.from_page(page)
+
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def search_documents_batch(
+        self,
+        info: Info[GraphQLContext, None],
+        inputs: list[SearchDocumentsInput],
+    ) -> list[list[SearchResultType]]:
+        """
+        批次語意搜尋：一次請求執行多個查詢，回傳與 inputs 同順序的結果列表
+
+        ABP/HotChocolate 對比：
+        [Query]
+        [Authorize]
+        public async Task<List<List<SearchResultType>>> SearchDocumentsBatch(
+            [Service] ISearchAppService searchService,
+            List<SearchDocumentsInput> inputs)
+        {
+            return await searchService.SearchDocumentsBatchAsync(inputs);
+        }
+
+        範例查詢：
+        query {
+            searchDocumentsBatch(inputs: [
+                { query: "Python API" },
+                { query: "ERR-4021 timeout", mode: HYBRID, limit: 5 }
+            ]) {
+                documentId
+                title
+                score
+            }
+        }
+
+        - 所有查詢文本以一次嵌入呼叫生成向量，向量搜尋在同一個 SQL 語句中執行
+        - 範圍搜尋請使用 searchDocumentsConnection 逐頁取得
+        """
+        user = info.context.current_user
+        if not user:
+            return []
+
+        batch = await info.context.search_service.search_documents_batch(
+            requests=[
+                SearchRequest(
+                    query=input.query,
+                    limit=input.limit,
+                    threshold=input.threshold,
+                    ef_search=input.ef_search,
+                    probes=input.probes,
+                    mode=SearchMode(input.mode.value),
+                    rerank=input.rerank,
+                )
+                for input in inputs
+            ],
+            user_id=user.id,
+        )
+
+        return [
+            [
+                SearchResultType(
+                    document_id=strawberry.ID(r.document_id),
+                    title=r.title,
+                    content_preview=r.content_preview,
+                    score=r.score,
+                )
+                for r in results
+            ]
+            for results in batch
+        ]
+
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def similar_documents(
         self,
@@ -121,6 +271,8 @@ class SearchQuery:
             document_id=str(input.document_id),
             user_id=user.id,
             limit=input.limit,
+            ef_search=input.ef_search,
+            probes=input.probes,
         )
 
         return [
@@ -1,10 +1,45 @@
 from datetime import datetime
+from enum import Enum
 
 import strawberry
 
+from src.api.graphql.types.pagination import PageInfoType
+from src.application.pagination import Page
 from src.domain.models.document import Document
 
 
+@strawberry.enum
+class IndexingStatusType(Enum):
+    """
+    文件的向量索引狀態
+
+    - PENDING: 等待背景索引，搜尋尚未反映最新內容
+    - INDEXED: 已索引
+    - FAILED: 索引失敗（更新文件後會重新排入）
+    """
+
+    PENDING = "pending"
+    INDEXED = "indexed"
+    FAILED = "failed"
+
+
+@strawberry.enum
+class ChunkingStrategyType(Enum):
+    """
+    文件的分塊方式
+
+    - TEXT: 依句子邊界（預設）
+    - MARKDOWN: 依標題分段，表格與程式碼區塊不拆散
+    - CODE: 依頂層定義（函式、類別）分塊
+    - CJK: 依中日韓標點分句，長段落依子句切開
+    """
+
+    TEXT = "text"
+    MARKDOWN = "markdown"
+    CODE = "code"
+    CJK = "cjk"
+
+
 @strawberry.type
 class DocumentType:
     id: strawberry.ID
@@ -13,6 +48,8 @@ class DocumentType:
     owner_id: str
     created_at: datetime | None = None
     updated_at: datetime | None = None
+    indexing_status: IndexingStatusType = IndexingStatusType.INDEXED
+    chunking_strategy: ChunkingStrategyType = ChunkingStrategyType.TEXT
 
     @classmethod
     def from_domain(cls, document: Document) -> "DocumentType":
@@ -23,4 +60,30 @@ class DocumentType:
             owner_id=document.owner_id,
             created_at=document.created_at,
             updated_at=document.updated_at,
+            indexing_status=IndexingStatusType(document.indexing_status.value),
+            chunking_strategy=ChunkingStrategyType(document.chunking_strategy.value),
+        )
+
+
+@strawberry.type
+class DocumentEdge:
+    node: DocumentType
+    cursor: str
+
+
+@strawberry.type
+class DocumentConnection:
+    edges: list[DocumentEdge]
+    page_info: PageInfoType
+
+    @classmethod
+    def from_page(cls, page: Page[Document]) -> "DocumentConnection":
+        return cls(
+            edges=[
+                DocumentEdge(
+                    node=DocumentType.from_domain(edge.node), cursor=edge.cursor
+                )
+                for edge in page.edges
+            ],
+            page_info=PageInfoType.from_page(page),
         )
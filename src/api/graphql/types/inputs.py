@@ -1,10 +1,13 @@
 import strawberry
 
+from src.api.graphql.types.document import ChunkingStrategyType
+
 
 @strawberry.input
 class CreateDocumentInput:
     title: str
     content: str
+    chunking_strategy: ChunkingStrategyType = ChunkingStrategyType.TEXT
 
 
 @strawberry.input
@@ -12,6 +15,8 @@ class UpdateDocumentInput:
     id: strawberry.ID
     title: str | None = None
     content: str | None = None
+    # 變更分塊方式時即使內容相同也會重新索引
+    chunking_strategy: ChunkingStrategyType | None = None
 
 
 @strawberry.input
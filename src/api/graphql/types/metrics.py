@@ -0,0 +1,182 @@
+"""
+服務指標 GraphQL 類型
+
+ABP/HotChocolate 對比：
+- ABP 通常透過 OpenTelemetry / Prometheus exporter 暴露指標
+- 這裡以 GraphQL 查詢提供輕量的執行期指標快照
+"""
+
+import strawberry
+
+from src.application.services.indexing_worker import IndexingWorkerStats
+from src.infrastructure.caching.lru_cache import CacheStats
+from src.infrastructure.embeddings.batcher import MicroBatchStats
+from src.infrastructure.embeddings.executor import EmbeddingExecutorStats
+from src.infrastructure.reranking.cross_encoder import RerankerStats
+
+
+@strawberry.type
+class EmbeddingExecutorMetricsType:
+    """
+    嵌入執行器指標
+
+    - queue_depth: 目前排隊中（尚未被 worker 執行）的請求數
+    - rejected: 因佇列已滿且等待逾時而被拒絕的請求數
+    """
+
+    kind: str
+    max_workers: int
+    max_queue: int
+    running: int
+    queue_depth: int
+    peak_queue_depth: int
+    completed: int
+    failed: int
+    rejected: int
+
+    @classmethod
+    def from_stats(
+        cls, stats: EmbeddingExecutorStats
+    ) -> "EmbeddingExecutorMetricsType":
+        return cls(
+            kind=stats.kind,
+            max_workers=stats.max_workers,
+            max_queue=stats.max_queue,
+            running=stats.running,
+            queue_depth=stats.queue_depth,
+            peak_queue_depth=stats.peak_queue_depth,
+            completed=stats.completed,
+            failed=stats.failed,
+            rejected=stats.rejected,
+        )
+
+
+@strawberry.type
+class EmbeddingBatcherMetricsType:
+    """
+    查詢嵌入微批次指標
+
+    - average_batch_size: 每次 encode 平均合併的查詢數
+    """
+
+    max_batch_size: int
+    max_wait_ms: float
+    pending: int
+    batches: int
+    items: int
+    largest_batch: int
+    average_batch_size: float
+
+    @classmethod
+    def from_stats(cls, stats: MicroBatchStats) -> "EmbeddingBatcherMetricsType":
+        return cls(
+            max_batch_size=stats.max_batch_size,
+            max_wait_ms=stats.max_wait_ms,
+            pending=stats.pending,
+            batches=stats.batches,
+            items=stats.items,
+            largest_batch=stats.largest_batch,
+            average_batch_size=stats.average_batch_size,
+        )
+
+
+@strawberry.type
+class CacheMetricsType:
+    """
+    快取指標
+
+    - hit_rate: hits / (hits + misses)
+    - evictions: 因筆數或記憶體上限被淘汰的項目數
+    - expirations: 因 TTL 過期被移除的項目數
+    """
+
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+
+    @classmethod
+    def from_stats(cls, stats: CacheStats) -> "CacheMetricsType":
+        return cls(
+            entries=stats.entries,
+            bytes=stats.bytes,
+            max_entries=stats.max_entries,
+            max_bytes=stats.max_bytes,
+            hits=stats.hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            expirations=stats.expirations,
+            hit_rate=stats.hit_rate,
+        )
+
+
+@strawberry.type
+class RerankerMetricsType:
+    """
+    重新排序指標
+
+    - scored_pairs: 送進 cross-encoder 的 (查詢, chunk) 數（不含快取命中）
+    - fallbacks: 超過時間預算、改用第一階段排序的次數
+    """
+
+    model_name: str
+    batches: int
+    scored_pairs: int
+    fallbacks: int
+    cache: CacheMetricsType
+
+    @classmethod
+    def from_stats(cls, stats: RerankerStats) -> "RerankerMetricsType":
+        return cls(
+            model_name=stats.model_name,
+            batches=stats.batches,
+            scored_pairs=stats.scored_pairs,
+            fallbacks=stats.fallbacks,
+            cache=CacheMetricsType.from_stats(stats.cache),
+        )
+
+
+@strawberry.type
+class IndexingWorkerMetricsType:
+    """
+    背景索引 worker 指標
+
+    - batches: 取出工作的次數（每次最多 INDEXING_BATCH_SIZE 份文件）
+    - retried / failed: 失敗後排定重試 / 重試次數用盡的文件數
+    """
+
+    workers: int
+    batches: int
+    indexed: int
+    retried: int
+    failed: int
+    largest_batch: int
+
+    @classmethod
+    def from_stats(cls, stats: IndexingWorkerStats) -> "IndexingWorkerMetricsType":
+        return cls(
+            workers=stats.workers,
+            batches=stats.batches,
+            indexed=stats.indexed,
+            retried=stats.retried,
+            failed=stats.failed,
+            largest_batch=stats.largest_batch,
+        )
+
+
+@strawberry.type
+class MetricsType:
+    """服務指標快照"""
+
+    embedding_executor: EmbeddingExecutorMetricsType
+    embedding_batcher: EmbeddingBatcherMetricsType | None = None
+    query_embedding_cache: CacheMetricsType | None = None
+    reranker: RerankerMetricsType | None = None
+    tenant_vector_index: CacheMetricsType | None = None
+    search_result_cache: CacheMetricsType | None = None
+    indexing_workers: IndexingWorkerMetricsType | None = None
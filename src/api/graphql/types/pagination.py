@@ -0,0 +1,34 @@
+"""
+分頁（Relay Connection）GraphQL 類型
+
+ABP/HotChocolate 對比：
+- HotChocolate: [UsePaging] 自動產生 XxxConnection / XxxEdge / PageInfo
+- Python Strawberry: 明確定義各 Connection 類型，共用 PageInfoType
+"""
+
+import strawberry
+
+from src.application.pagination import Page
+
+
+@strawberry.type
+class PageInfoType:
+    """
+    分頁資訊
+
+    ABP/HotChocolate 對比：
+    public class PageInfo
+    {
+        public bool HasNextPage { get; }
+        public string? EndCursor { get; }
+    }
+
+    只支援向後分頁：以 endCursor 作為下一次查詢的 after
+    """
+
+    has_next_page: bool
+    end_cursor: str | None = None
+
+    @classmethod
+    def from_page[T](cls, page: Page[T]) -> "PageInfoType":
+        return cls(has_next_page=page.has_next_page, end_cursor=page.end_cursor)
@@ -6,8 +6,30 @@ ABP/HotChocolate 對比：
 - Python Strawberry: @strawberry.type 裝飾器
 """
 
+from enum import Enum
+
 import strawberry
 
+from src.api.graphql.types.pagination import PageInfoType
+from src.application.pagination import Page
+from src.domain.models.search_result import SearchResult
+
+
+@strawberry.enum
+class SearchModeType(Enum):
+    """
+    搜尋模式
+
+    ABP/HotChocolate 對比：
+    public enum SearchMode { Vector, Hybrid }  // HotChocolate 自動對應為 GraphQL enum
+
+    - VECTOR: 向量相似度（預設）
+    - HYBRID: 向量 + 全文檢索，以 RRF 合併排名（score 為 RRF 分數）
+    """
+
+    VECTOR = "vector"
+    HYBRID = "hybrid"
+
 
 @strawberry.type
 class SearchResultType:
@@ -31,6 +53,53 @@ class SearchResultType:
     score: float
 
 
+@strawberry.type
+class SearchResultEdge:
+    """
+    搜尋結果分頁中的一筆
+
+    ABP/HotChocolate 對比：
+    - HotChocolate: Edge<SearchResultType>
+    """
+
+    node: SearchResultType
+    cursor: str
+
+
+@strawberry.type
+class SearchResultConnection:
+    """
+    搜尋結果分頁（Relay Connection）
+
+    ABP/HotChocolate 對比：
+    - HotChocolate: Connection<SearchResultType>（[UsePaging]）
+
+    cursor 為該筆結果的 (distance, chunk_id)（範圍搜尋為 (score, document_id)），
+    以 pageInfo.endCursor 作為 after 取得下一頁
+    """
+
+    edges: list[SearchResultEdge]
+    page_info: PageInfoType
+
+    @classmethod
+    def from_page(cls, page: Page[SearchResult]) -> "SearchResultConnection":
+        return cls(
+            edges=[
+                SearchResultEdge(
+                    node=SearchResultType(
+                        document_id=strawberry.ID(edge.node.document_id),
+                        title=edge.node.title,
+                        content_preview=edge.node.content_preview,
+                        score=edge.node.score,
+                    ),
+                    cursor=edge.cursor,
+                )
+                for edge in page.edges
+            ],
+            page_info=PageInfoType.from_page(page),
+        )
+
+
 @strawberry.type
 class SimilarDocumentType:
     """
@@ -64,12 +133,59 @@ class SearchDocumentsInput:
         public string Query { get; set; }
         public int Limit { get; set; } = 10;
         public float? Threshold { get; set; }
+        public int? EfSearch { get; set; }
+        public int? Probes { get; set; }
+        public SearchMode Mode { get; set; } = SearchMode.Vector;
+        public bool Rerank { get; set; }
     }
+
+    ef_search / probes：覆寫此次 ANN 搜尋的召回率參數（越大越準、越慢）
+    （範圍搜尋使用 searchDocumentsConnection 的 rangeSearch）
+    mode：HYBRID 時同時比對關鍵字，適合查詢識別字、錯誤代碼等精確字詞
+    rerank：以 cross-encoder 重新評分第一階段的前幾名（score 改為 cross-encoder 分數；
+    超過時間預算時回傳第一階段的排序）
     """
 
     query: str
     limit: int = 10
     threshold: float | None = None
+    ef_search: int | None = None
+    probes: int | None = None
+    mode: SearchModeType = SearchModeType.VECTOR
+    rerank: bool = False
+
+
+@strawberry.input
+class SearchDocumentsConnectionInput:
+    """
+    語意搜尋分頁輸入
+
+    ABP/HotChocolate 對比：
+    [InputType]
+    public class SearchDocumentsConnectionInput
+    {
+        [Required]
+        public string Query { get; set; }
+        public int First { get; set; } = 10;
+        public string? After { get; set; }
+        public float? Threshold { get; set; }
+        public int? EfSearch { get; set; }
+        public int? Probes { get; set; }
+        public bool RangeSearch { get; set; }
+    }
+
+    first：每頁筆數（1 ~ 100）；after：上一頁的 pageInfo.endCursor
+    range_search：精確列出相似度 >= threshold 的所有文件，依分數分頁（cursor 與一般搜尋不通用，
+    不使用 ef_search / probes）
+    """
+
+    query: str
+    first: int = 10
+    after: str | None = None
+    threshold: float | None = None
+    ef_search: int | None = None
+    probes: int | None = None
+    range_search: bool = False
 
 
 @strawberry.input
@@ -84,8 +200,12 @@ class FindSimilarInput:
         [Required]
         public Guid DocumentId { get; set; }
         public int Limit { get; set; } = 5;
+        public int? EfSearch { get; set; }
+        public int? Probes { get; set; }
     }
     """
 
     document_id: strawberry.ID
     limit: int = 5
+    ef_search: int | None = None
+    probes: int | None = None
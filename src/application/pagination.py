@@ -0,0 +1,74 @@
+"""
+Keyset（cursor）分頁
+
+ABP 對比：
+- ABP: PagedResultDto<T> + SkipCount / MaxResultCount（offset 分頁）
+- Python: keyset 分頁，cursor 為「最後一筆的排序鍵」編碼後的字串
+
+設計說明：
+- offset 分頁每一頁都要重新掃描並丟棄前面的資料，頁數越後面越慢
+- keyset 分頁以 WHERE (排序鍵) > (cursor) 接續，每一頁成本相同
+- cursor 對 client 是不透明字串（base64url 編碼的 JSON 陣列）
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from src.domain.exceptions import ValidationError
+
+CursorValue = str | int | float
+
+
+@dataclass
+class Edge[T]:
+    """
+    分頁中的一筆資料與其 cursor
+
+    ABP 對比：
+    - HotChocolate: Edge<T>（Relay Connection 規格）
+    """
+
+    node: T
+    cursor: str
+
+
+@dataclass
+class Page[T]:
+    """
+    一頁資料
+
+    ABP 對比：
+    - HotChocolate: Connection<T>（edges + pageInfo）
+    """
+
+    edges: list[Edge[T]]
+    has_next_page: bool
+
+    @property
+    def end_cursor(self) -> str | None:
+        return self.edges[-1].cursor if self.edges else None
+
+
+def encode_cursor(*values: CursorValue) -> str:
+    """排序鍵 → 不透明的 cursor 字串"""
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> tuple[CursorValue, ...]:
+    """
+    cursor 字串 → 排序鍵
+
+    格式錯誤時拋出 ValidationError（client 傳入的值不可信任）
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("Invalid cursor") from None
+
+    if not isinstance(values, list) or len(values) != arity:
+        raise ValidationError("Invalid cursor")
+    return tuple(values)
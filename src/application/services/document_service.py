@@ -5,19 +5,44 @@ ABP 對比：
 - ABP: public class DocumentAppService : ApplicationService, IDocumentAppService
 - ABP 使用 IRepository<Document, Guid> 自動注入
 - ABP 使用 ILocalEventBus 發布 DocumentCreatedEvent 等事件
-- Python: 直接呼叫 SearchService 進行向量索引
+- Python: 在同一個交易中排入索引工作（outbox），由背景 worker 進行向量索引
+  （INDEXING_MODE=inline 時直接在 mutation 中索引）
 """
 
+from datetime import datetime
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.exceptions import AuthorizationError, NotFoundError
-from src.domain.models.document import Document
+from src.application.pagination import Edge, Page, decode_cursor, encode_cursor
+from src.application.services.indexing_worker import (
+    INDEXING_MODES,
+    wake_indexing_workers,
+)
+from src.config import settings
+from src.domain.exceptions import AuthorizationError, NotFoundError, ValidationError
+from src.domain.models.document import ChunkingStrategy, Document, IndexingStatus
 from src.domain.interfaces.vector_repository import IVectorRepository
+from src.infrastructure.caching.search_result_cache import SearchResultCache
+from src.infrastructure.persistence.database import run_after_commit
 from src.infrastructure.persistence.repositories.document_repository import (
     DocumentRepository,
 )
+from src.infrastructure.persistence.repositories.indexing_job_repository import (
+    IndexingJobRepository,
+)
+
+# keyset 分頁每頁的最大筆數
+_MAX_PAGE_SIZE = 100
+
+# createDocuments 每次的最大文件數（更大的匯入請使用 src.cli.ingest）
+_MAX_BULK_CREATE = 500
+
+
+def _document_cursor(document: Document) -> str:
+    """(created_at, id)：由資料庫讀出的文件兩者皆有值"""
+    created_at = document.created_at.isoformat() if document.created_at else ""
+    return encode_cursor(created_at, document.id or "")
 
 
 class DocumentService:
@@ -34,6 +59,7 @@ class DocumentService:
         self,
         session: AsyncSession,
         vector_repository: IVectorRepository | None = None,
+        result_cache: SearchResultCache | None = None,
     ):
         """
         初始化文件服務
@@ -50,10 +76,19 @@ class DocumentService:
         }
 
         注意：vector_repository 是可選的，便於向後相容
+        result_cache：文件變更 commit 後遞增該使用者的搜尋快取版本號
         """
         self._session = session
         self._doc_repo = DocumentRepository(session)
+        self._job_repo = IndexingJobRepository(session)
         self._vector_repo = vector_repository
+        self._result_cache = result_cache
+        if settings.indexing_mode not in INDEXING_MODES:
+            raise ValueError(f"Unknown indexing mode: {settings.indexing_mode}")
+        # 背景索引：mutation 只排入工作，向量由 worker 寫入
+        self._background_indexing = (
+            vector_repository is not None and settings.indexing_mode == "background"
+        )
 
     async def get_document(self, id: str, user_id: str) -> Document:
         document = await self._doc_repo.get_by_id(id)
@@ -73,11 +108,51 @@ class DocumentService:
     ) -> list[Document]:
         return await self._doc_repo.get_by_owner_id(user_id, limit, offset)
 
+    async def list_documents_page(
+        self,
+        user_id: str,
+        first: int = 10,
+        after: str | None = None,
+    ) -> Page[Document]:
+        """
+        文件列表（keyset 分頁）
+
+        ABP 對比：
+        - ABP: PagedResultDto<DocumentDto> GetListAsync(PagedResultRequestDto input)
+          （SkipCount 越大越慢）
+        - Python: cursor 為上一頁最後一筆的 (created_at, id)，每一頁成本相同
+        """
+        if not 1 <= first <= _MAX_PAGE_SIZE:
+            raise ValidationError(f"first must be between 1 and {_MAX_PAGE_SIZE}")
+
+        position: tuple[datetime, str] | None = None
+        if after is not None:
+            created_at, document_id = decode_cursor(after, 2)
+            if not isinstance(created_at, str) or not isinstance(document_id, str):
+                raise ValidationError("Invalid cursor")
+            try:
+                position = (datetime.fromisoformat(created_at), document_id)
+            except ValueError:
+                raise ValidationError("Invalid cursor") from None
+
+        # 多取一筆以判斷是否還有下一頁
+        documents = await self._doc_repo.get_page_by_owner_id(
+            user_id, first + 1, position
+        )
+        return Page(
+            edges=[
+                Edge(node=document, cursor=_document_cursor(document))
+                for document in documents[:first]
+            ],
+            has_next_page=len(documents) > first,
+        )
+
     async def create_document(
         self,
         title: str,
         content: str,
         user_id: str,
+        chunking_strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
     ) -> Document:
         """
         建立文件並索引向量
@@ -95,33 +170,83 @@ class DocumentService:
             return ObjectMapper.Map<DocumentDto>(document);
         }
 
-        Python 版本：直接呼叫向量儲存庫，簡化架構
+        Python 版本：文件與索引工作在同一個交易中寫入（outbox），
+        commit 後由背景 worker 索引，回傳的文件 indexing_status 為 pending
         """
         document = Document(
             id=str(uuid4()),
             title=title,
             content=content,
             owner_id=user_id,
+            indexing_status=self._initial_indexing_status(),
+            chunking_strategy=chunking_strategy,
         )
         saved_doc = await self._doc_repo.save(document)
 
-        # 索引向量（如果啟用）
-        if self._vector_repo:
-            await self._vector_repo.index_document(
-                document_id=saved_doc.id,
-                title=saved_doc.title,
-                content=saved_doc.content,
-                owner_id=user_id,
-            )
+        await self._index(saved_doc)
 
+        self._invalidate_search_results(user_id)
         return saved_doc
 
+    async def create_documents(
+        self,
+        documents: list[tuple[str, str, ChunkingStrategy]],
+        user_id: str,
+    ) -> list[Document]:
+        """
+        批次建立文件：documents 為 (title, content, chunking_strategy)
+
+        ABP 對比：
+        public async Task<List<DocumentDto>> CreateManyAsync(List<CreateDocumentInput> input)
+        {
+            await _documentRepository.InsertManyAsync(documents, autoSave: true);
+            await _localEventBus.PublishAsync(new DocumentsCreatedEvent(ids));
+        }
+
+        - 所有文件以一次 COPY / 多列 INSERT 寫入，索引工作以一次 upsert 排入
+        - inline 模式時以一次 index_documents 索引（所有新 chunks 一次嵌入）
+        - 整批在同一個交易中，任何一筆失敗時全部不寫入
+        """
+        if not documents:
+            return []
+        if len(documents) > _MAX_BULK_CREATE:
+            raise ValidationError(
+                f"Cannot create more than {_MAX_BULK_CREATE} documents at once"
+            )
+
+        status = self._initial_indexing_status()
+        saved_docs = await self._doc_repo.add_many(
+            [
+                Document(
+                    id=str(uuid4()),
+                    title=title,
+                    content=content,
+                    owner_id=user_id,
+                    indexing_status=status,
+                    chunking_strategy=chunking_strategy,
+                )
+                for title, content, chunking_strategy in documents
+            ]
+        )
+
+        if self._background_indexing:
+            await self._job_repo.enqueue_many(
+                [str(doc.id) for doc in saved_docs], user_id
+            )
+            run_after_commit(self._session, wake_indexing_workers)
+        elif self._vector_repo:
+            await self._vector_repo.index_documents(saved_docs)
+
+        self._invalidate_search_results(user_id)
+        return saved_docs
+
     async def update_document(
         self,
         id: str,
         title: str | None,
         content: str | None,
         user_id: str,
+        chunking_strategy: ChunkingStrategy | None = None,
     ) -> Document:
         """
         更新文件並重新索引向量
@@ -146,24 +271,65 @@ class DocumentService:
         if document.owner_id != user_id:
             raise AuthorizationError("Not authorized to update this document")
 
+        # title、content 與分塊方式都未變（例如重送相同的 title/content）視為 no-op，
+        # 不寫入資料庫也不重新索引
+        previous = self._indexed_fields(document)
+
         if title is not None:
             document.title = title
         if content is not None:
             document.content = content
+        if chunking_strategy is not None:
+            document.chunking_strategy = chunking_strategy
+
+        if self._indexed_fields(document) == previous:
+            return document
 
+        document.indexing_status = self._initial_indexing_status()
         saved_doc = await self._doc_repo.save(document)
 
-        # 重新索引向量（如果內容有變更）
-        if self._vector_repo and (title is not None or content is not None):
-            await self._vector_repo.index_document(
-                document_id=saved_doc.id,
-                title=saved_doc.title,
-                content=saved_doc.content,
-                owner_id=user_id,
-            )
+        # 重新索引向量（增量：只處理內容有變更的 chunks）
+        await self._index(saved_doc)
 
+        self._invalidate_search_results(user_id)
         return saved_doc
 
+    def _initial_indexing_status(self) -> IndexingStatus:
+        if self._background_indexing:
+            return IndexingStatus.PENDING
+        return IndexingStatus.INDEXED
+
+    async def _index(self, document: Document) -> None:
+        """
+        背景模式：排入索引工作，commit 後喚醒本行程的 worker
+        inline 模式：直接索引（mutation 的延遲包含分塊與嵌入）
+        """
+        if self._vector_repo is None or document.id is None:
+            return
+
+        if self._background_indexing:
+            await self._job_repo.enqueue(document.id, document.owner_id)
+            run_after_commit(self._session, wake_indexing_workers)
+            return
+
+        await self._vector_repo.index_document(
+            document_id=document.id,
+            title=document.title,
+            content=document.content,
+            owner_id=document.owner_id,
+            chunking_strategy=document.chunking_strategy,
+        )
+
+    @staticmethod
+    def _indexed_fields(document: Document) -> tuple[str, str, ChunkingStrategy]:
+        """
+        決定儲存內容與索引結果的欄位
+
+        逐欄比較而不是比較 title + content 的雜湊：
+        串接後的文本無法區分 title 與 content 的邊界（例如 "a" + "b\n\nc" 與 "a\n\nb" + "c"）
+        """
+        return (document.title, document.content, document.chunking_strategy)
+
     async def delete_document(self, id: str, user_id: str) -> bool:
         """
         刪除文件和向量索引
@@ -193,4 +359,19 @@ class DocumentService:
         if self._vector_repo:
             await self._vector_repo.delete_document(id)
 
+        self._invalidate_search_results(user_id)
         return await self._doc_repo.delete(id)
+
+    def _invalidate_search_results(self, owner_id: str) -> None:
+        """
+        commit 後遞增使用者的搜尋快取版本號
+
+        ABP 對比：
+        _unitOfWork.OnCompleted(() => _searchCache.BumpVersion(ownerId));
+
+        在 commit 前遞增時，並行的搜尋可能以新版本號快取到尚未 commit 前的結果
+        """
+        if self._result_cache is None:
+            return
+        cache = self._result_cache
+        run_after_commit(self._session, lambda: cache.bump(owner_id))
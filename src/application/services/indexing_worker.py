@@ -0,0 +1,319 @@
+"""
+背景索引 Worker Pool
+
+ABP 對比：
+- ABP: AsyncPeriodicBackgroundWorkerBase + IBackgroundJobManager（AbpBackgroundJobs 資料表）
+- Python: asyncio task 輪詢 indexing_jobs（outbox），以 FOR UPDATE SKIP LOCKED 分工
+
+設計說明：
+- DocumentService 在文件寫入的同一個交易中排入工作，mutation 不需要等待嵌入
+- 每次取出最多 batch_size 份文件，所有新 chunks 合併為一次嵌入呼叫（index_documents）
+- 工作存在資料庫中，行程重新啟動後仍會處理；中斷時的工作在租約到期後重新取出
+- 批次失敗時逐份重試，找出失敗的文件，其餘文件照常完成
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.domain.interfaces.vector_repository import IVectorRepository
+from src.infrastructure.caching.search_result_cache import get_search_result_cache
+from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.embeddings.local_embeddings import get_embedding_service
+from src.infrastructure.persistence.database import (
+    async_session_factory,
+    run_after_commit,
+)
+from src.infrastructure.persistence.embedding_guard import (
+    EmbeddingModelMismatchError,
+)
+from src.infrastructure.persistence.repositories.document_repository import (
+    DocumentRepository,
+)
+from src.infrastructure.persistence.repositories.indexing_job_repository import (
+    IndexingJob,
+    IndexingJobRepository,
+)
+from src.infrastructure.persistence.repositories.memory_vector_repository import (
+    InMemoryVectorRepository,
+)
+from src.infrastructure.persistence.repositories.vector_repository import (
+    VectorRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEXING_MODES = ("background", "inline")
+
+# 錯誤訊息寫入 indexing_jobs.last_error 的長度上限
+_MAX_ERROR_LENGTH = 2000
+
+# 重試間隔上限（秒）
+_MAX_RETRY_DELAY = 3600
+
+
+@dataclass
+class IndexingWorkerStats:
+    """
+    Worker Pool 指標快照
+
+    - batches: 取出工作的次數；indexed / retried / failed 以文件數計
+    """
+
+    workers: int
+    batches: int
+    indexed: int
+    retried: int
+    failed: int
+    largest_batch: int
+
+
+class IndexingWorkerPool:
+    """
+    背景索引 Worker Pool
+
+    ABP 對比：
+    public class IndexingWorker : AsyncPeriodicBackgroundWorkerBase
+    {
+        protected override async Task DoWorkAsync(PeriodicBackgroundWorkerContext context)
+        {
+            var jobs = await _jobRepository.ClaimAsync(batchSize);
+            await _vectorRepository.IndexDocumentsAsync(documents);
+            await _jobRepository.CompleteAsync(jobs);
+        }
+    }
+
+    - 沒有工作時等待 poll_interval 秒；同一行程內排入工作時以 wake() 立即喚醒
+    - 每個 worker 各自取出工作，多個行程的 worker 也可同時執行
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        embedding_service: IEmbeddingService,
+        workers: int = 2,
+        batch_size: int = 16,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 5,
+    ):
+        self._session_factory = session_factory
+        self._embedding = embedding_service
+        self._workers = workers
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._retry_base_seconds = retry_base_seconds
+
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+        self._batches = 0
+        self._indexed = 0
+        self._retried = 0
+        self._failed = 0
+        self._largest_batch = 0
+
+    def start(self) -> None:
+        """應用程式啟動時建立 worker tasks"""
+        if self._tasks:
+            return
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"indexing-worker-{number}")
+            for number in range(self._workers)
+        ]
+        logger.info(f"Started {self._workers} indexing workers")
+
+    async def stop(self) -> None:
+        """
+        應用程式關閉時停止 worker：處理中的批次完成後結束
+
+        尚未取出的工作留在資料表中，下次啟動（或其他行程）繼續處理
+        """
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Stopped indexing workers")
+
+    def wake(self) -> None:
+        """有新工作：喚醒等待中的 worker（不必等到下一次輪詢）"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self.run_once()
+            except EmbeddingModelMismatchError as exc:
+                # 全庫重新嵌入已切換：以舊模型寫入的向量會混進新欄位，停止處理
+                logger.error(f"Stopping indexing worker: {exc.message}")
+                return
+            except Exception:
+                # 資料庫暫時無法連線等錯誤：等待下一次輪詢後再試
+                logger.exception("Indexing worker failed to process jobs")
+                claimed = 0
+
+            # 取滿一批表示可能還有工作，直接繼續
+            if claimed < self._batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                except TimeoutError:
+                    pass
+                if not self._stopping:
+                    self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """
+        取出並處理一批工作，回傳取出的工作數
+
+        取出為獨立的短交易（commit 後才開始嵌入），處理期間不持有資料列鎖
+        """
+        async with self._session_factory() as session:
+            jobs = await IndexingJobRepository(session).claim(
+                self._batch_size, self._lease_seconds
+            )
+            await session.commit()
+        if not jobs:
+            return 0
+
+        self._batches += 1
+        self._largest_batch = max(self._largest_batch, len(jobs))
+        try:
+            await self._index(jobs)
+        except EmbeddingModelMismatchError:
+            await self._release(jobs)
+            raise
+        except Exception as exc:  # noqa: BLE001  任何錯誤都要記錄到工作上（重試或標記 failed）
+            if len(jobs) == 1:
+                await self._handle_failure(jobs[0], exc)
+            else:
+                # 逐份重試，找出造成失敗的文件
+                logger.warning(
+                    f"Indexing batch of {len(jobs)} documents failed, "
+                    f"retrying individually: {exc}"
+                )
+                for position, job in enumerate(jobs):
+                    try:
+                        await self._index([job])
+                    except EmbeddingModelMismatchError:
+                        await self._release(jobs[position:])
+                        raise
+                    except Exception as job_exc:  # noqa: BLE001  同上，逐份記錄
+                        await self._handle_failure(job, job_exc)
+        return len(jobs)
+
+    async def _index(self, jobs: list[IndexingJob]) -> None:
+        """在同一個交易中索引文件並完成工作"""
+        async with self._session_factory() as session:
+            documents = await DocumentRepository(session).get_by_ids(
+                [job.document_id for job in jobs]
+            )
+            # 已刪除的文件不會被取出（工作隨文件 CASCADE 刪除），這裡只處理仍存在的
+            await self._vector_repository(session).index_documents(documents)
+            completed = await IndexingJobRepository(session).complete(jobs)
+
+            owner_ids = {job.owner_id for job in jobs}
+            run_after_commit(session, self._invalidate_search_results(owner_ids))
+            await session.commit()
+
+        self._indexed += len(completed)
+        logger.debug(f"Indexed {len(completed)} of {len(jobs)} claimed documents")
+
+    async def _release(self, jobs: list[IndexingJob]) -> None:
+        """不是文件的問題（嵌入模型已切換）：放回工作，不計入嘗試次數，由新設定的行程處理"""
+        async with self._session_factory() as session:
+            await IndexingJobRepository(session).release(jobs)
+            await session.commit()
+
+    async def _handle_failure(self, job: IndexingJob, exc: Exception) -> None:
+        """記錄失敗：未超過次數時以指數退避重試，否則將文件標記為 failed"""
+        error = f"{type(exc).__name__}: {exc}"[:_MAX_ERROR_LENGTH]
+        async with self._session_factory() as session:
+            jobs = IndexingJobRepository(session)
+            if job.attempts < self._max_attempts:
+                delay = min(
+                    self._retry_base_seconds * 2 ** (job.attempts - 1),
+                    _MAX_RETRY_DELAY,
+                )
+                await jobs.retry(job, error, delay)
+                self._retried += 1
+                logger.warning(
+                    f"Indexing document {job.document_id} failed "
+                    f"(attempt {job.attempts}), retrying in {delay:.0f}s: {error}"
+                )
+            elif await jobs.fail(job, error):
+                self._failed += 1
+                logger.error(
+                    f"Indexing document {job.document_id} failed after "
+                    f"{job.attempts} attempts: {error}"
+                )
+            await session.commit()
+
+    def _vector_repository(self, session: AsyncSession) -> IVectorRepository:
+        """與 GraphQLContext.vector_repository 相同的組裝（commit 後失效程序內索引）"""
+        repository = VectorRepository(session, self._embedding)
+        if settings.memory_index_enabled:
+            return InMemoryVectorRepository(
+                repository, session, self._embedding.model_name
+            )
+        return repository
+
+    @staticmethod
+    def _invalidate_search_results(owner_ids: set[str]) -> Callable[[], None]:
+        """新的 chunks 已 commit：遞增這些使用者的搜尋快取版本號"""
+
+        def invalidate() -> None:
+            if not settings.search_cache_enabled:
+                return
+            cache = get_search_result_cache()
+            for owner_id in owner_ids:
+                cache.bump(owner_id)
+
+        return invalidate
+
+    def stats(self) -> IndexingWorkerStats:
+        return IndexingWorkerStats(
+            workers=len(self._tasks),
+            batches=self._batches,
+            indexed=self._indexed,
+            retried=self._retried,
+            failed=self._failed,
+            largest_batch=self._largest_batch,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_indexing_worker_pool() -> IndexingWorkerPool:
+    """
+    取得背景索引 Worker Pool（Singleton）
+
+    ABP 對比：
+    - ABP: context.AddBackgroundWorkerAsync<IndexingWorker>()
+    """
+    return IndexingWorkerPool(
+        async_session_factory,
+        get_embedding_service(),
+        workers=settings.indexing_workers,
+        batch_size=settings.indexing_batch_size,
+        poll_interval=settings.indexing_poll_interval_seconds,
+        lease_seconds=settings.indexing_lease_seconds,
+        max_attempts=settings.indexing_max_attempts,
+        retry_base_seconds=settings.indexing_retry_base_seconds,
+    )
+
+
+def wake_indexing_workers() -> None:
+    """排入工作的交易 commit 後呼叫；本行程沒有啟動 worker 時不做任何事"""
+    if get_indexing_worker_pool.cache_info().currsize:
+        get_indexing_worker_pool().wake()
@@ -0,0 +1,216 @@
+"""
+大量文件匯入服務（串流 + 管線化）
+
+ABP 對比：
+- ABP: 通常以 IBackgroundJob 搭配 EFCore.BulkExtensions 的 BulkInsertAsync 匯入
+- Python: asyncio 管線 + Process Pool 分塊 + COPY 寫入
+
+設計說明：
+- 來源以固定大小的批次串流讀取，同時最多保留 prefetch + 2 批在記憶體中
+- 分塊是 CPU 密集的純 Python 運算，在 Process Pool 中平行執行，不佔用 event loop
+- 每批所有文件的 chunks 以一次嵌入呼叫取得向量（跨文件的大批次）
+- 每批的文件、chunks 與文件層級嵌入以 COPY 在同一個交易中寫入，失敗時整批撤銷
+- 讀取 / 分塊下一批與嵌入 / 寫入目前這批同時進行
+"""
+
+import asyncio
+import contextlib
+import itertools
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.models.document import ChunkingStrategy, Document, IndexingStatus
+from src.infrastructure.chunking.registry import get_text_chunker
+from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.persistence.repositories.document_repository import (
+    DocumentRepository,
+)
+from src.infrastructure.persistence.repositories.vector_repository import (
+    VectorRepository,
+)
+
+# (title, content, chunking_strategy)
+IngestItem = tuple[str, str, ChunkingStrategy]
+
+
+@dataclass
+class IngestStats:
+    """
+    匯入進度 / 結果
+
+    ABP 對比：
+    - ABP: 通常以 ILogger 輸出進度，或寫入 BackgroundJobInfo
+    """
+
+    documents: int = 0
+    chunks: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+def _chunk_documents(documents: list[IngestItem]) -> list[list[str]]:
+    """
+    在 Process Pool 中執行：與 VectorRepository 索引時相同的分塊（title + content）
+
+    分塊器（含 tokenizer）在每個 worker 行程中依分塊方式各建立一次，不需要 pickle
+    """
+    return [
+        list(get_text_chunker(strategy).chunk(f"{title}\n\n{content}"))
+        for title, content, strategy in documents
+    ]
+
+
+class IngestService:
+    """
+    大量文件匯入服務
+
+    ABP 對比：
+    public class DocumentImportAppService : ApplicationService
+    {
+        public async Task<ImportResult> ImportAsync(IAsyncEnumerable<ImportItem> items)
+        {
+            await foreach (var batch in items.Buffer(batchSize))
+            {
+                var chunks = await Task.WhenAll(batch.Select(ChunkAsync));
+                var embeddings = await _embeddingService.GenerateEmbeddingsAsync(chunks.SelectMany(...));
+                await _dbContext.BulkInsertAsync(documents);
+                await _dbContext.BulkInsertAsync(chunkEntities);
+            }
+        }
+    }
+
+    文件在同一個交易中完成索引，indexing_status 直接為 indexed（不經過背景索引工作）
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        embedding_service: IEmbeddingService,
+        batch_size: int = 256,
+        chunk_workers: int | None = None,
+        prefetch: int = 2,
+    ):
+        self._session_factory = session_factory
+        self._embedding = embedding_service
+        self._batch_size = batch_size
+        self._chunk_workers = chunk_workers or os.cpu_count() or 1
+        self._prefetch = prefetch
+
+    async def ingest(
+        self,
+        items: Iterable[IngestItem],
+        owner_id: str,
+        on_progress: Callable[[IngestStats], None] | None = None,
+    ) -> IngestStats:
+        """
+        匯入 items（可為惰性的 generator），每寫入一批呼叫一次 on_progress
+
+        已 commit 的批次不會因為後續批次失敗而撤銷
+        """
+        stats = IngestStats()
+        started = time.perf_counter()
+        queue: asyncio.Queue[tuple[list[IngestItem], list[list[str]]] | None] = (
+            asyncio.Queue(maxsize=self._prefetch)
+        )
+
+        with ProcessPoolExecutor(max_workers=self._chunk_workers) as pool:
+            producer = asyncio.create_task(self._produce(iter(items), pool, queue))
+            try:
+                while (batch := await queue.get()) is not None:
+                    documents, chunks = batch
+                    await self._write(documents, chunks, owner_id)
+
+                    stats.documents += len(documents)
+                    stats.chunks += sum(
+                        len(document_chunks) for document_chunks in chunks
+                    )
+                    stats.batches += 1
+                    stats.seconds = time.perf_counter() - started
+                    if on_progress is not None:
+                        on_progress(stats)
+            finally:
+                # 寫入失敗時停止讀取；讀取或分塊的錯誤在 await producer 時拋出
+                if not producer.done():
+                    producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await producer
+
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    async def _produce(
+        self,
+        items: Iterator[IngestItem],
+        pool: Executor,
+        queue: asyncio.Queue[tuple[list[IngestItem], list[list[str]]] | None],
+    ) -> None:
+        """讀取並分塊下一批；佇列滿時等待，限制記憶體中的批次數"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # 讀取來源（檔案 I/O）不佔用 event loop
+                documents = await asyncio.to_thread(
+                    lambda: list(itertools.islice(items, self._batch_size))
+                )
+                if not documents:
+                    break
+
+                # 分成 chunk_workers 份平行分塊
+                size = -(-len(documents) // self._chunk_workers)
+                parts = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool,
+                            _chunk_documents,
+                            documents[start : start + size],
+                        )
+                        for start in range(0, len(documents), size)
+                    )
+                )
+                await queue.put(
+                    (documents, [chunks for part in parts for chunks in part])
+                )
+        except Exception:
+            # 通知消費端結束，錯誤由 ingest() await producer 時拋出
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    async def _write(
+        self,
+        documents: list[IngestItem],
+        chunks: list[list[str]],
+        owner_id: str,
+    ) -> None:
+        """一批文件與 chunks 在同一個交易中寫入（一次嵌入呼叫、COPY）"""
+        async with self._session_factory() as session:
+            saved = await DocumentRepository(session).add_many(
+                [
+                    Document(
+                        id=None,
+                        title=title,
+                        content=content,
+                        owner_id=owner_id,
+                        indexing_status=IndexingStatus.INDEXED,
+                        chunking_strategy=strategy,
+                    )
+                    for title, content, strategy in documents
+                ]
+            )
+            await VectorRepository(session, self._embedding).index_documents(
+                saved, chunks
+            )
+            await session.commit()
@@ -0,0 +1,535 @@
+"""
+全庫重新嵌入服務（更換嵌入模型 / 維度）
+
+ABP 對比：
+- ABP: 通常以一次性的 IBackgroundJob 搭配新的資料表，完成後部署新版本切換
+- Python: 影子欄位 + checkpoint 資料表，完成後在單一交易中改名切換
+
+設計說明：
+- 以新的 EMBEDDING_MODEL / EMBEDDING_DIMENSION 執行；線上服務仍以舊設定運作，
+  執行期間搜尋與索引只讀寫 embedding 欄位，新向量寫入 embedding_next
+- chunks 依 id 以 keyset 分批，同時最多 workers 批在嵌入（Process Pool），
+  寫入依讀取順序進行，游標與該批向量在同一個交易中更新，中斷後從游標繼續
+- 文件層級嵌入在 chunks 之後由新的 chunk 向量計算，再以 CONCURRENTLY 建立 ANN 索引
+- 執行期間線上新增的 chunks 與更新過的文件由補齊（catch-up）處理，
+  待補數量夠少時鎖定資料表，補上最後一批後改名切換
+- 切換後線上服務需以新設定重新啟動（查詢向量必須使用新模型）：
+  啟動時、寫入向量時與搜尋前（依間隔）都會檢查設定與最近一次切換的模型是否一致，
+  仍以舊設定運作的行程拒絕讀寫向量（見 embedding_guard）
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.domain.exceptions import ValidationError
+from src.domain.models.embedding import EmbeddingVector
+from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.persistence.embedding_guard import get_embedding_model_guard
+from src.infrastructure.persistence.models.reembed_run_model import (
+    ReembedRunModel,
+    ReembedStatus,
+)
+from src.infrastructure.persistence.repositories.embedding_cache_repository import (
+    EmbeddingCacheRepository,
+    content_hash,
+)
+from src.infrastructure.persistence.repositories.reembed_repository import (
+    ReembedRepository,
+)
+from src.infrastructure.persistence.repositories.vector_repository import (
+    document_centroid,
+)
+from src.infrastructure.persistence.shadow_embeddings import (
+    add_shadow_columns_sql,
+    create_shadow_indexes_sql,
+    drop_previous_columns_sql,
+    drop_shadow_columns_sql,
+    switch_columns_sql,
+)
+
+logger = logging.getLogger(__name__)
+
+# 同時只允許一個重新嵌入行程（pg_try_advisory_lock 的鍵）
+_ADVISORY_LOCK_KEY = 0x52454D42
+
+# PostgreSQL lock_not_available（lock_timeout 逾時）
+_LOCK_NOT_AVAILABLE = "55P03"
+
+# 切換時等不到資料表鎖的重試次數
+_SWITCH_ATTEMPTS = 10
+
+
+async def check_embedding_settings(
+    session: AsyncSession, embedding_service: IEmbeddingService
+) -> None:
+    """
+    啟動時檢查：設定的嵌入模型必須與最近一次切換後資料表中的向量一致
+
+    重新嵌入切換後仍以舊設定啟動的行程會用舊模型產生查詢向量，搜尋結果沒有意義；
+    已在執行的行程由 VectorRepository 在讀寫向量時以同一個檢查拒絕
+    """
+    await get_embedding_model_guard(embedding_service.model_name).check(session)
+
+
+@dataclass
+class ReembedStats:
+    """
+    本次執行的進度（resume 時不含先前執行已完成的部分）
+
+    ABP 對比：
+    - ABP: 通常以 ILogger 輸出進度
+    """
+
+    status: str
+    chunks: int = 0
+    documents: int = 0
+    seconds: float = 0.0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def tick(self) -> None:
+        self.seconds = time.perf_counter() - self.started
+
+
+@dataclass
+class _EmbeddedBatch:
+    """已嵌入、等待寫入的一批 chunks（computed 為需要寫回嵌入快取的新向量）"""
+
+    chunk_ids: list[str]
+    embeddings: list[EmbeddingVector]
+    computed: dict[str, EmbeddingVector]
+
+
+class ReembedService:
+    """
+    全庫重新嵌入服務
+
+    ABP 對比：
+    public class ReembedAppService : ApplicationService
+    {
+        public async Task RunAsync()
+        {
+            var run = await _runRepository.FindActiveAsync() ?? await StartAsync();
+            await foreach (var batch in _chunkRepository.GetBatchesAfterAsync(run.ChunkCursor))
+            {
+                var vectors = await _embeddingService.GenerateEmbeddingsAsync(batch);
+                await _chunkRepository.UpdateShadowAsync(batch, vectors);
+                run.ChunkCursor = batch.Last().Id;
+                await _unitOfWork.SaveChangesAsync();
+            }
+            ...
+        }
+    }
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        embedding_service: IEmbeddingService,
+        batch_size: int = 512,
+        workers: int = 1,
+        switch_max_pending: int = 1000,
+        lock_timeout_seconds: float = 5,
+    ):
+        self._session_factory = session_factory
+        self._embedding = embedding_service
+        self._batch_size = batch_size
+        self._workers = max(1, workers)
+        self._switch_max_pending = switch_max_pending
+        self._lock_timeout = lock_timeout_seconds
+
+    async def run(
+        self,
+        switch: bool = True,
+        on_progress: Callable[[ReembedStats], None] | None = None,
+    ) -> ReembedStats:
+        """
+        開始或繼續重新嵌入，switch 時完成後切換
+
+        中斷後再次呼叫即從上次的游標繼續；
+        switch=False 時停在 READY，之後再以 switch=True 呼叫會補齊後切換
+        """
+        async with self._exclusive():
+            run = await self._start()
+            stats = ReembedStats(status=run.status)
+
+            def report() -> None:
+                stats.tick()
+                if on_progress is not None:
+                    on_progress(stats)
+
+            if run.status == ReembedStatus.CHUNKS:
+                await self._reembed_chunks(run, stats, report)
+                run.status = await self._set_status(run, ReembedStatus.DOCUMENTS)
+
+            if run.status == ReembedStatus.DOCUMENTS:
+                await self._update_documents(run, stats, report)
+                run.status = await self._set_status(run, ReembedStatus.INDEXES)
+
+            if run.status == ReembedStatus.INDEXES:
+                await self._build_indexes()
+                run.status = await self._set_status(run, ReembedStatus.READY)
+
+            stats.status = run.status
+            report()
+            if switch:
+                await self._switch(run, stats, report)
+            return stats
+
+    async def abort(self) -> ReembedRunModel | None:
+        """放棄未切換的執行：刪除影子欄位（含其索引）"""
+        async with self._exclusive(), self._session_factory() as session:
+            repository = ReembedRepository(session)
+            run = await repository.get_active_run()
+            if run is None:
+                return None
+            await repository.lock_vector_tables(self._lock_timeout)
+            await repository.execute_ddl(drop_shadow_columns_sql())
+            await repository.set_status(run.id, ReembedStatus.ABORTED)
+            await session.commit()
+            return run
+
+    async def cleanup(self) -> None:
+        """刪除上一次切換前的向量（embedding_previous）"""
+        async with self._exclusive(), self._session_factory() as session:
+            repository = ReembedRepository(session)
+            await repository.lock_vector_tables(self._lock_timeout)
+            await repository.execute_ddl(drop_previous_columns_sql())
+            await session.commit()
+
+    async def status(self) -> tuple[ReembedRunModel | None, int, int]:
+        """最近一次執行與待補的 (chunks, 文件) 數（執行已結束時為 0）"""
+        async with self._session_factory() as session:
+            repository = ReembedRepository(session)
+            run = await repository.get_latest_run()
+            if run is None or run.status in (
+                ReembedStatus.SWITCHED,
+                ReembedStatus.ABORTED,
+            ):
+                return run, 0, 0
+            return (
+                run,
+                await repository.count_pending_chunks(),
+                await repository.count_pending_documents(),
+            )
+
+    # ========== 階段 ==========
+
+    async def _start(self) -> ReembedRunModel:
+        """取得未結束的執行；沒有時建立執行並新增影子欄位"""
+        model_name = self._embedding.model_name
+        dimension = settings.embedding_dimension
+        async with self._session_factory() as session:
+            repository = ReembedRepository(session)
+            run = await repository.get_active_run()
+            if run is not None:
+                if (run.model_name, run.dimension) != (model_name, dimension):
+                    raise ValidationError(
+                        f"A re-embedding run for {run.model_name} ({run.dimension}d) "
+                        "is in progress; abort it before starting another",
+                        details={"run_id": run.id},
+                    )
+                logger.info(f"Resuming re-embedding run {run.id} at {run.status}")
+                return run
+
+            current = await repository.get_last_switched_run()
+            if current is not None and (current.model_name, current.dimension) == (
+                model_name,
+                dimension,
+            ):
+                raise ValidationError(
+                    f"Stored embeddings already use {model_name} ({dimension}d)"
+                )
+
+            await repository.lock_vector_tables(self._lock_timeout)
+            await repository.execute_ddl(add_shadow_columns_sql(dimension))
+            run = await repository.create_run(model_name, dimension)
+            await session.commit()
+            logger.info(f"Started re-embedding run {run.id}: {model_name}")
+            return run
+
+    async def _set_status(
+        self, run: ReembedRunModel, status: ReembedStatus
+    ) -> ReembedStatus:
+        async with self._session_factory() as session:
+            await ReembedRepository(session).set_status(run.id, status)
+            await session.commit()
+        logger.info(f"Re-embedding run {run.id}: {status}")
+        return status
+
+    async def _reembed_chunks(
+        self,
+        run: ReembedRunModel,
+        stats: ReembedStats,
+        report: Callable[[], None],
+        pending_only: bool = False,
+    ) -> None:
+        """
+        依 id 順序嵌入 chunks：同時最多 workers 批在嵌入，寫入依順序進行
+
+        pending_only（補齊）時從頭掃描影子欄位為 NULL 的 chunks，不更新游標
+        """
+        cursor = None if pending_only else run.chunk_cursor
+        exhausted = False
+        in_flight: deque[asyncio.Task[_EmbeddedBatch]] = deque()
+        try:
+            while True:
+                if not exhausted:
+                    async with self._session_factory() as session:
+                        rows = await ReembedRepository(session).get_chunks_after(
+                            cursor, self._batch_size, pending_only
+                        )
+                    if rows:
+                        cursor = rows[-1][0]
+                        in_flight.append(asyncio.create_task(self._embed(rows)))
+                    else:
+                        exhausted = True
+
+                if not in_flight:
+                    break
+                if exhausted or len(in_flight) >= self._workers:
+                    batch = await in_flight.popleft()
+                    async with self._session_factory() as session:
+                        repository = ReembedRepository(session)
+                        await self._write_chunks(session, batch)
+                        if not pending_only:
+                            await repository.advance_chunks(
+                                run.id, batch.chunk_ids[-1], len(batch.chunk_ids)
+                            )
+                        await session.commit()
+                    stats.chunks += len(batch.chunk_ids)
+                    report()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _embed(self, rows: list[tuple[str, str]]) -> _EmbeddedBatch:
+        """嵌入一批 chunks，優先使用新模型的嵌入快取（重複的內容只嵌入一次）"""
+        texts = [content for _, content in rows]
+        chunk_ids = [chunk_id for chunk_id, _ in rows]
+        if not settings.embedding_cache_enabled:
+            return _EmbeddedBatch(
+                chunk_ids, list(await self._embedding.aembed(texts)), {}
+            )
+
+        model_name = self._embedding.model_name
+        hashes = [content_hash(text) for text in texts]
+        async with self._session_factory() as session:
+            cached = await EmbeddingCacheRepository(session).get_many(
+                model_name, list(set(hashes))
+            )
+        # 同名模型改變輸出維度時，舊維度的快取不可使用
+        cached = {
+            hash_: vector
+            for hash_, vector in cached.items()
+            if len(vector) == settings.embedding_dimension
+        }
+
+        misses = {
+            hash_: text for hash_, text in zip(hashes, texts) if hash_ not in cached
+        }
+        computed: dict[str, EmbeddingVector] = {}
+        if misses:
+            vectors = await self._embedding.aembed(list(misses.values()))
+            computed = dict(zip(misses.keys(), vectors))
+            cached.update(computed)
+        return _EmbeddedBatch(chunk_ids, [cached[hash_] for hash_ in hashes], computed)
+
+    async def _write_chunks(self, session: AsyncSession, batch: _EmbeddedBatch) -> None:
+        await ReembedRepository(session).set_chunk_embeddings(
+            list(zip(batch.chunk_ids, batch.embeddings))
+        )
+        if batch.computed:
+            await EmbeddingCacheRepository(session).put_many(
+                self._embedding.model_name, batch.computed
+            )
+
+    async def _update_documents(
+        self,
+        run: ReembedRunModel,
+        stats: ReembedStats,
+        report: Callable[[], None],
+        pending_only: bool = False,
+    ) -> None:
+        """依 document_id 順序以新的 chunk 向量計算文件層級嵌入"""
+        cursor = None if pending_only else run.document_cursor
+        while True:
+            async with self._session_factory() as session:
+                repository = ReembedRepository(session)
+                rows = await repository.get_documents_after(
+                    cursor, self._batch_size, pending_only
+                )
+                if not rows:
+                    break
+                cursor = rows[-1][0]
+                await self._write_documents(repository, rows)
+                if not pending_only:
+                    await repository.advance_documents(run.id, cursor, len(rows))
+                await session.commit()
+            stats.documents += len(rows)
+            report()
+
+    @staticmethod
+    async def _write_documents(
+        repository: ReembedRepository,
+        rows: list[tuple[str, datetime]],
+        delete_empty: bool = False,
+    ) -> None:
+        """
+        計算並寫入一批文件的重心，記錄計算時的 updated_at
+
+        還有 chunk 沒有新向量的文件略過（仍為待補，之後再計算）；
+        沒有任何 chunk 的文件只在鎖表時（delete_empty）刪除其文件層級嵌入，
+        未鎖表時刪除可能蓋掉並行寫入剛建立的列
+        """
+        vectors = await repository.get_chunk_embeddings(
+            [document_id for document_id, _ in rows]
+        )
+        centroids: list[tuple[str, datetime, EmbeddingVector]] = []
+        empty: list[str] = []
+        for document_id, updated_at in rows:
+            document_vectors = vectors.get(document_id, [])
+            if not document_vectors:
+                empty.append(document_id)
+            elif all(vector is not None for vector in document_vectors):
+                centroids.append(
+                    (document_id, updated_at, document_centroid(document_vectors))
+                )
+        await repository.set_document_embeddings(centroids)
+        if delete_empty:
+            await repository.delete_document_embeddings(empty)
+
+    async def _build_indexes(self) -> None:
+        """以 CONCURRENTLY 建立影子欄位的 ANN 索引（不在交易中，不鎖寫入）"""
+        async with self._session_factory() as session:
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            for sql in create_shadow_indexes_sql(settings.vector_storage):
+                logger.info(f"Building shadow index: {sql}")
+                await connection.exec_driver_sql(sql)
+
+    async def _switch(
+        self,
+        run: ReembedRunModel,
+        stats: ReembedStats,
+        report: Callable[[], None],
+    ) -> None:
+        """
+        補齊後切換：待補數量夠少時鎖表，補上最後一批並改名
+
+        持有鎖期間線上查詢會等待，因此只在剩下的數量不超過 switch_max_pending 時鎖表；
+        等不到鎖（lock_timeout）時放棄這次嘗試，補齊後重試
+        """
+        for attempt in range(1, _SWITCH_ATTEMPTS + 1):
+            await self._catch_up(run, stats, report)
+            try:
+                async with self._session_factory() as session:
+                    repository = ReembedRepository(session)
+                    await repository.lock_vector_tables(self._lock_timeout)
+                    await self._finish_locked(session, repository)
+                    await repository.execute_ddl(
+                        switch_columns_sql(settings.vector_storage)
+                    )
+                    await repository.set_status(
+                        run.id, ReembedStatus.SWITCHED, switched=True
+                    )
+                    await session.commit()
+            except DBAPIError as e:
+                if getattr(e.orig, "sqlstate", None) != _LOCK_NOT_AVAILABLE:
+                    raise
+                logger.warning(
+                    f"Could not lock vector tables (attempt {attempt}), retrying"
+                )
+                continue
+
+            stats.status = ReembedStatus.SWITCHED
+            report()
+            logger.info(
+                f"Switched to {run.model_name} ({run.dimension}d); "
+                "restart servers with the new embedding settings"
+            )
+            return
+
+        raise ValidationError(
+            "Could not lock vector tables to switch, run again to retry"
+        )
+
+    async def _catch_up(
+        self,
+        run: ReembedRunModel,
+        stats: ReembedStats,
+        report: Callable[[], None],
+    ) -> None:
+        """補上執行期間線上寫入的 chunks 與文件，直到待補數量不超過 switch_max_pending"""
+        while True:
+            await self._reembed_chunks(run, stats, report, pending_only=True)
+            await self._update_documents(run, stats, report, pending_only=True)
+            async with self._session_factory() as session:
+                repository = ReembedRepository(session)
+                pending = (
+                    await repository.count_pending_chunks()
+                    + await repository.count_pending_documents()
+                )
+            logger.info(f"Re-embedding catch-up: {pending} pending")
+            if pending <= self._switch_max_pending:
+                return
+
+    async def _finish_locked(
+        self, session: AsyncSession, repository: ReembedRepository
+    ) -> None:
+        """
+        持有資料表鎖時補上最後一批（其他交易無法寫入，之後不會再有待補的列）
+
+        鎖住的資料表只能由持有鎖的 session 讀寫，因此依序處理，不使用其他 session
+        """
+        cursor: str | None = None
+        while rows := await repository.get_chunks_after(
+            cursor, self._batch_size, pending_only=True
+        ):
+            cursor = rows[-1][0]
+            await self._write_chunks(session, await self._embed(rows))
+
+        cursor = None
+        while rows := await repository.get_documents_after(
+            cursor, self._batch_size, pending_only=True
+        ):
+            cursor = rows[-1][0]
+            await self._write_documents(repository, rows, delete_empty=True)
+
+    @contextlib.asynccontextmanager
+    async def _exclusive(self) -> AsyncIterator[None]:
+        """
+        以 session 層級的 advisory lock 確保同時只有一個重新嵌入行程
+
+        連線使用 AUTOCOMMIT，持有鎖期間不會停在 idle in transaction
+        """
+        async with self._session_factory() as session:
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            acquired = await connection.scalar(
+                select(func.pg_try_advisory_lock(_ADVISORY_LOCK_KEY))
+            )
+            if not acquired:
+                raise ValidationError("Another re-embedding process is running")
+            try:
+                yield
+            finally:
+                await connection.scalar(
+                    select(func.pg_advisory_unlock(_ADVISORY_LOCK_KEY))
+                )
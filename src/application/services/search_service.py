@@ -8,11 +8,39 @@ ABP 對比：
 - Python: 直接組合 EmbeddingService 和 VectorRepository
 """
 
+import asyncio
+from dataclasses import replace
+
+import numpy as np
+
+from src.application.pagination import Edge, Page, decode_cursor, encode_cursor
+from src.domain.exceptions import ValidationError
 from src.domain.interfaces.vector_repository import IVectorRepository
-from src.domain.models.search_result import SearchResult, SimilarDocument
+from src.domain.models.document import ChunkingStrategy
+from src.domain.models.search_result import (
+    SearchMode,
+    SearchRequest,
+    SearchResult,
+    SimilarDocument,
+)
+from src.infrastructure.caching.search_result_cache import (
+    SearchCacheKey,
+    SearchResultCache,
+    query_hash,
+)
 from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.reranking.cross_encoder import CrossEncoderReranker
 from src.config import settings
 
+# 範圍搜尋每頁的最大筆數
+_MAX_RANGE_PAGE_SIZE = 1000
+
+# 批次搜尋一次最多的查詢數
+_MAX_BATCH_SIZE = 100
+
+# 搜尋分頁（connection）每頁的最大筆數
+_MAX_SEARCH_PAGE_SIZE = 100
+
 
 class SearchService:
     """
@@ -33,6 +61,8 @@ class SearchService:
         self,
         embedding_service: IEmbeddingService,
         vector_repository: IVectorRepository,
+        reranker: CrossEncoderReranker | None = None,
+        result_cache: SearchResultCache | None = None,
     ):
         """
         初始化搜尋服務
@@ -41,6 +71,8 @@ class SearchService:
         public SearchAppService(
             IEmbeddingService embeddingService,
             IVectorRepository vectorRepository,
+            CrossEncoderReranker reranker,
+            SearchResultCache resultCache,
             ICurrentUser currentUser)
         {
             _embeddingService = embeddingService;
@@ -50,6 +82,8 @@ class SearchService:
         """
         self._embedding = embedding_service
         self._vector_repo = vector_repository
+        self._reranker = reranker
+        self._result_cache = result_cache
 
     async def search_documents(
         self,
@@ -57,6 +91,10 @@ class SearchService:
         user_id: str,
         limit: int | None = None,
         threshold: float | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        mode: SearchMode = SearchMode.VECTOR,
+        rerank: bool = False,
     ) -> list[SearchResult]:
         """
         語意搜尋文件
@@ -85,29 +123,377 @@ class SearchService:
         1. 將查詢文本轉為嵌入向量
         2. 在向量資料庫中搜尋相似文件
         3. 返回排序後的搜尋結果
+
+        ef_search / probes：覆寫此次搜尋的 ANN 召回率參數（None 使用設定值）
+        mode：HYBRID 時同時以全文檢索比對查詢文本（識別字、錯誤代碼、產品名稱），
+        與向量排名以 RRF 合併
+        rerank：第一階段取回前 rerank_candidates 名，再以 cross-encoder 重新評分排序
+
+        結果快取：相同使用者、查詢與參數的搜尋直接回傳快取（使用者的文件變更後失效）
         """
         # 使用預設值
+        request = self._with_defaults(
+            SearchRequest(
+                query=query,
+                limit=limit,
+                threshold=threshold,
+                ef_search=ef_search,
+                probes=probes,
+                mode=mode,
+                rerank=rerank,
+            )
+        )
+
+        cache_key = self._cache_key(user_id, request)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        # 1. 生成查詢向量（在執行器中執行，不阻塞 event loop）
+        query_embedding = await self._embedding.aembed_single(query)
+
+        # 2. 執行搜尋
+        if mode == SearchMode.HYBRID:
+            results = await self._vector_repo.hybrid_search(
+                query_embedding=query_embedding,
+                query_text=query,
+                owner_id=user_id,
+                limit=self._first_stage_limit(request),
+                threshold=request.threshold,
+                ef_search=ef_search,
+                probes=probes,
+            )
+        else:
+            results = await self._vector_repo.search(
+                query_embedding=query_embedding,
+                owner_id=user_id,
+                limit=self._first_stage_limit(request),
+                threshold=request.threshold,
+                ef_search=ef_search,
+                probes=probes,
+            )
+
+        # 3. 重新排序（選用）與快取
+        return await self._finish(request, results, cache_key)
+
+    async def search_documents_batch(
+        self,
+        requests: list[SearchRequest],
+        user_id: str,
+    ) -> list[list[SearchResult]]:
+        """
+        批次語意搜尋：回傳與 requests 同順序的結果列表
+
+        ABP 對比：
+        [Authorize]
+        public async Task<List<List<SearchResultDto>>> SearchDocumentsBatchAsync(
+            List<SearchDocumentsInput> inputs)
+        {
+            // 1. 所有查詢文本一次生成向量
+            var embeddings = await _embeddingService
+                .GenerateEmbeddingsAsync(inputs.Select(x => x.Query).ToList());
+
+            // 2. 向量搜尋在同一個語句中執行
+            return await _vectorRepository.SearchManyAsync(embeddings, ...);
+        }
+
+        流程：
+        1. 先查結果快取（與 search_documents 共用快取項目）
+        2. 未命中的查詢文本以一次 embed 呼叫生成向量
+        3. VECTOR 模式的查詢依 ef_search / probes 分組，每組以一次 search_batch 執行
+           （通常只有一組，即一個 SQL 語句）；HYBRID 模式的查詢逐一執行
+        4. 個別的 rerank 與快取寫入與 search_documents 相同
+        """
+        if len(requests) > _MAX_BATCH_SIZE:
+            raise ValidationError(
+                f"At most {_MAX_BATCH_SIZE} queries are allowed per batch"
+            )
+
+        requests = [self._with_defaults(request) for request in requests]
+        results: list[list[SearchResult]] = [[] for _ in requests]
+        cache_keys = [self._cache_key(user_id, request) for request in requests]
+
+        # 1. 結果快取
+        pending: list[int] = []
+        for position, cache_key in enumerate(cache_keys):
+            cached = self._cached(cache_key)
+            if cached is not None:
+                results[position] = cached
+            else:
+                pending.append(position)
+        if not pending:
+            return results
+
+        # 2. 一次生成所有未命中查詢的向量
+        embeddings = await self._embedding.aembed(
+            [requests[position].query for position in pending]
+        )
+        embedding_of = dict(zip(pending, embeddings))
+
+        # 3. 第一階段搜尋
+        first_stage: dict[int, list[SearchResult]] = {}
+        groups: dict[tuple[int | None, int | None], list[int]] = {}
+        for position in pending:
+            request = requests[position]
+            if request.mode == SearchMode.HYBRID:
+                # 同一個 AsyncSession 無法同時執行多個語句，混合搜尋逐一執行
+                first_stage[position] = await self._vector_repo.hybrid_search(
+                    query_embedding=embedding_of[position],
+                    query_text=request.query,
+                    owner_id=user_id,
+                    limit=self._first_stage_limit(request),
+                    threshold=request.threshold,
+                    ef_search=request.ef_search,
+                    probes=request.probes,
+                )
+            else:
+                groups.setdefault((request.ef_search, request.probes), []).append(
+                    position
+                )
+
+        for (ef_search, probes), positions in groups.items():
+            batch = await self._vector_repo.search_batch(
+                query_embeddings=np.stack([embedding_of[p] for p in positions]),
+                owner_id=user_id,
+                limits=[self._first_stage_limit(requests[p]) for p in positions],
+                thresholds=[requests[p].threshold or 0.0 for p in positions],
+                ef_search=ef_search,
+                probes=probes,
+            )
+            first_stage.update(zip(positions, batch))
+
+        # 4. 重新排序（選用）與快取
+        for position in pending:
+            results[position] = await self._finish(
+                requests[position], first_stage[position], cache_keys[position]
+            )
+        return results
+
+    @staticmethod
+    def _with_defaults(request: SearchRequest) -> SearchRequest:
+        """limit / threshold 未指定時使用設定值"""
+        return replace(
+            request,
+            limit=request.limit or settings.default_search_limit,
+            threshold=request.threshold or settings.similarity_threshold,
+        )
+
+    def _cache_key(self, user_id: str, request: SearchRequest) -> SearchCacheKey | None:
+        if self._result_cache is None:
+            return None
+        return self._result_cache.key(
+            user_id,
+            "search",
+            query_hash(request.query),
+            request.limit,
+            request.threshold,
+            request.mode,
+            request.ef_search,
+            request.probes,
+            self._reranks(request),
+        )
+
+    def _cached(self, cache_key: SearchCacheKey | None) -> list[SearchResult] | None:
+        if cache_key is None or self._result_cache is None:
+            return None
+        cached = self._result_cache.get(cache_key)
+        return None if cached is None else list(cached)
+
+    def _reranks(self, request: SearchRequest) -> bool:
+        return request.rerank and self._reranker is not None
+
+    def _first_stage_limit(self, request: SearchRequest) -> int:
+        """重新排序時第一階段取回 rerank_candidates 名"""
+        limit = request.limit or settings.default_search_limit
+        if self._reranks(request):
+            return max(limit, settings.rerank_candidates)
+        return limit
+
+    async def _finish(
+        self,
+        request: SearchRequest,
+        results: list[SearchResult],
+        cache_key: SearchCacheKey | None,
+    ) -> list[SearchResult]:
+        """
+        重新排序（選用）、截斷為 limit 筆並寫入結果快取
+
+        超過重新排序的時間預算時回傳第一階段的排序，且不快取
+        """
+        if request.rerank and self._reranker is not None:
+            reranked = await self._rerank(self._reranker, request.query, results)
+            if reranked is None:
+                return results[: request.limit]
+            results = reranked
+
+        results = results[: request.limit]
+        if cache_key is not None and self._result_cache is not None:
+            self._result_cache.set(cache_key, results)
+        return results
+
+    async def _rerank(
+        self,
+        reranker: CrossEncoderReranker,
+        query: str,
+        results: list[SearchResult],
+    ) -> list[SearchResult] | None:
+        """
+        第二階段：以 cross-encoder 為第一階段的候選重新評分（超過時間預算時回傳 None）
+
+        ABP 對比：
+        var scores = await _reranker.ScoreAsync(query, passages, budget);
+        if (scores is null) return null;  // 超過時間預算，由呼叫端沿用第一階段排序
+        return results.OrderByDescending(r => scores[r.ChunkId]).ToList();
+
+        - 先查分數快取，只有未命中的 chunks 需要讀取內容並送進模型
+        - 時間預算涵蓋讀取內容與推論；逾時則由呼叫端沿用第一階段的排序
+        - 重新排序後 score 為 cross-encoder 分數
+        - 沒有分數的結果（沒有 chunk_id，或 chunk 在讀取內容前已被刪除）不會被移除：
+          依第一階段的順序排在有分數的結果之後，保留第一階段的 score，
+          重新排序後的筆數與第一階段相同
+        """
+        if len(results) < 2:
+            return results
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.rerank_budget_ms / 1000
+
+        chunk_ids = [r.chunk_id for r in results if r.chunk_id is not None]
+        scores = reranker.cached_scores(query, chunk_ids)
+        missing = [chunk_id for chunk_id in chunk_ids if chunk_id not in scores]
+        if missing:
+            passages = await self._vector_repo.get_chunk_contents(missing)
+            computed = await reranker.score(
+                query, passages, timeout=deadline - loop.time()
+            )
+            if computed is None:
+                return None
+            scores.update(computed)
+
+        reranked: list[SearchResult] = []
+        unscored: list[SearchResult] = []
+        for r in results:
+            if r.chunk_id is not None and r.chunk_id in scores:
+                reranked.append(replace(r, score=scores[r.chunk_id]))
+            else:
+                unscored.append(r)
+        reranked.sort(key=lambda r: r.score, reverse=True)
+        return reranked + unscored
+
+    async def search_documents_page(
+        self,
+        query: str,
+        user_id: str,
+        first: int = 10,
+        threshold: float | None = None,
+        after: str | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> Page[SearchResult]:
+        """
+        語意搜尋（keyset 分頁）
+
+        ABP 對比：
+        [Authorize]
+        public async Task<Connection<SearchResultDto>> SearchDocumentsConnectionAsync(
+            string query, int first, string? after)
+
+        - cursor 為上一頁最後一筆的 (distance, chunk_id)，以 after 接續，
+          不需要像提高 limit 一樣重新取回前面的頁
+        - 一律為向量搜尋（排序鍵是距離），不支援 HYBRID 與 rerank
+        """
+        threshold = threshold or settings.similarity_threshold
+        if not 1 <= first <= _MAX_SEARCH_PAGE_SIZE:
+            raise ValidationError(
+                f"first must be between 1 and {_MAX_SEARCH_PAGE_SIZE}"
+            )
+
+        position: tuple[float, str] | None = None
+        if after is not None:
+            distance, chunk_id = decode_cursor(after, 2)
+            if not isinstance(distance, int | float) or not isinstance(chunk_id, str):
+                raise ValidationError("Invalid cursor")
+            position = (float(distance), chunk_id)
+
+        query_embedding = await self._embedding.aembed_single(query)
+
+        # 多取一筆以判斷是否還有下一頁
+        rows = await self._vector_repo.search_page(
+            query_embedding=query_embedding,
+            owner_id=user_id,
+            limit=first + 1,
+            threshold=threshold,
+            after=position,
+            ef_search=ef_search,
+            probes=probes,
+        )
+
+        return Page(
+            edges=[
+                Edge(node=result, cursor=encode_cursor(distance, result.chunk_id or ""))
+                for distance, result in rows[:first]
+            ],
+            has_next_page=len(rows) > first,
+        )
+
+    async def range_search_documents(
+        self,
+        query: str,
+        user_id: str,
+        threshold: float | None = None,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> Page[SearchResult]:
+        """
+        範圍搜尋：列出相似度 >= threshold 的所有文件（分頁）
+
+        ABP 對比：
+        [Authorize]
+        public async Task<PagedResultDto<SearchResultDto>> RangeSearchDocumentsAsync(
+            RangeSearchInput input)
+
+        用於去重複與稽核等批次工作：
+        - 與 search_documents 不同，結果是精確且完整的（不走 ANN 索引）
+        - 以 after（上一頁的 end cursor）逐頁取得，直到 has_next_page 為 False
+        """
         limit = limit or settings.default_search_limit
         threshold = threshold or settings.similarity_threshold
+        if not 1 <= limit <= _MAX_RANGE_PAGE_SIZE:
+            raise ValidationError(f"limit must be between 1 and {_MAX_RANGE_PAGE_SIZE}")
+
+        position: tuple[float, str] | None = None
+        if after is not None:
+            score, document_id = decode_cursor(after, 2)
+            if not isinstance(score, int | float) or not isinstance(document_id, str):
+                raise ValidationError("Invalid cursor")
+            position = (float(score), document_id)
 
-        # 1. 生成查詢向量
-        query_embedding = self._embedding.embed_single(query)
+        query_embedding = await self._embedding.aembed_single(query)
 
-        # 2. 執行向量搜尋
-        results = await self._vector_repo.search(
+        # 多取一筆以判斷是否還有下一頁
+        results = await self._vector_repo.range_search(
             query_embedding=query_embedding,
             owner_id=user_id,
-            limit=limit,
             threshold=threshold,
+            limit=limit + 1,
+            after=position,
         )
 
-        return results
+        return Page(
+            edges=[
+                Edge(node=r, cursor=encode_cursor(r.score, r.document_id))
+                for r in results[:limit]
+            ],
+            has_next_page=len(results) > limit,
+        )
 
     async def find_similar_documents(
         self,
         document_id: str,
         user_id: str,
         limit: int = 5,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[SimilarDocument]:
         """
         找出相似文件
@@ -126,18 +512,34 @@ class SearchService:
                 input.DocumentId, CurrentUser.GetId(), input.Limit);
         }
         """
-        return await self._vector_repo.find_similar(
+        cache_key = None
+        if self._result_cache is not None:
+            cache_key = self._result_cache.key(
+                user_id, "similar", document_id, limit, ef_search, probes
+            )
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        results = await self._vector_repo.find_similar(
             document_id=document_id,
             owner_id=user_id,
             limit=limit,
+            ef_search=ef_search,
+            probes=probes,
         )
 
+        if cache_key is not None:
+            self._result_cache.set(cache_key, results)
+        return results
+
     async def index_document(
         self,
         document_id: str,
         title: str,
         content: str,
         owner_id: str,
+        chunking_strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
     ) -> list[str]:
         """
         索引文件到向量儲存
@@ -167,6 +569,7 @@ class SearchService:
             title=title,
             content=content,
             owner_id=owner_id,
+            chunking_strategy=chunking_strategy,
         )
 
     async def delete_document_index(self, document_id: str) -> bool:
@@ -0,0 +1,227 @@
+"""
+分塊器吞吐量基準測試
+
+ABP 對比：
+- ABP: 通常以 BenchmarkDotNet 專案量測
+- Python: python -m src.cli.bench_chunker，直接使用應用程式的分塊器與設定
+
+用法：
+    # 每種分塊方式以各自格式的合成文本量測 1 / 4 / 16 MB（每 MB 的時間應大致相同，即線性）
+    python -m src.cli.bench_chunker --sizes 1,4,16
+
+    # 只量測一種分塊方式
+    python -m src.cli.bench_chunker --strategy markdown
+
+    # 以字元數計算（不載入模型的 tokenizer）
+    CHUNK_TOKENIZER=chars python -m src.cli.bench_chunker
+
+    # 以實際的檔案量測（沒有指定 --strategy 時依副檔名選擇）
+    python -m src.cli.bench_chunker --file README.md
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.config import settings
+from src.domain.models.document import ChunkingStrategy
+from src.infrastructure.chunking.base import ITextChunker
+from src.infrastructure.chunking.registry import get_text_chunker, strategy_for_path
+from src.infrastructure.chunking.token_counters import get_token_counter
+
+_MB = 1024 * 1024
+
+_WORDS = [
+    "vector",
+    "index",
+    "embedding",
+    "query",
+    "latency",
+    "recall",
+    "chunk",
+    "token",
+    "model",
+    "batch",
+    "database",
+    "transaction",
+    "cache",
+    "search",
+    "document",
+    "owner",
+    "cursor",
+    "worker",
+]
+
+_CJK = "向量索引嵌入查詢延遲召回率分塊模型批次資料庫交易快取搜尋文件使用者游標背景"
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(4, 40))
+    return " ".join(words).capitalize() + rng.choice(".!?")
+
+
+def _identifier(rng: random.Random) -> str:
+    return "_".join(rng.choices(_WORDS, k=rng.randint(1, 3)))
+
+
+def _text_part(rng: random.Random) -> str:
+    """中英文混合的句子，偶爾分段"""
+    if rng.random() < 0.7:
+        sentence = _sentence(rng)
+    else:
+        sentence = "".join(rng.choices(_CJK, k=rng.randint(8, 80)))
+        sentence += rng.choice("。！？")
+    if rng.random() < 0.1:
+        sentence += "\n\n"
+    return sentence + " "
+
+
+def _markdown_part(rng: random.Random) -> str:
+    """標題、段落、清單、表格或程式碼區塊"""
+    kind = rng.random()
+    if kind < 0.15:
+        return "#" * rng.randint(1, 3) + " " + _identifier(rng).title() + "\n\n"
+    if kind < 0.6:
+        return " ".join(_sentence(rng) for _ in range(rng.randint(1, 8))) + "\n\n"
+    if kind < 0.75:
+        items = (f"- {_sentence(rng)}" for _ in range(rng.randint(2, 12)))
+        return "\n".join(items) + "\n\n"
+    if kind < 0.88:
+        rows = [
+            f"| {_identifier(rng)} | {rng.randint(0, 9999)} | {_sentence(rng)} |"
+            for _ in range(rng.randint(3, 80))
+        ]
+        header = "| name | value | note |\n| --- | ---: | --- |\n"
+        return header + "\n".join(rows) + "\n\n"
+    return "```python\n" + _code_part(rng) + "```\n\n"
+
+
+def _code_part(rng: random.Random) -> str:
+    """頂層函式或類別（含多個方法）"""
+
+    def function(indent: str) -> str:
+        lines = [f"{indent}def {_identifier(rng)}(self, {_identifier(rng)}):"]
+        lines += [
+            f"{indent}    {_identifier(rng)} = {_identifier(rng)}.{_identifier(rng)}"
+            f"({rng.randint(0, 100)}, {rng.random():.3f})"
+            for _ in range(rng.randint(2, 40))
+        ]
+        lines.append(f"{indent}    return {_identifier(rng)}")
+        return "\n".join(lines)
+
+    if rng.random() < 0.6:
+        return function("") + "\n\n\n"
+    methods = "\n\n".join(function("    ") for _ in range(rng.randint(2, 12)))
+    return f"class {_identifier(rng).title()}:\n{methods}\n\n\n"
+
+
+def _cjk_part(rng: random.Random) -> str:
+    """長段落：以逗號與頓號連接的子句，句末標點較少"""
+    clauses = (
+        "".join(rng.choices(_CJK, k=rng.randint(4, 30))) + rng.choice("，，，、；。")
+        for _ in range(rng.randint(5, 60))
+    )
+    return "".join(clauses) + "。\n"
+
+
+# 分塊方式 → 該格式的合成文本片段
+_GENERATORS: dict[ChunkingStrategy, Callable[[random.Random], str]] = {
+    ChunkingStrategy.TEXT: _text_part,
+    ChunkingStrategy.MARKDOWN: _markdown_part,
+    ChunkingStrategy.CODE: _code_part,
+    ChunkingStrategy.CJK: _cjk_part,
+}
+
+
+def synthetic_text(
+    size_bytes: int,
+    strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
+    seed: int = 0,
+) -> str:
+    """產生約 size_bytes（UTF-8）的 strategy 對應格式的文本，區塊長度隨機"""
+    rng = random.Random(seed)
+    generate = _GENERATORS[strategy]
+    parts: list[str] = []
+    total = 0
+    while total < size_bytes:
+        part = generate(rng)
+        parts.append(part)
+        total += len(part.encode("utf-8"))
+    return "".join(parts)
+
+
+def measure(chunker: ITextChunker, text: str) -> tuple[float, int, int]:
+    """回傳 (秒數, chunks 數, 最大 chunk 的 token 數)"""
+    started = time.perf_counter()
+    chunks = list(chunker.chunk(text))
+    seconds = time.perf_counter() - started
+    largest = max(get_token_counter().count(chunks), default=0)
+    return seconds, len(chunks), largest
+
+
+def _report(label: str, size_bytes: int, result: tuple[float, int, int]) -> None:
+    seconds, chunks, largest = result
+    mb = size_bytes / _MB
+    print(
+        f"{label:>12}: {seconds:7.2f}s  {mb / seconds:6.2f} MB/s  "
+        f"{seconds / mb:6.2f} s/MB  {chunks} chunks (largest {largest} tokens)",
+        flush=True,
+    )
+
+
+def _print_header(strategy: ChunkingStrategy) -> None:
+    chunker = get_text_chunker(strategy)
+    print(
+        f"strategy={strategy.value} chunker={type(chunker).__name__} "
+        f"counter={get_token_counter().name} "
+        f"chunk_size={settings.chunk_size} chunk_overlap={settings.chunk_overlap}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.bench_chunker",
+        description="Measure chunker throughput on multi-megabyte inputs.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1,4,16",
+        help="comma-separated synthetic input sizes in MB (default: 1,4,16)",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=[strategy.value for strategy in ChunkingStrategy],
+        help="benchmark only this chunking strategy (default: all)",
+    )
+    parser.add_argument("--file", help="benchmark this UTF-8 file instead")
+    args = parser.parse_args()
+
+    if args.file:
+        strategy = ChunkingStrategy(args.strategy or strategy_for_path(args.file))
+        _print_header(strategy)
+        text = Path(args.file).read_text(encoding="utf-8")
+        size = len(text.encode("utf-8"))
+        _report(Path(args.file).name, size, measure(get_text_chunker(strategy), text))
+        return
+
+    strategies = (
+        [ChunkingStrategy(args.strategy)] if args.strategy else list(ChunkingStrategy)
+    )
+    for strategy in strategies:
+        _print_header(strategy)
+        chunker = get_text_chunker(strategy)
+        # 暖身：載入 tokenizer 等一次性成本不計入
+        list(chunker.chunk(synthetic_text(64 * 1024, strategy)))
+        for size_mb in (float(size) for size in args.sizes.split(",")):
+            text = synthetic_text(int(size_mb * _MB), strategy)
+            _report(
+                f"{size_mb:g} MB", len(text.encode("utf-8")), measure(chunker, text)
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+大量文件匯入 CLI
+
+ABP 對比：
+- ABP: 獨立的 Console 專案（例如 DbMigrator）使用相同的 Application 層服務
+- Python: python -m src.cli.ingest，使用 IngestService 與應用程式相同的設定
+
+用法：
+    # JSONL：每行一個 {"title": "...", "content": "..."}（"-" 表示 stdin），
+    # 可選的 "chunking_strategy"（text / markdown / code / cjk，預設 text）
+    python -m src.cli.ingest corpus.jsonl --owner admin@example.com
+
+    # 目錄：每個檔案一份文件，標題為相對路徑，分塊方式依副檔名（.md → markdown，.py → code）
+    python -m src.cli.ingest ./docs --owner admin@example.com --pattern "**/*.md"
+
+    # 所有文件使用指定的分塊方式
+    python -m src.cli.ingest ./notes --owner admin@example.com --chunking-strategy cjk
+
+輸入以串流方式讀取，不會一次載入整個檔案 / 目錄；
+每寫入一批輸出累計的 docs/s 與 chunks/s
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+from src.application.services.ingest_service import (
+    IngestItem,
+    IngestService,
+    IngestStats,
+)
+from src.config import settings
+from src.domain.models.document import ChunkingStrategy
+from src.infrastructure.chunking.registry import strategy_for_path
+from src.infrastructure.embeddings.executor import get_embedding_executor
+from src.infrastructure.embeddings.local_embeddings import get_embedding_service
+from src.infrastructure.persistence.database import async_session_factory, engine
+from src.infrastructure.persistence.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# documents.title 的長度上限
+_MAX_TITLE_LENGTH = 255
+
+
+def read_jsonl(
+    path: str, strategy: ChunkingStrategy | None = None
+) -> Iterator[IngestItem]:
+    """
+    逐行讀取 JSONL；格式錯誤或沒有內容的行記錄警告後略過
+
+    strategy 為 None 時使用每行的 chunking_strategy（沒有時為 text）
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")  # noqa: SIM115
+    name = "stdin" if path == "-" else Path(path).name
+    with stream:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                content = record["content"]
+                line_strategy = strategy or ChunkingStrategy(
+                    record.get("chunking_strategy") or ChunkingStrategy.TEXT
+                )
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping invalid line {line_number}")
+                continue
+            if not isinstance(content, str) or not content.strip():
+                logger.warning(f"Skipping line {line_number}: empty content")
+                continue
+            title = str(record.get("title") or f"{name}:{line_number}")
+            yield title[:_MAX_TITLE_LENGTH], content, line_strategy
+
+
+def read_directory(
+    root: Path, pattern: str, strategy: ChunkingStrategy | None = None
+) -> Iterator[IngestItem]:
+    """
+    依 pattern 逐一讀取目錄下的檔案（依路徑排序，重跑時順序相同）
+
+    strategy 為 None 時依副檔名選擇分塊方式
+    """
+    for path in sorted(root.glob(pattern)):
+        if not path.is_file():
+            continue
+        try:
+            content = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        if content.strip():
+            yield (
+                str(path.relative_to(root))[:_MAX_TITLE_LENGTH],
+                content,
+                strategy or strategy_for_path(path),
+            )
+
+
+def _print_progress(stats: IngestStats) -> None:
+    print(
+        f"{stats.documents} docs, {stats.chunks} chunks in {stats.seconds:.1f}s "
+        f"({stats.documents_per_second:.1f} docs/s, "
+        f"{stats.chunks_per_second:.1f} chunks/s)",
+        flush=True,
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    async with async_session_factory() as session:
+        owner = await UserRepository(session).get_by_email(args.owner)
+    if owner is None:
+        print(f"User not found: {args.owner}", file=sys.stderr)
+        return 1
+
+    source = Path(args.source)
+    strategy = (
+        ChunkingStrategy(args.chunking_strategy) if args.chunking_strategy else None
+    )
+    items = (
+        read_directory(source, args.pattern, strategy)
+        if source.is_dir()
+        else read_jsonl(args.source, strategy)
+    )
+
+    service = IngestService(
+        async_session_factory,
+        get_embedding_service(),
+        batch_size=args.batch_size,
+        chunk_workers=args.chunk_workers or None,
+    )
+    try:
+        stats = await service.ingest(items, str(owner.id), on_progress=_print_progress)
+    finally:
+        get_embedding_executor().shutdown()
+        await engine.dispose()
+
+    print("Done: ", end="")
+    _print_progress(stats)
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.ingest",
+        description="Stream documents from a JSONL file or a directory into the index.",
+    )
+    parser.add_argument("source", help="JSONL file, '-' for stdin, or a directory")
+    parser.add_argument("--owner", required=True, help="email of the owning user")
+    parser.add_argument(
+        "--pattern",
+        default="**/*.txt",
+        help="glob for files when source is a directory (default: **/*.txt)",
+    )
+    parser.add_argument(
+        "--chunking-strategy",
+        choices=[strategy.value for strategy in ChunkingStrategy],
+        help="chunk every document this way "
+        "(default: by file extension, or the JSONL chunking_strategy field)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.ingest_batch_size,
+        help="documents per transaction / embedding batch",
+    )
+    parser.add_argument(
+        "--chunk-workers",
+        type=int,
+        default=settings.ingest_chunk_workers,
+        help="processes used for chunking (0: CPU count)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
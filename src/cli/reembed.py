@@ -0,0 +1,140 @@
+"""
+全庫重新嵌入 CLI（更換嵌入模型 / 維度）
+
+ABP 對比：
+- ABP: 獨立的 Console 專案（例如 DbMigrator）使用相同的 Application 層服務
+- Python: python -m src.cli.reembed，使用 ReembedService
+
+用法（以新的模型設定執行，線上服務維持舊設定）：
+    # 開始或從中斷處繼續，完成後切換
+    EMBEDDING_MODEL=paraphrase-multilingual-MiniLM-L12-v2 EMBEDDING_DIMENSION=384 \\
+        python -m src.cli.reembed run
+
+    # 只做到可切換為止；之後再執行 run 會補齊執行期間的寫入並切換
+    python -m src.cli.reembed run --no-switch
+
+    python -m src.cli.reembed status
+    python -m src.cli.reembed abort     # 放棄未切換的執行，刪除影子欄位
+    python -m src.cli.reembed cleanup   # 刪除切換前的向量（embedding_previous）
+
+切換後以新的 EMBEDDING_MODEL / EMBEDDING_DIMENSION 重新啟動線上服務
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+from src.application.services.reembed_service import ReembedService, ReembedStats
+from src.config import settings
+from src.domain.exceptions import ApplicationError
+from src.infrastructure.embeddings.executor import get_embedding_executor
+from src.infrastructure.embeddings.local_embeddings import get_embedding_service
+from src.infrastructure.persistence.database import async_session_factory, engine
+
+
+def _print_progress(stats: ReembedStats) -> None:
+    print(
+        f"[{stats.status}] {stats.chunks} chunks, {stats.documents} documents "
+        f"in {stats.seconds:.1f}s ({stats.chunks_per_second:.1f} chunks/s)",
+        flush=True,
+    )
+
+
+def _use_embedding_processes(workers: int) -> None:
+    """
+    本地模型改用 Process Pool（每個 worker 行程各自載入模型）
+
+    必須在第一次取得嵌入執行器之前設定；
+    OpenAI 等遠端模型不佔用本機 CPU，維持 thread 執行器
+    """
+    if settings.embedding_provider == "openai":
+        settings.embedding_max_workers = workers
+        return
+    settings.embedding_executor = "process"
+    settings.embedding_max_workers = workers
+    settings.embedding_max_queue = workers
+
+
+async def run(args: argparse.Namespace) -> int:
+    workers = args.workers or os.cpu_count() or 1
+    if args.command == "run":
+        _use_embedding_processes(workers)
+
+    service = ReembedService(
+        async_session_factory,
+        get_embedding_service(),
+        batch_size=args.batch_size,
+        workers=workers,
+        switch_max_pending=settings.reembed_switch_max_pending,
+        lock_timeout_seconds=settings.reembed_lock_timeout_seconds,
+    )
+    try:
+        if args.command == "run":
+            stats = await service.run(
+                switch=not args.no_switch, on_progress=_print_progress
+            )
+            print("Done: ", end="")
+            _print_progress(stats)
+        elif args.command == "status":
+            current, pending_chunks, pending_documents = await service.status()
+            if current is None:
+                print("No re-embedding runs")
+            else:
+                print(
+                    f"{current.id} {current.model_name} ({current.dimension}d): "
+                    f"{current.status}, {current.chunks_done} chunks and "
+                    f"{current.documents_done} documents done, "
+                    f"{pending_chunks} chunks and {pending_documents} documents pending"
+                )
+        elif args.command == "abort":
+            aborted = await service.abort()
+            print(f"Aborted {aborted.id}" if aborted else "No active run")
+        else:
+            await service.cleanup()
+            print("Dropped previous embeddings")
+    except ApplicationError as e:
+        print(e.message, file=sys.stderr)
+        return 1
+    finally:
+        get_embedding_executor().shutdown()
+        await engine.dispose()
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.reembed",
+        description="Re-embed every stored chunk with the configured embedding model.",
+    )
+    parser.add_argument(
+        "command",
+        choices=["run", "status", "abort", "cleanup"],
+        help="run: start or resume (and switch); status; abort; cleanup",
+    )
+    parser.add_argument(
+        "--no-switch",
+        action="store_true",
+        help="stop when ready instead of switching search to the new vectors",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.reembed_batch_size,
+        help="chunks per transaction / embedding call",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.reembed_workers,
+        help="embedding processes / batches in flight (0: CPU count)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
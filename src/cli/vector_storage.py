@@ -0,0 +1,118 @@
+"""
+向量索引儲存精度 CLI（更改 VECTOR_STORAGE）
+
+ABP 對比：
+- ABP: 獨立的 Console 專案（例如 DbMigrator）執行一次性的 DDL
+- Python: python -m src.cli.vector_storage，使用 vector_index 產生的 SQL
+
+用法：
+    # 目前可用的索引與 VECTOR_STORAGE 是否可以啟動
+    python -m src.cli.vector_storage status
+
+    # 1. 建立 halfvec 的索引（CONCURRENTLY，不鎖寫入），保留其他精度的索引
+    python -m src.cli.vector_storage rebuild halfvec --keep-others
+    # 2. 以 VECTOR_STORAGE=halfvec 重新啟動線上服務
+    # 3. 刪除其他精度的索引（halfvec 的索引已存在，不會重建）
+    python -m src.cli.vector_storage rebuild halfvec
+
+服務啟動時會檢查 VECTOR_STORAGE 的索引是否存在且可用，沒有時拒絕啟動；
+建置中斷留下的 invalid 索引會先刪除再重建
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.config import settings
+from src.infrastructure.persistence.database import engine
+from src.infrastructure.persistence.vector_index import (
+    VECTOR_STORAGE_MODES,
+    drop_vector_index_sql,
+    missing_vector_indexes,
+    rebuild_vector_indexes_sql,
+    vector_index_status,
+)
+
+
+async def _print_status(connection: AsyncConnection) -> None:
+    status = await vector_index_status(connection)
+    if not status:
+        print("No vector indexes")
+    for name, valid in sorted(status.items()):
+        print(f"{name}: {'valid' if valid else 'INVALID'}")
+    for storage in VECTOR_STORAGE_MODES:
+        missing = missing_vector_indexes(status, storage)
+        configured = " (configured)" if storage == settings.vector_storage else ""
+        state = f"missing {', '.join(missing)}" if missing else "ready"
+        print(f"VECTOR_STORAGE={storage}{configured}: {state}")
+
+
+async def _rebuild(
+    connection: AsyncConnection, storage: str, keep_others: bool
+) -> None:
+    # 建置中斷留下的 invalid 索引：IF NOT EXISTS 不會重建，先刪除
+    status = await vector_index_status(connection)
+    for name in missing_vector_indexes(status, storage):
+        if name in status:
+            sql = drop_vector_index_sql(name)
+            print(sql, flush=True)
+            await connection.exec_driver_sql(sql)
+
+    for sql in rebuild_vector_indexes_sql(storage, drop_others=not keep_others):
+        print(sql, flush=True)
+        await connection.exec_driver_sql(sql)
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        async with engine.connect() as connection:
+            # CREATE / DROP INDEX CONCURRENTLY 不能在交易中執行
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            if args.command == "rebuild":
+                if settings.vector_index_type == "none":
+                    print(
+                        "VECTOR_INDEX_TYPE=none: no indexes to build", file=sys.stderr
+                    )
+                    return 1
+                await _rebuild(connection, args.storage, args.keep_others)
+            await _print_status(connection)
+    finally:
+        await engine.dispose()
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.vector_storage",
+        description="Build the ANN indexes for a vector storage mode (VECTOR_STORAGE).",
+    )
+    parser.add_argument(
+        "command",
+        choices=["status", "rebuild"],
+        help="status: show indexes; rebuild: create indexes for STORAGE",
+    )
+    parser.add_argument(
+        "storage",
+        nargs="?",
+        choices=VECTOR_STORAGE_MODES,
+        default=settings.vector_storage,
+        help="storage mode to build (default: VECTOR_STORAGE)",
+    )
+    parser.add_argument(
+        "--keep-others",
+        action="store_true",
+        help="keep the indexes of other storage modes (servers not restarted yet)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,8 @@ class Settings(BaseSettings):
         default="postgresql+asyncpg://localhost:5432/graph_server",
         description="資料庫連線字串，必須在 .env 中設定完整的認證資訊",
     )
+    # 啟動時執行 alembic upgrade head（單一行程的開發環境；多個 replica 應在部署時執行）
+    database_auto_migrate: bool = False
 
     # CORS
     cors_origins: list[str] = [
@@ -65,14 +67,101 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     openai_embedding_model: str = "text-embedding-3-small"
 
-    # 文本分割設定
-    chunk_size: int = 500
-    chunk_overlap: int = 50
+    # 嵌入執行器設定（避免 encode 卡住 event loop）
+    embedding_executor: str = "thread"  # "thread" 或 "process"
+    embedding_max_workers: int = 2
+    embedding_max_queue: int = 64  # 排隊中的請求上限
+    embedding_queue_timeout: float = 30.0  # 佇列滿時的等待秒數
+
+    # 查詢嵌入微批次設定（合併並行的單筆查詢為一次 encode）
+    embedding_batch_enabled: bool = True
+    embedding_batch_max_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+
+    # 查詢嵌入快取設定（鍵：模型名稱 + 正規化查詢文本）
+    query_embedding_cache_enabled: bool = True
+    query_embedding_cache_max_entries: int = 10_000
+    query_embedding_cache_max_mb: int = 64
+    query_embedding_cache_ttl_seconds: float = 3600
+
+    # chunk 嵌入持久化快取（鍵：模型名稱 + chunk 文本 sha256）
+    embedding_cache_enabled: bool = True
+
+    # 搜尋結果快取（鍵含使用者版本號，文件變更後舊結果不再命中）
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 10_000
+    search_cache_max_mb: int = 64
+    search_cache_ttl_seconds: float = 30  # 其他行程的寫入最晚在此時間後反映
+
+    # 文本分割設定（單位由 chunk_tokenizer 決定）
+    # "model"：嵌入模型的 tokenizer（OpenAI 需安裝 tiktoken），"chars"：字元數
+    chunk_tokenizer: str = "model"
+    chunk_size: int = 128  # 超過模型的輸入上限時以上限為準
+    chunk_overlap: int = 16
 
     # 搜尋設定
     default_search_limit: int = 10
     similarity_threshold: float = 0.7
 
+    # 向量索引（ANN）設定：由 migration 建立，調整建置參數後需重建索引
+    vector_index_type: str = "hnsw"  # "hnsw"、"ivfflat" 或 "none"（精確搜尋）
+    hnsw_m: int = 16  # 每個節點的連結數，越大召回率越高、索引越大
+    hnsw_ef_construction: int = 64  # 建置時的候選清單大小
+    ivfflat_lists: int = 100  # 分群數，建議約為 rows / 1000
+    # 索引的儲存精度（需 pgvector 0.7+）："vector"、"halfvec" 或 "binary"
+    # 資料表保留完整精度向量；精簡索引取出的候選以完整精度重新計算距離
+    # 變更前以 python -m src.cli.vector_storage rebuild 建立索引（啟動時檢查）
+    vector_storage: str = "vector"
+    vector_rescore_oversampling: int = 4  # 精簡索引取出的候選數倍數
+
+    # 查詢時的召回率 / 延遲取捨（每次搜尋可再覆寫）
+    hnsw_ef_search: int = 40  # 查詢時的候選清單大小（1-1000）
+    ivfflat_probes: int = 1  # 查詢時掃描的分群數
+
+    # 依 owner 過濾的搜尋策略
+    # chunks 數不超過此值的使用者直接精確搜尋（owner_id 索引 + 排序），不走 ANN 索引
+    vector_exact_search_max_chunks: int = 20_000
+    # pgvector 0.8+ 的 iterative index scan："off"、"strict_order" 或 "relaxed_order"
+    # 過濾後結果不足 limit 時繼續掃描索引，避免大型使用者的搜尋結果變少
+    # strict_order 只適用於 HNSW；ivfflat 只支援 relaxed_order，開啟時一律使用 relaxed_order
+    vector_iterative_scan: str = "relaxed_order"
+    vector_tenant_size_ttl_seconds: float = 300  # 使用者 chunks 數的快取時間
+
+    # 程序內的使用者向量索引：搜尋在記憶體中以 numpy 計算，未載入時改用 pgvector
+    memory_index_enabled: bool = False
+    memory_index_max_mb: int = 512  # 所有使用者索引的記憶體上限，超過時 LRU 淘汰
+    # 本行程的寫入會在 commit 後立即失效；其他行程的寫入最晚在此時間後反映
+    memory_index_ttl_seconds: float = 60
+
+    # 重新排序（cross-encoder）：搜尋時指定 rerank 才會執行
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_candidates: int = 50  # 第一階段取回、交給 cross-encoder 評分的文件數
+    rerank_budget_ms: float = 300  # 超過此時間改用第一階段的排序
+    rerank_cache_max_entries: int = 100_000  # 分數快取（鍵：查詢雜湊 + chunk_id）
+    rerank_cache_ttl_seconds: float = 3600
+
+    # 文件索引：background 時 mutation 只寫入索引工作（outbox），由背景 worker 嵌入
+    indexing_mode: str = (
+        "background"  # "background" 或 "inline"（在 mutation 中同步索引）
+    )
+    indexing_workers: int = 2  # 本行程的 worker 數；0 表示由其他行程處理工作
+    indexing_batch_size: int = 16  # 每次取出的文件數，新 chunks 合併為一次嵌入呼叫
+    indexing_poll_interval_seconds: float = 1.0  # 沒有工作時的輪詢間隔
+    indexing_lease_seconds: float = 300  # 取出後的租約，worker 中斷時到期後重新處理
+    indexing_max_attempts: int = 5  # 超過後文件標記為 failed
+    indexing_retry_base_seconds: float = 5  # 重試間隔（指數退避）的基數
+
+    # 大量匯入（python -m src.cli.ingest）
+    ingest_batch_size: int = 256  # 每個交易的文件數，所有 chunks 一次嵌入
+    ingest_chunk_workers: int = 0  # 分塊的 Process 數；0 表示 CPU 核心數
+
+    # 全庫重新嵌入（python -m src.cli.reembed，以新的 EMBEDDING_MODEL / DIMENSION 執行）
+    reembed_batch_size: int = 512  # 每個交易的 chunks 數（一次嵌入呼叫）
+    reembed_workers: int = 0  # 嵌入的 Process 數（同時進行的批次數）；0 表示 CPU 核心數
+    reembed_switch_max_pending: int = 1000  # 待補的 chunks 不超過此數時才鎖表切換
+    reembed_lock_timeout_seconds: float = 5  # 切換時等待資料表鎖的上限，逾時後重試
+    embedding_model_check_seconds: float = 30  # 搜尋前檢查是否已切換到其他模型的間隔
+
     # ========== 種子資料設定 ==========
     # ABP 對比：ABP 在 appsettings.json 中設定 IdentityDataSeedOptions
     # 這些設定用於初始化系統管理員帳號
@@ -35,3 +35,8 @@ class AuthenticationError(ApplicationError):
 class AuthorizationError(ApplicationError):
     message = "Permission denied"
     code = "FORBIDDEN"
+
+
+class ServiceUnavailableError(ApplicationError):
+    message = "Service temporarily unavailable"
+    code = "SERVICE_UNAVAILABLE"
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from src.domain.models.document import Document
 
@@ -18,8 +19,19 @@ class IDocumentRepository(ABC):
         offset: int = 0,
     ) -> list[Document]: ...
 
+    @abstractmethod
+    async def get_page_by_owner_id(
+        self,
+        owner_id: str,
+        limit: int = 10,
+        after: tuple[datetime, str] | None = None,
+    ) -> list[Document]: ...
+
     @abstractmethod
     async def save(self, document: Document) -> Document: ...
 
+    @abstractmethod
+    async def add_many(self, documents: list[Document]) -> list[Document]: ...
+
     @abstractmethod
     async def delete(self, id: str) -> bool: ...
@@ -14,6 +14,8 @@ ABP 對比：
 
 from abc import ABC, abstractmethod
 
+from src.domain.models.document import ChunkingStrategy, Document
+from src.domain.models.embedding import EmbeddingMatrix, EmbeddingVector
 from src.domain.models.search_result import DocumentChunk, SearchResult, SimilarDocument
 
 
@@ -35,6 +37,7 @@ class IVectorRepository(ABC):
         title: str,
         content: str,
         owner_id: str,
+        chunking_strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
     ) -> list[str]:
         """
         將文件索引到向量儲存
@@ -42,10 +45,27 @@ class IVectorRepository(ABC):
         ABP 對比：
         - ABP: Task<List<string>> IndexDocumentAsync(...)
         - Python async def 對應 C# async Task
+        - chunking_strategy 決定分塊器（見 ChunkingStrategy）
         - 回傳建立的 chunk IDs
         """
         ...
 
+    @abstractmethod
+    async def index_documents(
+        self,
+        documents: list[Document],
+        chunks: list[list[str]] | None = None,
+    ) -> list[list[str]]:
+        """
+        批次索引多份文件（新 chunks 以一次嵌入呼叫取得向量）
+
+        ABP 對比：
+        - ABP: Task<List<List<string>>> IndexDocumentsAsync(List<Document> documents)
+        - chunks 為呼叫端預先分好的塊（與 documents 一一對應），None 時由實作分塊
+        - 回傳與 documents 同順序的 chunk IDs
+        """
+        ...
+
     @abstractmethod
     async def delete_document(self, document_id: str) -> bool:
         """
@@ -59,10 +79,12 @@ class IVectorRepository(ABC):
     @abstractmethod
     async def search(
         self,
-        query_embedding: list[float],
+        query_embedding: EmbeddingVector,
         owner_id: str,
         limit: int = 10,
         threshold: float = 0.0,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[SearchResult]:
         """
         語意搜尋（使用預先計算的嵌入向量）
@@ -71,6 +93,88 @@ class IVectorRepository(ABC):
         - ABP: Task<List<SearchResultDto>> SearchAsync(SearchInput input)
         - ABP 傾向用 Input Dto 封裝參數
         - Python 直接使用具名參數，更直觀
+
+        ef_search / probes 覆寫此次 ANN 搜尋的召回率參數（None 使用設定值）
+        """
+        ...
+
+    @abstractmethod
+    async def search_page(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        after: tuple[float, str] | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[tuple[float, SearchResult]]:
+        """
+        語意搜尋的一頁（keyset 分頁）：回傳 [(distance, 結果)]
+
+        ABP 對比：
+        - ABP: Task<List<SearchResultDto>> SearchPageAsync(...)
+        - 依 (distance, chunk_id) 排序；after 為上一頁最後一筆的 (distance, chunk_id)
+        - distance 原樣傳回，供呼叫端組成下一頁的 cursor
+        """
+        ...
+
+    @abstractmethod
+    async def search_batch(
+        self,
+        query_embeddings: EmbeddingMatrix,
+        owner_id: str,
+        limits: list[int],
+        thresholds: list[float],
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[SearchResult]]:
+        """
+        批次語意搜尋：query_embeddings 的每一列為一個查詢
+
+        ABP 對比：
+        - ABP: Task<List<List<SearchResultDto>>> SearchManyAsync(...)
+        - limits / thresholds 與 query_embeddings 的列一一對應
+        - 回傳與查詢同順序的結果列表，每個查詢的結果與 search 相同
+        """
+        ...
+
+    @abstractmethod
+    async def hybrid_search(
+        self,
+        query_embedding: EmbeddingVector,
+        query_text: str,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SearchResult]:
+        """
+        混合搜尋：向量排名與全文檢索排名以 RRF 合併
+
+        ABP 對比：
+        - ABP: Task<List<SearchResultDto>> HybridSearchAsync(...)
+        - threshold 只套用在向量候選；關鍵字命中的文件不受相似度門檻限制
+        - score 為 RRF 分數
+        """
+        ...
+
+    @abstractmethod
+    async def range_search(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        threshold: float,
+        limit: int = 100,
+        after: tuple[float, str] | None = None,
+    ) -> list[SearchResult]:
+        """
+        範圍搜尋：回傳相似度 >= threshold 的所有文件（依分數遞減分頁）
+
+        ABP 對比：
+        - ABP: Task<List<SearchResultDto>> RangeSearchAsync(...)
+        - after 為上一頁最後一筆的 (score, document_id)，None 表示第一頁
         """
         ...
 
@@ -80,6 +184,8 @@ class IVectorRepository(ABC):
         document_id: str,
         owner_id: str,
         limit: int = 5,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[SimilarDocument]:
         """
         找出相似文件
@@ -98,3 +204,13 @@ class IVectorRepository(ABC):
         取得文件的所有 chunks（用於偵錯或顯示）
         """
         ...
+
+    @abstractmethod
+    async def get_chunk_contents(self, chunk_ids: list[str]) -> dict[str, str]:
+        """
+        依 id 取得 chunks 的完整內容（chunk_id -> content，用於重新排序）
+
+        ABP 對比：
+        - ABP: Task<Dictionary<Guid, string>> GetChunkContentsAsync(List<Guid> chunkIds)
+        """
+        ...
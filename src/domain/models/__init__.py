@@ -7,13 +7,23 @@ ABP 對比：
 - Python: 使用 dataclass 定義純資料模型
 """
 
-from src.domain.models.document import Document
-from src.domain.models.search_result import DocumentChunk, SearchResult, SimilarDocument
+from src.domain.models.document import ChunkingStrategy, Document, IndexingStatus
+from src.domain.models.search_result import (
+    DocumentChunk,
+    SearchMode,
+    SearchRequest,
+    SearchResult,
+    SimilarDocument,
+)
 from src.domain.models.user import User
 
 __all__ = [
+    "ChunkingStrategy",
     "Document",
+    "IndexingStatus",
     "User",
+    "SearchMode",
+    "SearchRequest",
     "SearchResult",
     "SimilarDocument",
     "DocumentChunk",
@@ -9,6 +9,43 @@ ABP 對比：
 
 from dataclasses import dataclass
 from datetime import datetime
+from enum import StrEnum
+
+
+class IndexingStatus(StrEnum):
+    """
+    文件的向量索引狀態
+
+    ABP 對比：
+    public enum IndexingStatus { Pending, Indexed, Failed }
+
+    - PENDING: 已寫入索引工作，等待背景 worker 分塊與嵌入（搜尋尚未反映最新內容）
+    - INDEXED: chunks 與嵌入已是最新內容
+    - FAILED: 重試次數用盡仍失敗；下次更新文件時會重新排入
+    """
+
+    PENDING = "pending"
+    INDEXED = "indexed"
+    FAILED = "failed"
+
+
+class ChunkingStrategy(StrEnum):
+    """
+    文件的分塊方式（依文件格式選擇）
+
+    ABP 對比：
+    public enum ChunkingStrategy { Text, Markdown, Code, Cjk }
+
+    - TEXT: 依句子邊界（預設）
+    - MARKDOWN: 依標題分段，表格與程式碼區塊不拆散，每塊帶有所屬的標題路徑
+    - CODE: 依頂層定義（函式、類別）分塊，保留縮排
+    - CJK: 依中日韓標點分句，長段落再依逗號等子句標點切開，句子之間不加空白
+    """
+
+    TEXT = "text"
+    MARKDOWN = "markdown"
+    CODE = "code"
+    CJK = "cjk"
 
 
 @dataclass
@@ -22,6 +59,7 @@ class Document:
         public string Title { get; set; }
         public string Content { get; set; }
         public Guid OwnerId { get; set; }
+        public ChunkingStrategy ChunkingStrategy { get; set; }
     }
     """
 
@@ -31,3 +69,5 @@ class Document:
     owner_id: str
     created_at: datetime | None = None
     updated_at: datetime | None = None
+    indexing_status: IndexingStatus = IndexingStatus.INDEXED
+    chunking_strategy: ChunkingStrategy = ChunkingStrategy.TEXT
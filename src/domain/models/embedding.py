@@ -0,0 +1,16 @@
+"""
+嵌入向量型別
+
+ABP 對比：
+- ABP: 通常直接使用 float[] / ReadOnlyMemory<float>
+- Python: 使用 numpy float32 陣列，整條路徑（模型 → pgvector）不產生 Python float 物件
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+
+# 單一向量，shape = (dimension,)
+EmbeddingVector = NDArray[np.float32]
+
+# 多個向量，shape = (n, dimension)，每一列對應一段文本
+EmbeddingMatrix = NDArray[np.float32]
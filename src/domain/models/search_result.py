@@ -8,6 +8,54 @@ ABP 對比：
 """
 
 from dataclasses import dataclass
+from enum import StrEnum
+
+from src.domain.models.embedding import EmbeddingVector
+
+
+class SearchMode(StrEnum):
+    """
+    搜尋模式
+
+    ABP 對比：
+    public enum SearchMode { Vector, Hybrid }
+
+    - VECTOR: 只依嵌入向量的 cosine 相似度排序，score 為相似度
+    - HYBRID: 向量排名與全文檢索排名以 RRF（reciprocal rank fusion）合併，
+      score 為 RRF 分數（只用於排序，與相似度不可比較）
+    """
+
+    VECTOR = "vector"
+    HYBRID = "hybrid"
+
+
+@dataclass
+class SearchRequest:
+    """
+    搜尋請求（批次搜尋中的一筆）
+
+    ABP 對比：
+    public class SearchDocumentsInput
+    {
+        public string Query { get; set; }
+        public int? Limit { get; set; }
+        public double? Threshold { get; set; }
+        public int? EfSearch { get; set; }
+        public int? Probes { get; set; }
+        public SearchMode Mode { get; set; } = SearchMode.Vector;
+        public bool Rerank { get; set; }
+    }
+
+    limit / threshold 為 None 時使用設定值
+    """
+
+    query: str
+    limit: int | None = None
+    threshold: float | None = None
+    ef_search: int | None = None
+    probes: int | None = None
+    mode: SearchMode = SearchMode.VECTOR
+    rerank: bool = False
 
 
 @dataclass
@@ -22,13 +70,17 @@ class SearchResult:
         public string Title { get; set; }
         public string ContentPreview { get; set; }
         public double Score { get; set; }
+        public Guid? ChunkId { get; set; }
     }
+
+    chunk_id 為此文件最相近的 chunk（重新排序時以此 chunk 的完整內容評分）
     """
 
     document_id: str
     title: str
     content_preview: str
     score: float
+    chunk_id: str | None = None
 
 
 @dataclass
@@ -64,10 +116,12 @@ class DocumentChunk:
         public int ChunkIndex { get; set; }
         public float[] Embedding { get; set; }
     }
+
+    embedding 為 numpy float32 陣列（由 pgvector 二進位格式直接解碼）
     """
 
     chunk_id: str
     document_id: str
     content: str
     chunk_index: int
-    embedding: list[float] | None = None
+    embedding: EmbeddingVector | None = None
@@ -0,0 +1,136 @@
+"""
+有界 LRU + TTL 快取
+
+ABP 對比：
+- ABP: IDistributedCache / IMemoryCache 搭配 MemoryCacheEntryOptions
+  (SizeLimit、AbsoluteExpirationRelativeToNow)
+- Python: 以 OrderedDict 實作程序內快取，並記錄命中率等指標
+
+設計說明：
+- 同時以筆數與估計記憶體用量限制大小，超過時淘汰最久未使用的項目
+- 每筆項目有 TTL，過期項目在讀取時移除
+- 僅在單一 event loop 中使用，不需要加鎖
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """快取指標快照"""
+
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BoundedLRUCache[K: Hashable, V]:
+    """
+    有界 LRU 快取
+
+    ABP 對比：
+    - ABP: IMemoryCache + MemoryCacheOptions.SizeLimit
+    - sizeof 對應 MemoryCacheEntryOptions.Size
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float | None = None,
+        sizeof: Callable[[K, V], int] | None = None,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._sizeof = sizeof or (lambda key, value: 0)
+        # key -> (value, size, expires_at)
+        self._entries: OrderedDict[K, tuple[V, int, float]] = OrderedDict()
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        value, size, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(key, size)
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        size = self._sizeof(key, value)
+        if size > self._max_bytes:
+            # 單筆就超過上限，不快取
+            return
+
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            self._bytes -= existing[1]
+
+        expires_at = time.monotonic() + self._ttl if self._ttl else float("inf")
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        self._evict()
+
+    def invalidate(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: K, size: int) -> None:
+        del self._entries[key]
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的項目，直到筆數與記憶體皆在上限內"""
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            entries=len(self._entries),
+            bytes=self._bytes,
+            max_entries=self._max_entries,
+            max_bytes=self._max_bytes,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+        )
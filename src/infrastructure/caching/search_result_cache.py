@@ -0,0 +1,105 @@
+"""
+搜尋結果快取（以使用者版本號失效）
+
+ABP 對比：
+- ABP: IDistributedCache<SearchResultCacheItem> + 在 DocumentChangedEvent 中移除快取
+- Python: 程序內 BoundedLRUCache，鍵包含使用者目前的版本號
+
+設計說明：
+- 鍵：(owner_id, 版本號, 查詢種類, 查詢雜湊或 document_id, limit, threshold, mode, ...)
+- 文件建立 / 更新 / 刪除 commit 後遞增該使用者的版本號：
+  舊版本的項目不會再被查到，不需要逐一找出並刪除，之後由 LRU / TTL 自然淘汰
+- 版本號取自全域遞增序號，因此不會回到曾經用過的值
+- 多個行程時，其他行程的寫入不會遞增本行程的版本號，最晚在 TTL 後反映
+"""
+
+import hashlib
+import itertools
+import sys
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import Any
+
+from src.config import settings
+from src.infrastructure.caching.lru_cache import BoundedLRUCache, CacheStats
+from src.infrastructure.embeddings.query_cache import normalize_query
+
+SearchCacheKey = tuple[Hashable, ...]
+
+
+def query_hash(query: str) -> str:
+    """正規化後查詢文本的雜湊（鍵中不保留原始查詢）"""
+    return hashlib.sha256(normalize_query(query).encode()).hexdigest()
+
+
+def _estimate_size(key: SearchCacheKey, value: list[Any]) -> int:
+    """估計單筆快取佔用的記憶體（結果物件與其字串欄位）"""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    for item in value:
+        size += sys.getsizeof(item)
+        for field in vars(item).values():
+            size += sys.getsizeof(field)
+    return size
+
+
+class SearchResultCache:
+    """
+    搜尋結果快取
+
+    ABP 對比：
+    public class SearchResultCache
+    {
+        public SearchCacheKey Key(Guid ownerId, params object[] parts);
+        public void BumpVersion(Guid ownerId);  // 文件變更後呼叫
+    }
+
+    使用方式：在查詢開始時以 key() 取得鍵（包含當下的版本號），
+    查詢結束後以同一個鍵寫入；查詢期間有寫入時，結果只會寫到已過期的版本
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float | None = 30,
+    ):
+        self._cache: BoundedLRUCache[SearchCacheKey, list[Any]] = BoundedLRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=_estimate_size,
+        )
+        # owner_id -> 版本號；不淘汰，淘汰後版本號回到 0 會讓舊項目重新可見
+        self._versions: dict[str, int] = {}
+        self._sequence = itertools.count(1)
+
+    def key(self, owner_id: str, *parts: Hashable) -> SearchCacheKey:
+        return (owner_id, self._versions.get(owner_id, 0), *parts)
+
+    def get(self, key: SearchCacheKey) -> list[Any] | None:
+        return self._cache.get(key)
+
+    def set(self, key: SearchCacheKey, value: list[Any]) -> None:
+        self._cache.set(key, value)
+
+    def bump(self, owner_id: str) -> None:
+        """使用者的文件有變更：之後的查詢使用新的版本號"""
+        self._versions[owner_id] = next(self._sequence)
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+@lru_cache(maxsize=1)
+def get_search_result_cache() -> SearchResultCache:
+    """
+    取得搜尋結果快取（Singleton）
+
+    ABP 對比：
+    - ABP: services.AddSingleton<SearchResultCache>()
+    """
+    return SearchResultCache(
+        max_entries=settings.search_cache_max_entries,
+        max_bytes=settings.search_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.search_cache_ttl_seconds,
+    )
@@ -0,0 +1,73 @@
+"""
+文本分塊介面
+
+ABP 對比：
+- ABP: public interface ITextChunker : ITransientDependency
+- 實作可能包含依句子、Markdown 標題或程式碼結構分塊
+- Python: ABC + generator，呼叫端可逐塊處理，不需要一次建立所有 chunks
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+
+class ITokenCounter(ABC):
+    """
+    計算文本長度的單位（嵌入模型的 token，或字元）
+
+    ABP 對比：
+    - ABP: public interface ITokenizer { int CountTokens(string text); }
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """計數單位的名稱（例如 tokenizer 名稱或 "chars"）"""
+        ...
+
+    @property
+    @abstractmethod
+    def max_tokens(self) -> int | None:
+        """
+        模型單次輸入的 token 上限（不含特殊 token），沒有上限時為 None
+
+        超過上限的文本會被模型截斷，超出部分不影響向量
+        """
+        ...
+
+    @abstractmethod
+    def count(self, texts: list[str]) -> list[int]:
+        """批次計算每段文本的長度（批次呼叫可讓 Rust tokenizer 一次處理）"""
+        ...
+
+    @abstractmethod
+    def split(self, text: str, max_tokens: int) -> Iterator[str]:
+        """把超過 max_tokens 的文本依 token 邊界切成多段"""
+        ...
+
+    @abstractmethod
+    def tail(self, text: str, max_tokens: int) -> str:
+        """文本最後 max_tokens 個 token 對應的文字（用於相鄰 chunks 的重疊）"""
+        ...
+
+
+class ITextChunker(ABC):
+    """
+    文本分塊介面
+
+    ABP 對比：
+    public interface ITextChunker
+    {
+        IEnumerable<string> Chunk(string text);
+    }
+    """
+
+    @abstractmethod
+    def chunk(self, text: str) -> Iterator[str]:
+        """
+        逐塊產生 chunks（generator）
+
+        - 每塊不超過設定的 token 數（也不超過模型上限）
+        - 相鄰兩塊有 chunk_overlap 個 token 左右的重疊
+        """
+        ...
@@ -0,0 +1,70 @@
+"""
+中日韓文本分塊（串流、線性時間）
+
+ABP 對比：
+- ABP: public class CjkTextChunker : WindowTextChunker
+- Python: 以中日韓標點分句，打包與重疊由 WindowChunker 處理
+
+設計說明：
+- 中日韓文本的句子之間沒有空白，以空白連接句子會改變原文，也會多出 token；
+  這裡保留每句結尾原本的空白（或換行），以空字串連接
+- 半形句號不視為句尾（小數、縮寫、網址），英文句子會跟著所在的行
+- 沒有句末標點的長段落（例如以逗號連接的長句）依子句標點（，、；：）切開，
+  仍超過時才依 token 邊界切開，避免在詞的中間切斷
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+
+from src.infrastructure.chunking.window import WindowChunker
+
+# 句子：到全形句末標點、半形問號驚嘆號或換行為止，緊接的右引號 / 右括號屬於同一句，
+# 結尾的空白保留在句子中
+_SENTENCE = re.compile(
+    r"[^。！？!?\n]*(?:[。！？!?]+[」』”’）)】》]*|\n)\s*|[^。！？!?\n]+$"
+)
+
+# 子句：到逗號、頓號、分號、冒號為止
+_CLAUSE = re.compile(r"[^，、；：,;]+[，、；：,;]*\s*|[，、；：,;]+\s*")
+
+# 句子結尾的連續空白以一個字元保留（換行優先）
+_TRAILING_SPACE = re.compile(r"\s+$")
+
+
+def _normalize(unit: str) -> str:
+    unit = unit.lstrip()
+    return _TRAILING_SPACE.sub(
+        lambda match: "\n" if "\n" in match.group() else " ", unit
+    )
+
+
+class CJKChunker(WindowChunker):
+    """
+    中日韓文本分塊器（ChunkingStrategy.CJK）
+
+    ABP 對比：
+    public class CjkTextChunker : WindowTextChunker
+    {
+        protected override string Separator => "";
+        protected override IEnumerable<string> SplitUnits(string text) => SplitCjkSentences(text);
+    }
+    """
+
+    separator = ""
+
+    def chunk(self, text: str) -> Iterator[str]:
+        # 句子保留了結尾的空白 / 換行，產生時去除 chunk 前後的空白
+        for chunk in super().chunk(text):
+            if chunk := chunk.strip():
+                yield chunk
+
+    def _units(self, text: str) -> Iterator[str]:
+        for match in _SENTENCE.finditer(text):
+            if match.group().strip():
+                yield _normalize(match.group())
+
+    def _split(self, unit: str, limit: int) -> Iterable[str]:
+        """過長的句子依子句標點切開（仍過長的子句由基底依 token 邊界切開）"""
+        for match in _CLAUSE.finditer(unit):
+            if match.group().strip():
+                yield _normalize(match.group())
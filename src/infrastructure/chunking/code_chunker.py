@@ -0,0 +1,82 @@
+"""
+程式碼分塊（依頂層定義，串流、線性時間）
+
+ABP 對比：
+- ABP: public class CodeTextChunker : WindowTextChunker（例如以 Roslyn 取得宣告範圍）
+- Python: 不解析語法，以縮排與空行判斷頂層定義，適用於大多數語言
+
+設計說明：
+- 依句子分塊會在 "." 切開程式碼（方法呼叫、小數），並以空白連接而失去縮排與換行
+- 空行之後第一個沒有縮排的行開始一個頂層單位（函式、類別、import 區塊），
+  緊接在定義之前的註解與 decorator 屬於同一個單位；單位內的縮排與空行原樣保留
+- 過長的單位（例如大型類別）先依內部的空行（方法之間）切開，仍過長時依行切開
+"""
+
+import io
+from collections.abc import Iterable, Iterator
+
+from src.infrastructure.chunking.window import WindowChunker
+
+
+def _blank_separated(lines: list[str]) -> Iterator[str]:
+    """以空行分隔的區塊（去除前後空行，保留縮排）"""
+    block: list[str] = []
+    for line in lines:
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+class CodeChunker(WindowChunker):
+    """
+    依頂層定義分塊的程式碼分塊器（ChunkingStrategy.CODE）
+
+    ABP 對比：
+    public class CodeTextChunker : WindowTextChunker
+    {
+        protected override string Separator => "\\n\\n";
+        protected override IEnumerable<string> SplitUnits(string text) => SplitTopLevelDeclarations(text);
+    }
+    """
+
+    separator = "\n\n"
+
+    def _units(self, text: str) -> Iterator[str]:
+        lines: list[str] = []
+        after_blank = True
+        for line in io.StringIO(text):
+            line = line.rstrip()
+            if not line:
+                after_blank = True
+                if lines:
+                    lines.append(line)
+                continue
+            # 空行之後沒有縮排的行開始新的單位（右括號等收尾的行前面通常沒有空行）
+            if after_blank and lines and not line[0].isspace():
+                yield "\n".join(lines).rstrip("\n")
+                lines = []
+            lines.append(line)
+            after_blank = False
+        if lines:
+            yield "\n".join(lines).rstrip("\n")
+
+    def _split(self, unit: str, limit: int) -> Iterable[str]:
+        """
+        過長的單位依內部的空行切開（每段再依行切開）
+
+        切開的部分之間不加重疊，由外層的視窗處理（與 MarkdownChunker 相同）
+        """
+        return self._pack(
+            _blank_separated(unit.split("\n")),
+            limit,
+            0,
+            self.separator,
+            self._split_lines,
+        )
+
+    def _split_lines(self, unit: str, limit: int) -> Iterator[str]:
+        return self._pack(unit.split("\n"), limit, 0, "\n", self._split_tokens)
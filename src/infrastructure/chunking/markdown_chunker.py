@@ -0,0 +1,208 @@
+"""
+Markdown 分塊（依標題分段，串流、線性時間）
+
+ABP 對比：
+- ABP: public class MarkdownTextChunker : WindowTextChunker（例如以 Markdig 解析）
+- Python: 逐行掃描的輕量解析（ATX 標題、圍欄程式碼區塊、表格、段落），不建立語法樹
+
+設計說明：
+- chunk 不跨越標題：每個標題下的內容各自打包，並以所屬的標題路徑（# A / ## B）開頭，
+  只有內文的 chunk 也保留它在文件中的位置
+- 段落、表格、程式碼區塊是打包的單位，放得下時不會被切開
+- 過長的區塊依結構切開：表格依列切開並在每段重複表頭，程式碼區塊依行切開並重新加上圍欄，
+  段落依行與句子切開
+- 以 StringIO 逐行讀取，區塊與標題段落以 generator 逐一產生
+"""
+
+import io
+import itertools
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from src.infrastructure.chunking.sentence_chunker import iter_sentences
+from src.infrastructure.chunking.window import WindowChunker
+
+# ATX 標題：# 到 ######，結尾的 # 序列不屬於標題文字
+_HEADING = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+
+# 圍欄程式碼區塊的開頭：``` 或 ~~~（三個以上）
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+# 表格的表頭分隔列：| --- | :---: |
+_TABLE_DELIMITER = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+
+
+@dataclass
+class _Block:
+    """標題段落中的一個區塊（段落 / 表格 / 程式碼區塊）"""
+
+    section: int
+    headings: tuple[str, ...]
+    text: str
+
+
+def _is_table_row(line: str) -> bool:
+    return line.lstrip().startswith("|")
+
+
+def _closes_fence(line: str, fence: str) -> bool:
+    stripped = line.strip()
+    return len(stripped) >= len(fence) and set(stripped) == {fence[0]}
+
+
+class MarkdownChunker(WindowChunker):
+    """
+    依標題分段的 Markdown 分塊器（ChunkingStrategy.MARKDOWN）
+
+    ABP 對比：
+    public class MarkdownTextChunker : WindowTextChunker
+    {
+        public override IEnumerable<string> Chunk(string text)
+        {
+            foreach (var section in ParseSections(text))
+                foreach (var chunk in Pack(section.Blocks))
+                    yield return section.HeadingPath + "\\n\\n" + chunk;
+        }
+    }
+    """
+
+    separator = "\n\n"
+
+    def chunk(self, text: str) -> Iterator[str]:
+        for (_, headings), blocks in itertools.groupby(
+            self._blocks(text), key=lambda block: (block.section, block.headings)
+        ):
+            prefix, limit = self._section_prefix(headings)
+            overlap = min(self._chunk_overlap, limit - 1)
+            units = (block.text for block in blocks)
+            for chunk in self._pack(units, limit, overlap, self.separator, self._split):
+                yield f"{prefix}{self.separator}{chunk}" if prefix else chunk
+
+    def _units(self, text: str) -> Iterator[str]:
+        return (block.text for block in self._blocks(text))
+
+    def _section_prefix(self, headings: tuple[str, ...]) -> tuple[str, int]:
+        """
+        回傳 (標題路徑, 內文可用的 token 數)
+
+        標題路徑佔掉超過一半的 chunk_size 時只保留最後一層標題，仍太長時不加標題
+        """
+        for candidate in (headings, headings[-1:]):
+            if not candidate:
+                break
+            prefix = "\n".join(candidate)
+            limit = self._chunk_size - self._count(prefix) - self._count(self.separator)
+            if limit >= self._chunk_size // 2:
+                return prefix, limit
+        return "", self._chunk_size
+
+    def _blocks(self, text: str) -> Iterator[_Block]:
+        """逐行掃描，產生每個區塊與它所屬的標題路徑"""
+        headings: list[tuple[int, str]] = []
+        section = 0
+        lines: list[str] = []
+        fence: str | None = None
+
+        def block() -> _Block:
+            return _Block(
+                section, tuple(heading for _, heading in headings), "\n".join(lines)
+            )
+
+        for line in io.StringIO(text):
+            line = line.rstrip("\r\n")
+
+            if fence is not None:
+                lines.append(line)
+                if _closes_fence(line, fence):
+                    yield block()
+                    lines, fence = [], None
+                continue
+
+            if match := _FENCE.match(line):
+                if lines:
+                    yield block()
+                lines, fence = [line], match.group(1)
+                continue
+
+            if match := _HEADING.match(line):
+                if lines:
+                    yield block()
+                    lines = []
+                level = len(match.group(1))
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, f"{match.group(1)} {match.group(2)}"))
+                section += 1
+                continue
+
+            if not line.strip():
+                if lines:
+                    yield block()
+                    lines = []
+                continue
+
+            # 段落與表格之間不一定有空行
+            if lines and _is_table_row(lines[-1]) != _is_table_row(line):
+                yield block()
+                lines = []
+            lines.append(line)
+
+        # 最後一個區塊（包含沒有結束圍欄的程式碼區塊）
+        if lines:
+            yield block()
+
+    def _tail(self, unit: str, tokens: int) -> str:
+        """程式碼區塊的重疊取自內容的結尾，不包含圍欄（避免下一塊以結束圍欄開頭）"""
+        if match := _FENCE.match(unit):
+            _, *body = unit.split("\n")
+            if body and _closes_fence(body[-1], match.group(1)):
+                body.pop()
+            return super()._tail("\n".join(body), tokens)
+        return super()._tail(unit, tokens)
+
+    def _split(self, unit: str, limit: int) -> Iterable[str]:
+        """過長的區塊依結構切開"""
+        if match := _FENCE.match(unit):
+            return self._split_code(unit, match.group(1), limit)
+        if _is_table_row(unit):
+            return self._split_table(unit, limit)
+        return self._split_paragraph(unit, limit)
+
+    def _split_code(self, unit: str, fence: str, limit: int) -> Iterator[str]:
+        """依行切開，每段重新加上開頭與結束的圍欄"""
+        opening, *body = unit.split("\n")
+        if body and _closes_fence(body[-1], fence):
+            body.pop()
+        body_limit = limit - self._count(f"{opening}\n\n{fence}")
+        if body_limit < limit // 2:
+            yield from self._pack(unit.split("\n"), limit, 0, "\n", self._split_tokens)
+            return
+        for part in self._pack(body, body_limit, 0, "\n", self._split_tokens):
+            yield f"{opening}\n{part}\n{fence}"
+
+    def _split_table(self, unit: str, limit: int) -> Iterator[str]:
+        """依列切開，每段重複表頭（表頭與分隔列）"""
+        lines = unit.split("\n")
+        if len(lines) > 2 and _TABLE_DELIMITER.match(lines[1]):
+            header, rows = "\n".join(lines[:2]), lines[2:]
+            rows_limit = limit - self._count(f"{header}\n")
+            if rows_limit >= limit // 2:
+                for part in self._pack(rows, rows_limit, 0, "\n", self._split_tokens):
+                    yield f"{header}\n{part}"
+                return
+        yield from self._pack(lines, limit, 0, "\n", self._split_tokens)
+
+    def _split_paragraph(self, unit: str, limit: int) -> Iterable[str]:
+        """
+        多行（例如清單）依行切開，單行依句子切開
+
+        切開的部分之間不加重疊：這些部分會再交給外層的視窗打包，重疊由外層處理，
+        這裡也加的話同一段文字會在一個 chunk 中出現兩次
+        """
+        if "\n" in unit:
+            return self._pack(unit.split("\n"), limit, 0, "\n", self._split_sentences)
+        return self._split_sentences(unit, limit)
+
+    def _split_sentences(self, unit: str, limit: int) -> Iterator[str]:
+        return self._pack(iter_sentences(unit), limit, 0, " ", self._split_tokens)
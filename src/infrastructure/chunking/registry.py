@@ -0,0 +1,85 @@
+"""
+分塊器註冊表（依文件的分塊方式選擇分塊器）
+
+ABP 對比：
+- ABP: services.AddKeyedSingleton<ITextChunker, MarkdownTextChunker>(ChunkingStrategy.Markdown)
+- Python: ChunkingStrategy → 分塊器類別的 dict，實例以 lru_cache 在每個行程建立一次
+
+設計說明：
+- 所有分塊器共用同一個 token 計數方式與 CHUNK_SIZE / CHUNK_OVERLAP
+- 新增格式時實作 WindowChunker 的子類別並加入 CHUNKERS（以及 ChunkingStrategy）
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import PurePath
+
+from src.config import settings
+from src.domain.models.document import ChunkingStrategy
+from src.infrastructure.chunking.base import ITextChunker, ITokenCounter
+from src.infrastructure.chunking.cjk_chunker import CJKChunker
+from src.infrastructure.chunking.code_chunker import CodeChunker
+from src.infrastructure.chunking.markdown_chunker import MarkdownChunker
+from src.infrastructure.chunking.sentence_chunker import SentenceChunker
+from src.infrastructure.chunking.token_counters import get_token_counter
+
+# (計數方式, chunk_size, chunk_overlap) → 分塊器
+ChunkerFactory = Callable[[ITokenCounter, int, int], ITextChunker]
+
+CHUNKERS: dict[ChunkingStrategy, ChunkerFactory] = {
+    ChunkingStrategy.TEXT: SentenceChunker,
+    ChunkingStrategy.MARKDOWN: MarkdownChunker,
+    ChunkingStrategy.CODE: CodeChunker,
+    ChunkingStrategy.CJK: CJKChunker,
+}
+
+# 副檔名 → 分塊方式（匯入目錄時依檔名選擇，其他副檔名使用 TEXT）
+_MARKDOWN_EXTENSIONS = {".md", ".markdown", ".mdx"}
+_CODE_EXTENSIONS = {
+    ".c",
+    ".cc",
+    ".cpp",
+    ".cs",
+    ".go",
+    ".h",
+    ".hpp",
+    ".java",
+    ".js",
+    ".jsx",
+    ".kt",
+    ".php",
+    ".py",
+    ".rb",
+    ".rs",
+    ".scala",
+    ".sh",
+    ".sql",
+    ".swift",
+    ".ts",
+    ".tsx",
+}
+
+
+@lru_cache(maxsize=len(CHUNKERS))
+def get_text_chunker(
+    strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
+) -> ITextChunker:
+    """
+    取得分塊器（每種分塊方式一個 Singleton，Process Pool 的每個 worker 各建立一次）
+
+    ABP 對比：
+    - ABP: serviceProvider.GetRequiredKeyedService<ITextChunker>(strategy)
+    """
+    return CHUNKERS[strategy](
+        get_token_counter(), settings.chunk_size, settings.chunk_overlap
+    )
+
+
+def strategy_for_path(path: str | PurePath) -> ChunkingStrategy:
+    """依副檔名選擇分塊方式"""
+    suffix = PurePath(path).suffix.lower()
+    if suffix in _MARKDOWN_EXTENSIONS:
+        return ChunkingStrategy.MARKDOWN
+    if suffix in _CODE_EXTENSIONS:
+        return ChunkingStrategy.CODE
+    return ChunkingStrategy.TEXT
@@ -0,0 +1,41 @@
+"""
+依句子邊界分塊（串流、線性時間）
+
+ABP 對比：
+- ABP: public class SentenceTextChunker : WindowTextChunker
+- Python: 以編譯好的 regex 逐句掃描，打包與重疊由 WindowChunker 處理
+
+設計說明：
+- 句子以 finditer 逐一取出，不會先建立整份文本的句子清單
+- 單一句子超過 chunk_size 時依 token 邊界切開
+"""
+
+import re
+from collections.abc import Iterator
+
+from src.infrastructure.chunking.window import WindowChunker
+
+# 句子：到句末標點（中英文句號、問號、驚嘆號，可連續）為止，最後一句可以沒有標點
+_SENTENCE = re.compile(r"[^。！？.!?]+[。！？.!?]*|[。！？.!?]+")
+
+
+def iter_sentences(text: str) -> Iterator[str]:
+    """逐句產生（去除前後空白，略過空句）"""
+    for match in _SENTENCE.finditer(text):
+        if sentence := match.group().strip():
+            yield sentence
+
+
+class SentenceChunker(WindowChunker):
+    """
+    依句子邊界、以 token 數控制大小的分塊器（ChunkingStrategy.TEXT）
+
+    ABP 對比：
+    public class SentenceTextChunker : WindowTextChunker
+    {
+        protected override IEnumerable<string> SplitUnits(string text) => SplitSentences(text);
+    }
+    """
+
+    def _units(self, text: str) -> Iterator[str]:
+        return iter_sentences(text)
@@ -0,0 +1,177 @@
+"""
+分塊長度的計數方式（嵌入模型的 token / 字元）
+
+ABP 對比：
+- ABP: 通常以 Microsoft.ML.Tokenizers 依模型計算 token 數
+- Python: sentence-transformers 模型內的 Hugging Face tokenizer，OpenAI 模型使用 tiktoken
+
+設計說明：
+- 以字元數分塊時，chunk 的 token 數隨語言差異很大（CJK 一個字通常就是一個以上 token），
+  超過模型上限的部分會被截斷，嵌入時花了運算卻不影響向量
+- 改用模型自己的 tokenizer 計算，chunk 大小與上限直接以 token 比較
+"""
+
+import logging
+import threading
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Any
+
+from src.config import settings
+from src.infrastructure.chunking.base import ITokenCounter
+from src.infrastructure.embeddings.local_embeddings import load_tokenizer
+
+logger = logging.getLogger(__name__)
+
+CHUNK_TOKENIZERS = ("model", "chars")
+
+# OpenAI 嵌入模型的輸入上限（text-embedding-3-* / ada-002）
+_OPENAI_MAX_TOKENS = 8191
+
+
+class CharacterCounter(ITokenCounter):
+    """以字元數計算（沒有模型上限）"""
+
+    @property
+    def name(self) -> str:
+        return "chars"
+
+    @property
+    def max_tokens(self) -> int | None:
+        return None
+
+    def count(self, texts: list[str]) -> list[int]:
+        return [len(text) for text in texts]
+
+    def split(self, text: str, max_tokens: int) -> Iterator[str]:
+        for start in range(0, len(text), max_tokens):
+            yield text[start : start + max_tokens]
+
+    def tail(self, text: str, max_tokens: int) -> str:
+        return text[-max_tokens:] if max_tokens > 0 else ""
+
+
+class HuggingFaceTokenCounter(ITokenCounter):
+    """
+    sentence-transformers 模型的 tokenizer
+
+    ABP 對比：
+    - ABP: BertTokenizer.CountTokens(text)
+
+    max_seq_length 包含 [CLS] / [SEP] 等特殊 token，可用於內容的 token 數要扣掉它們
+
+    分塊在 worker thread 中執行：Rust tokenizer 每次呼叫會設定截斷 / padding 狀態，
+    同一個實例被多個 thread 同時呼叫時可能拋出 "Already borrowed"，因此以 lock 串行化
+    """
+
+    def __init__(self, tokenizer: Any, max_seq_length: int):
+        self._tokenizer = tokenizer
+        self._lock = threading.Lock()
+        self._max_tokens = max_seq_length - tokenizer.num_special_tokens_to_add(
+            pair=False
+        )
+
+    @property
+    def name(self) -> str:
+        return self._tokenizer.name_or_path
+
+    @property
+    def max_tokens(self) -> int | None:
+        return self._max_tokens
+
+    def _encode(self, texts: str | list[str], **kwargs: Any) -> Any:
+        # 不截斷也不警告：這裡只計算長度，超過上限的文本會再切開
+        with self._lock:
+            return self._tokenizer(
+                texts,
+                add_special_tokens=False,
+                return_attention_mask=False,
+                return_token_type_ids=False,
+                verbose=False,
+                **kwargs,
+            )
+
+    def count(self, texts: list[str]) -> list[int]:
+        if not texts:
+            return []
+        return [len(ids) for ids in self._encode(texts)["input_ids"]]
+
+    def split(self, text: str, max_tokens: int) -> Iterator[str]:
+        if not self._tokenizer.is_fast:
+            # 慢速（純 Python）tokenizer 沒有 offset mapping，改以 decode 還原
+            ids = self._encode(text)["input_ids"]
+            for start in range(0, len(ids), max_tokens):
+                yield self._tokenizer.decode(ids[start : start + max_tokens])
+            return
+
+        # 依 token 的字元位置切開原文，不經過 decode（保留原本的空白與大小寫）
+        offsets = self._encode(text, return_offsets_mapping=True)["offset_mapping"]
+        for start in range(0, len(offsets), max_tokens):
+            end = min(start + max_tokens, len(offsets)) - 1
+            yield text[offsets[start][0] : offsets[end][1]]
+
+    def tail(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        if not self._tokenizer.is_fast:
+            ids = self._encode(text)["input_ids"]
+            return self._tokenizer.decode(ids[-max_tokens:])
+        offsets = self._encode(text, return_offsets_mapping=True)["offset_mapping"]
+        if not offsets:
+            return ""
+        return text[offsets[-min(max_tokens, len(offsets))][0] :]
+
+
+class TiktokenCounter(ITokenCounter):
+    """OpenAI 嵌入模型的 tokenizer（需要安裝 tiktoken）"""
+
+    def __init__(self, model_name: str):
+        import tiktoken
+
+        self._encoding = tiktoken.encoding_for_model(model_name)
+
+    @property
+    def name(self) -> str:
+        return self._encoding.name
+
+    @property
+    def max_tokens(self) -> int | None:
+        return _OPENAI_MAX_TOKENS
+
+    def count(self, texts: list[str]) -> list[int]:
+        return [len(ids) for ids in self._encoding.encode_ordinary_batch(texts)]
+
+    def split(self, text: str, max_tokens: int) -> Iterator[str]:
+        ids = self._encoding.encode_ordinary(text)
+        for start in range(0, len(ids), max_tokens):
+            yield self._encoding.decode(ids[start : start + max_tokens])
+
+    def tail(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        return self._encoding.decode(self._encoding.encode_ordinary(text)[-max_tokens:])
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> ITokenCounter:
+    """
+    取得分塊使用的計數方式（Singleton，Process Pool 的每個 worker 各建立一次）
+
+    ABP 對比：
+    - ABP: services.AddSingleton<ITokenizer>(...)
+
+    CHUNK_TOKENIZER=model 時使用目前嵌入模型的 tokenizer；
+    OpenAI 模型沒有安裝 tiktoken 時改以字元數計算
+    """
+    if settings.chunk_tokenizer not in CHUNK_TOKENIZERS:
+        raise ValueError(f"Unknown chunk tokenizer: {settings.chunk_tokenizer}")
+    if settings.chunk_tokenizer == "chars":
+        return CharacterCounter()
+
+    if settings.embedding_provider == "openai":
+        try:
+            return TiktokenCounter(settings.openai_embedding_model)
+        except ImportError:
+            logger.warning("tiktoken is not installed, chunking by characters")
+            return CharacterCounter()
+    return HuggingFaceTokenCounter(*load_tokenizer(settings.embedding_model))
@@ -0,0 +1,208 @@
+"""
+以 token 數打包單位的分塊基底（串流、線性時間）
+
+ABP 對比：
+- ABP: public abstract class WindowTextChunker : ITextChunker
+- Python: 子類別只定義如何把文本切成單位（句子、區塊、定義），打包與重疊由基底處理
+
+設計說明：
+- 單位以 generator 逐一產生，token 數以批次呼叫 tokenizer 計算，每個單位只計算一次
+- 視窗以 deque 保存目前 chunk 的單位與累計 token 數（含單位之間的分隔符號）：
+  產生一塊後從左側移除單位，直到剩下的不超過 chunk_overlap，留下的單位即為重疊；
+  重疊還有剩餘的 token 數時（例如最後一個句子就超過 chunk_overlap），
+  再從最後移除的單位取結尾的 token 補上，重疊不會因為單位太長而消失
+- 每個單位只加入與移除視窗各一次，輸出的 chunk 總長度約為原文的
+  chunk_size / (chunk_size - chunk_overlap) 倍，整體為 O(n)
+- 超過上限的單位先交給子類別依結構切開（例如段落切成句子），仍超過時在詞之間切開，
+  單一個詞仍超過時才依 token 邊界切開，不交給模型截斷；
+  切開的大小扣掉 chunk_overlap，相鄰兩塊之間仍放得下重疊
+"""
+
+import itertools
+from abc import abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+
+from src.infrastructure.chunking.base import ITextChunker, ITokenCounter
+
+# (單位, 上限) → 較小的單位
+SplitFunction = Callable[[str, int], Iterable[str]]
+
+# 每次送進 tokenizer 計算的單位數
+_COUNT_BATCH_SIZE = 256
+
+
+class WindowChunker(ITextChunker):
+    """
+    以 token 數打包單位的分塊器基底
+
+    ABP 對比：
+    public abstract class WindowTextChunker : ITextChunker
+    {
+        protected abstract IEnumerable<string> SplitUnits(string text);
+        public IEnumerable<string> Chunk(string text) => Pack(SplitUnits(text));
+    }
+
+    chunk_size 超過模型上限時以上限為準（超出的部分會被模型截斷，不影響向量）
+    """
+
+    # 單位之間的分隔符號
+    separator = " "
+
+    def __init__(self, counter: ITokenCounter, chunk_size: int, chunk_overlap: int):
+        if counter.max_tokens is not None:
+            chunk_size = min(chunk_size, counter.max_tokens)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be between 0 and chunk_size")
+
+        self._counter = counter
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        # 分隔符號的 token 數：字元計數時為字元數，WordPiece 等 tokenizer 不為空白產生 token
+        self._separator_tokens: dict[str, int] = {}
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    def chunk(self, text: str) -> Iterator[str]:
+        return self._pack(
+            self._units(text),
+            self._chunk_size,
+            self._chunk_overlap,
+            self.separator,
+            self._split,
+        )
+
+    @abstractmethod
+    def _units(self, text: str) -> Iterator[str]:
+        """逐一產生分塊單位（不產生空字串）"""
+        ...
+
+    def _split(self, unit: str, limit: int) -> Iterable[str]:
+        """超過 limit 的單位依結構切成較小的單位（預設不切，由基底在詞之間切開）"""
+        return (unit,)
+
+    def _split_tokens(self, unit: str, limit: int) -> Iterator[str]:
+        """依空白切成詞再打包（不在詞的中間切開），單一個詞超過 limit 時依 token 邊界切開"""
+        words = unit.split()
+        if len(words) <= 1:
+            return self._split_at_tokens(unit, limit)
+        return self._pack(words, limit, 0, " ", self._split_at_tokens)
+
+    def _split_at_tokens(self, unit: str, limit: int) -> Iterator[str]:
+        for part in self._counter.split(unit, limit):
+            if part := part.strip():
+                yield part
+
+    def _tail(self, unit: str, tokens: int) -> str:
+        """
+        單位結尾不超過 tokens 個 token 的文字（重疊用）
+
+        從詞的中間開始時跳到下一個空白之後；沒有空白時不以半個英文詞作為重疊
+        （CJK 等沒有空白的文本保留原樣）
+        """
+        tail = self._counter.tail(unit, tokens)
+        start = len(unit) - len(tail)
+        if (
+            tail
+            and 0 < start <= len(unit)
+            and not unit[start - 1].isspace()
+            and not tail[0].isspace()
+        ):
+            words = tail.split(maxsplit=1)
+            if len(words) > 1:
+                tail = words[1]
+            elif tail[0].isascii() and tail[0].isalnum():
+                return ""
+        return tail.lstrip()
+
+    def _count(self, text: str) -> int:
+        (tokens,) = self._counter.count([text])
+        return tokens
+
+    def _pack(
+        self,
+        units: Iterable[str],
+        limit: int,
+        overlap: int,
+        separator: str,
+        split: SplitFunction,
+    ) -> Iterator[str]:
+        """把單位依序放進視窗，超過 limit 時產生一塊並保留不超過 overlap 的結尾作為重疊"""
+        if separator not in self._separator_tokens:
+            self._separator_tokens[separator] = self._count(separator)
+        separator_tokens = self._separator_tokens[separator]
+
+        # 過長的單位切成較小的塊，留下重疊（與分隔符號）的空間
+        piece_limit = max(limit - overlap - separator_tokens, 1) if overlap else limit
+
+        window: deque[tuple[str, int]] = deque()
+        window_tokens = 0
+
+        for piece, tokens in self._pieces(units, limit, piece_limit, split):
+            if window and window_tokens + separator_tokens + tokens > limit:
+                yield separator.join(unit for unit, _ in window)
+
+                # 重疊：保留最後不超過 overlap 的單位，且要放得下這一個
+                removed: str | None = None
+                while window and (
+                    window_tokens > overlap
+                    or window_tokens + separator_tokens + tokens > limit
+                ):
+                    removed, removed_tokens = window.popleft()
+                    window_tokens -= removed_tokens + (
+                        separator_tokens if window else 0
+                    )
+
+                # 重疊不足 overlap 時，以最後移除的單位的結尾補上
+                budget = overlap - window_tokens - (separator_tokens if window else 0)
+                if removed is not None and budget > 0:
+                    tail = self._tail(removed, budget)
+                    tail_tokens = self._count(tail) if tail else 0
+                    extra = tail_tokens + (separator_tokens if window else 0)
+                    if (
+                        tail
+                        and tail_tokens <= budget
+                        and window_tokens + extra + separator_tokens + tokens <= limit
+                    ):
+                        window.appendleft((tail, tail_tokens))
+                        window_tokens += extra
+
+            if window:
+                window_tokens += separator_tokens
+            window.append((piece, tokens))
+            window_tokens += tokens
+
+        # 最後一塊（每次產生 chunk 後都會再加入新的單位，視窗不會只剩重疊部分）
+        if window:
+            yield separator.join(unit for unit, _ in window)
+
+    def _pieces(
+        self,
+        units: Iterable[str],
+        limit: int,
+        piece_limit: int,
+        split: SplitFunction,
+    ) -> Iterator[tuple[str, int]]:
+        """
+        逐一產生 (單位, token 數)
+
+        超過 limit 的單位先以 split 依結構切開（上限為 limit），
+        仍超過 limit 的部分在詞之間切成不超過 piece_limit 的塊
+        """
+        units = iter(units)
+        while batch := list(itertools.islice(units, _COUNT_BATCH_SIZE)):
+            for unit, tokens in zip(batch, self._counter.count(batch)):
+                if tokens <= limit:
+                    yield unit, tokens
+                    continue
+                parts = list(split(unit, limit))
+                for part, part_tokens in zip(parts, self._counter.count(parts)):
+                    if part_tokens <= limit:
+                        yield part, part_tokens
+                        continue
+                    pieces = list(self._split_tokens(part, piece_limit))
+                    yield from zip(pieces, self._counter.count(pieces))
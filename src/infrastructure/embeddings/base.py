@@ -9,6 +9,12 @@ ABP 對比：
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+import numpy as np
+
+from src.domain.models.embedding import EmbeddingMatrix, EmbeddingVector
+from src.infrastructure.embeddings.executor import get_embedding_executor
 
 
 class IEmbeddingService(ABC):
@@ -21,14 +27,16 @@ class IEmbeddingService(ABC):
     """
 
     @abstractmethod
-    def embed(self, texts: list[str]) -> list[list[float]]:
+    def embed(self, texts: list[str]) -> EmbeddingMatrix:
         """
-        將文本轉換為嵌入向量
+        將文本轉換為嵌入向量（shape = (len(texts), dimension) 的 float32 陣列）
 
         ABP 對比：
         - ABP: Task<List<float[]>> GenerateEmbeddingsAsync(List<string> texts)
         - 這裡使用同步方法，因為 sentence-transformers 是 CPU 密集型
-        - 可以考慮使用 run_in_executor 包裝為非同步
+        - 在 async 程式碼中請改用 aembed，避免阻塞 event loop
+        - 回傳 numpy float32 陣列而非 list[list[float]]，
+          避免為每個維度建立 Python float 物件
         """
         ...
 
@@ -43,7 +51,18 @@ class IEmbeddingService(ABC):
         """
         ...
 
-    def embed_single(self, text: str) -> list[float]:
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """
+        嵌入模型名稱（用於快取鍵，不同模型的向量不可混用）
+
+        ABP 對比：
+        - ABP: string ModelName { get; }
+        """
+        ...
+
+    def embed_single(self, text: str) -> EmbeddingVector:
         """
         便利方法：嵌入單一文本
 
@@ -51,3 +70,30 @@ class IEmbeddingService(ABC):
         - ABP 可能會有 GenerateEmbeddingAsync(string text) 單一版本
         """
         return self.embed([text])[0]
+
+    async def aembed(self, texts: list[str]) -> EmbeddingMatrix:
+        """
+        非同步版本：在有界執行器中執行 embed
+
+        ABP 對比：
+        - ABP: await Task.Run(() => GenerateEmbeddings(texts))
+        - Python: 透過 EmbeddingExecutor 執行，不阻塞 event loop
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return await get_embedding_executor().run(self._embed_task(), texts)
+
+    async def aembed_single(self, text: str) -> EmbeddingVector:
+        """
+        非同步版本：嵌入單一文本
+        """
+        return (await self.aembed([text]))[0]
+
+    def _embed_task(self) -> Callable[[list[str]], EmbeddingMatrix]:
+        """
+        交給執行器的同步函式
+
+        使用 Process Pool 時，回傳的函式必須可被 pickle，
+        子類別可覆寫此方法提供模組層級的函式
+        """
+        return self.embed
@@ -0,0 +1,150 @@
+"""
+跨請求微批次嵌入服務（Micro-batching）
+
+ABP 對比：
+- ABP 沒有內建對應，概念類似 DataLoader 的批次合併，
+  或使用 Channel<T> 收集請求後由背景 worker 一次處理
+- Python: 以 asyncio.Future 收集同一時間窗口內的查詢文本
+
+設計說明：
+- 大量並行的 searchDocuments 各自呼叫 embed_single，
+  每次都是 batch size = 1 的 encode，浪費 sentence-transformers 的批次吞吐量
+- 此服務在 max_wait_ms 內或累積 max_batch_size 筆時一次 encode，
+  再把各自的向量回傳給等待中的請求
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from src.domain.models.embedding import EmbeddingMatrix, EmbeddingVector
+from src.infrastructure.embeddings.base import IEmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MicroBatchStats:
+    """微批次指標快照"""
+
+    max_batch_size: int
+    max_wait_ms: float
+    pending: int
+    batches: int
+    items: int
+    largest_batch: int
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+class MicroBatchingEmbeddingService(IEmbeddingService):
+    """
+    微批次嵌入服務（Decorator）
+
+    ABP 對比：
+    - ABP: 類似以 Decorator Pattern 包裝 IEmbeddingService
+    - 只合併 aembed_single（查詢路徑），批次的 aembed 直接轉給內部服務
+    """
+
+    def __init__(
+        self,
+        inner: IEmbeddingService,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._inner = inner
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: list[tuple[str, asyncio.Future[EmbeddingVector]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+
+    @property
+    def inner(self) -> IEmbeddingService:
+        return self._inner
+
+    @property
+    def dimension(self) -> int:
+        return self._inner.dimension
+
+    @property
+    def model_name(self) -> str:
+        return self._inner.model_name
+
+    def embed(self, texts: list[str]) -> EmbeddingMatrix:
+        return self._inner.embed(texts)
+
+    async def aembed(self, texts: list[str]) -> EmbeddingMatrix:
+        return await self._inner.aembed(texts)
+
+    async def aembed_single(self, text: str) -> EmbeddingVector:
+        """
+        將查詢文本加入目前的批次，等待批次 encode 完成後取回自己的向量
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[EmbeddingVector] = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """取出目前累積的請求，交給背景 task 執行 encode"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        # 保留參照，避免 task 在完成前被 GC
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self,
+        batch: list[tuple[str, asyncio.Future[EmbeddingVector]]],
+    ) -> None:
+        # 同一批次中相同的查詢只 encode 一次
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+
+        self._batches += 1
+        self._items += len(batch)
+        self._largest_batch = max(self._largest_batch, len(unique_texts))
+
+        try:
+            vectors = await self._inner.aembed(unique_texts)
+        except Exception as e:  # noqa: BLE001  原樣轉交給這一批的每個呼叫端
+            logger.warning(f"Micro-batch of {len(unique_texts)} texts failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            # 請求可能已被取消（例如 client 中斷連線）
+            if not future.done():
+                future.set_result(by_text[text])
+
+    def stats(self) -> MicroBatchStats:
+        return MicroBatchStats(
+            max_batch_size=self._max_batch_size,
+            max_wait_ms=self._max_wait * 1000,
+            pending=len(self._pending),
+            batches=self._batches,
+            items=self._items,
+            largest_batch=self._largest_batch,
+        )
@@ -0,0 +1,184 @@
+"""
+嵌入執行器（有界佇列的 Thread / Process Pool）
+
+ABP 對比：
+- ABP: 通常使用 Task.Run 搭配 SemaphoreSlim 限制並行數
+- ABP 的 BackgroundWorker 也會用 Channel<T>（有界佇列）做背壓
+- Python: 使用 concurrent.futures 執行器 + asyncio.Semaphore 做背壓
+
+設計說明：
+- sentence-transformers 的 encode 是 CPU 密集型同步呼叫
+- 直接在 async resolver 中呼叫會卡住 uvicorn 的 event loop
+- 透過此執行器把呼叫移到 worker，event loop 只需 await 結果
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from src.config import settings
+from src.domain.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class EmbeddingExecutorStats:
+    """
+    執行器指標快照
+
+    ABP 對比：
+    - ABP 通常透過 IMetrics / OpenTelemetry Meter 暴露類似數值
+    """
+
+    kind: str
+    max_workers: int
+    max_queue: int
+    running: int
+    queue_depth: int
+    peak_queue_depth: int
+    completed: int
+    failed: int
+    rejected: int
+
+
+class EmbeddingExecutor:
+    """
+    有界佇列的嵌入執行器
+
+    ABP 對比：
+    - ABP: SemaphoreSlim(maxWorkers + maxQueue) + Task.Run
+    - Python: asyncio.Semaphore 控制同時提交的數量，
+      超過 max_workers 的部分即為「排隊中」
+
+    佇列滿時會等待 queue_timeout 秒，逾時則拋出 ServiceUnavailableError，
+    避免無上限地堆積請求。
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 2,
+        max_queue: int = 64,
+        queue_timeout: float = 30.0,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown embedding executor kind: {kind}")
+
+        self._kind = kind
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._pool: Executor | None = None
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+
+        self._waiting = 0
+        self._in_flight = 0
+        self._peak_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    @property
+    def uses_processes(self) -> bool:
+        """是否使用 Process Pool（提交的函式必須可被 pickle）"""
+        return self._kind == "process"
+
+    def _get_pool(self) -> Executor:
+        """懶建立執行器，避免 import 時就啟動 worker"""
+        if self._pool is None:
+            if self._kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="embedding",
+                )
+        return self._pool
+
+    @property
+    def queue_depth(self) -> int:
+        """排隊中（尚未被 worker 執行）的請求數"""
+        return self._waiting + max(0, self._in_flight - self._max_workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        在執行器中執行同步函式
+
+        ABP 對比：
+        await _semaphore.WaitAsync(timeout);
+        try { return await Task.Run(() => fn(args)); }
+        finally { _semaphore.Release(); }
+        """
+        self._waiting += 1
+        self._track_peak()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._queue_timeout)
+        except TimeoutError:
+            self._rejected += 1
+            raise ServiceUnavailableError(
+                "Embedding queue is full, please retry later",
+                details={"queue_depth": self.queue_depth},
+            ) from None
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        self._track_peak()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_pool(), fn, *args)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+        self._completed += 1
+        return result
+
+    def _track_peak(self) -> None:
+        self._peak_queue_depth = max(self._peak_queue_depth, self.queue_depth)
+
+    def stats(self) -> EmbeddingExecutorStats:
+        return EmbeddingExecutorStats(
+            kind=self._kind,
+            max_workers=self._max_workers,
+            max_queue=self._max_queue,
+            running=min(self._in_flight, self._max_workers),
+            queue_depth=self.queue_depth,
+            peak_queue_depth=self._peak_queue_depth,
+            completed=self._completed,
+            failed=self._failed,
+            rejected=self._rejected,
+        )
+
+    def shutdown(self) -> None:
+        """應用程式關閉時釋放 worker"""
+        if self._pool is not None:
+            logger.info("Shutting down embedding executor")
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+@lru_cache(maxsize=1)
+def get_embedding_executor() -> EmbeddingExecutor:
+    """
+    取得嵌入執行器（Singleton）
+
+    ABP 對比：
+    - ABP: services.AddSingleton<EmbeddingExecutor>()
+    """
+    return EmbeddingExecutor(
+        kind=settings.embedding_executor,
+        max_workers=settings.embedding_max_workers,
+        max_queue=settings.embedding_max_queue,
+        queue_timeout=settings.embedding_queue_timeout,
+    )
@@ -7,10 +7,95 @@ ABP 對比：
 - 使用 all-MiniLM-L6-v2 模型，輸出 384 維向量
 """
 
-from functools import lru_cache
+import json
+from collections.abc import Callable
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
 
-from src.infrastructure.embeddings.base import IEmbeddingService
 from src.config import settings
+from src.domain.models.embedding import EmbeddingMatrix
+from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.embeddings.batcher import MicroBatchingEmbeddingService
+from src.infrastructure.embeddings.executor import get_embedding_executor
+from src.infrastructure.embeddings.query_cache import CachingEmbeddingService
+
+
+@lru_cache(maxsize=4)
+def _load_model(model_name: str):
+    """
+    依模型名稱載入並快取 SentenceTransformer
+
+    放在模組層級，Process Pool 的每個 worker 行程會各自載入一次，
+    之後重複使用，不需要在每次呼叫時 pickle 模型
+    """
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _model_path(model_name: str) -> str:
+    """
+    與 SentenceTransformer 相同的模型位置解析：
+    本地目錄或 "org/name" 直接使用，短名稱（all-MiniLM-L6-v2）屬於 sentence-transformers 組織
+    """
+    if "/" in model_name or Path(model_name).is_dir():
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+def _read_model_file(path: str, filename: str) -> dict[str, Any]:
+    """讀取模型目錄 / Hub 上的 JSON 設定檔（不存在時回傳空 dict）"""
+    from huggingface_hub import hf_hub_download
+
+    try:
+        local = (
+            Path(path) / filename
+            if Path(path).is_dir()
+            else Path(hf_hub_download(path, filename))
+        )
+        return json.loads(local.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=4)
+def load_tokenizer(model_name: str) -> tuple[Any, int]:
+    """
+    只載入模型的 tokenizer 與單次輸入的 token 上限（max_seq_length，含特殊 token）
+
+    分塊只需要計算 token，不載入模型權重：
+    - API 行程的第一次索引不需要等待整個模型載入
+    - 匯入時 Process Pool 的每個 worker 只載入 tokenizer
+
+    max_seq_length 取自 sentence_bert_config.json（SentenceTransformer 截斷的長度），
+    沒有時與 SentenceTransformer 相同，取 tokenizer 與模型位置編碼上限的較小值
+    """
+    from transformers import AutoConfig, AutoTokenizer
+
+    path = _model_path(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(path)
+
+    max_seq_length = _read_model_file(path, "sentence_bert_config.json").get(
+        "max_seq_length"
+    )
+    if max_seq_length is None:
+        config = AutoConfig.from_pretrained(path)
+        max_seq_length = min(
+            tokenizer.model_max_length,
+            getattr(config, "max_position_embeddings", tokenizer.model_max_length),
+        )
+    return tokenizer, int(max_seq_length)
+
+
+def _encode(model_name: str, texts: list[str]) -> EmbeddingMatrix:
+    """模組層級的 encode 函式（可被 pickle，供 Process Pool 使用）"""
+    model = _load_model(model_name)
+    embeddings = model.encode(texts, convert_to_numpy=True)
+    # 保持 numpy float32，不轉成 Python list
+    return embeddings.astype(np.float32, copy=False)
 
 
 class LocalEmbeddingService(IEmbeddingService):
@@ -50,14 +135,12 @@ class LocalEmbeddingService(IEmbeddingService):
         - Python 使用懶載入避免啟動時間過長
         """
         if self._model is None:
-            from sentence_transformers import SentenceTransformer
-
-            self._model = SentenceTransformer(self._model_name)
+            self._model = _load_model(self._model_name)
             # 更新實際維度
             self._dimension = self._model.get_sentence_embedding_dimension()
         return self._model
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
+    def embed(self, texts: list[str]) -> EmbeddingMatrix:
         """
         將文本列表轉換為嵌入向量
 
@@ -68,11 +151,19 @@ class LocalEmbeddingService(IEmbeddingService):
         }
 
         注意：sentence-transformers 是 CPU 密集型操作
-        在生產環境中可能需要使用 worker pool 或 GPU
+        在 async 程式碼中請使用 aembed（交由 EmbeddingExecutor 執行）
         """
-        model = self._get_model()
-        embeddings = model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        self._get_model()
+        return _encode(self._model_name, texts)
+
+    def _embed_task(self) -> Callable[[list[str]], EmbeddingMatrix]:
+        """
+        Process Pool 模式下改用模組層級函式，
+        worker 行程自行載入模型，避免 pickle 整個服務實例
+        """
+        if get_embedding_executor().uses_processes:
+            return partial(_encode, self._model_name)
+        return self.embed
 
     @property
     def dimension(self) -> int:
@@ -84,6 +175,10 @@ class LocalEmbeddingService(IEmbeddingService):
         """
         return self._dimension
 
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
 
 @lru_cache(maxsize=1)
 def get_embedding_service() -> IEmbeddingService:
@@ -93,11 +188,34 @@ def get_embedding_service() -> IEmbeddingService:
     ABP 對比：
     - ABP: services.AddSingleton<IEmbeddingService, LocalEmbeddingService>()
     - Python: 使用 lru_cache 實現 Singleton
+
+    組裝順序（由外而內）：查詢快取 → 微批次 → 實際模型
     """
+    service: IEmbeddingService
     if settings.embedding_provider == "openai":
         from src.infrastructure.embeddings.openai_embeddings import (
             OpenAIEmbeddingService,
         )
 
-        return OpenAIEmbeddingService()
-    return LocalEmbeddingService()
+        service = OpenAIEmbeddingService()
+    else:
+        service = LocalEmbeddingService()
+
+        # 查詢路徑的跨請求微批次
+        if settings.embedding_batch_enabled:
+            service = MicroBatchingEmbeddingService(
+                service,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_max_wait_ms,
+            )
+
+    # 重複查詢直接命中快取，跳過模型推論
+    if settings.query_embedding_cache_enabled:
+        service = CachingEmbeddingService(
+            service,
+            max_entries=settings.query_embedding_cache_max_entries,
+            max_bytes=settings.query_embedding_cache_max_mb * 1024 * 1024,
+            ttl_seconds=settings.query_embedding_cache_ttl_seconds,
+        )
+
+    return service
@@ -10,8 +10,13 @@ ABP 對比：
 uv add openai
 """
 
-from src.infrastructure.embeddings.base import IEmbeddingService
+import base64
+
+import numpy as np
+
 from src.config import settings
+from src.domain.models.embedding import EmbeddingMatrix
+from src.infrastructure.embeddings.base import IEmbeddingService
 
 
 class OpenAIEmbeddingService(IEmbeddingService):
@@ -51,6 +56,7 @@ class OpenAIEmbeddingService(IEmbeddingService):
         self._api_key = api_key or settings.openai_api_key
         self._model = model or settings.openai_embedding_model
         self._client = None
+        self._async_client = None
 
         if not self._api_key:
             raise ValueError(
@@ -78,7 +84,26 @@ class OpenAIEmbeddingService(IEmbeddingService):
                 )
         return self._client
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
+    def _get_async_client(self):
+        """
+        懶載入 AsyncOpenAI 客戶端
+
+        OpenAI 呼叫是 I/O 密集型，直接使用非同步客戶端，
+        不需要佔用嵌入執行器的 worker
+        """
+        if self._async_client is None:
+            try:
+                from openai import AsyncOpenAI
+
+                self._async_client = AsyncOpenAI(api_key=self._api_key)
+            except ImportError:
+                raise ImportError(
+                    "openai package is required for OpenAI embeddings. "
+                    "Install with: uv add openai"
+                )
+        return self._async_client
+
+    def embed(self, texts: list[str]) -> EmbeddingMatrix:
         """
         使用 OpenAI API 生成嵌入向量
 
@@ -93,8 +118,41 @@ class OpenAIEmbeddingService(IEmbeddingService):
         response = client.embeddings.create(
             model=self._model,
             input=texts,
+            encoding_format="base64",
         )
-        return [item.embedding for item in response.data]
+        return self._decode(response.data)
+
+    async def aembed(self, texts: list[str]) -> EmbeddingMatrix:
+        """
+        使用 AsyncOpenAI 生成嵌入向量（不阻塞 event loop）
+
+        ABP 對比：
+        - ABP: await _httpClient.PostAsJsonAsync(...) 本身就是非同步 I/O
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        client = self._get_async_client()
+        response = await client.embeddings.create(
+            model=self._model,
+            input=texts,
+            encoding_format="base64",
+        )
+        return self._decode(response.data)
+
+    @staticmethod
+    def _decode(data) -> EmbeddingMatrix:
+        """
+        解碼 base64 格式的嵌入向量
+
+        以 base64 傳輸時 API 回傳的是 little-endian float32 bytes，
+        直接 np.frombuffer，不經過 JSON 的 float 陣列
+        """
+        return np.stack(
+            [
+                np.frombuffer(base64.b64decode(item.embedding), dtype="<f4")
+                for item in data
+            ]
+        ).astype(np.float32, copy=False)
 
     @property
     def dimension(self) -> int:
@@ -105,3 +163,7 @@ class OpenAIEmbeddingService(IEmbeddingService):
         public int Dimension => ModelDimensions[_model];
         """
         return self.MODEL_DIMENSIONS.get(self._model, 1536)
+
+    @property
+    def model_name(self) -> str:
+        return self._model
@@ -0,0 +1,115 @@
+"""
+查詢嵌入快取
+
+ABP 對比：
+- ABP: 以 Decorator 包裝 IEmbeddingService，搭配 IMemoryCache
+- Python: 包裝 aembed_single（查詢路徑），重複查詢直接命中快取，跳過模型推論
+
+設計說明：
+- 快取鍵為 (模型名稱, 正規化後的查詢文本)，換模型不會誤用舊向量
+- 以筆數、記憶體上限與 TTL 限制快取大小（見 BoundedLRUCache）
+- 批次的 aembed（文件索引路徑）不經過此快取
+"""
+
+import sys
+import unicodedata
+
+from src.domain.models.embedding import EmbeddingMatrix, EmbeddingVector
+from src.infrastructure.caching.lru_cache import BoundedLRUCache, CacheStats
+from src.infrastructure.embeddings.base import IEmbeddingService
+
+QueryCacheKey = tuple[str, str]
+
+
+def normalize_query(text: str) -> str:
+    """
+    正規化查詢文本：NFKC（全形/半形統一）並壓縮空白
+
+    不轉小寫，因為部分模型（例如 OpenAI）對大小寫敏感
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _estimate_size(key: QueryCacheKey, value: EmbeddingVector) -> int:
+    """估計單筆快取佔用的記憶體（向量資料 + 鍵）"""
+    return value.nbytes + sys.getsizeof(key[0]) + sys.getsizeof(key[1])
+
+
+class CachingEmbeddingService(IEmbeddingService):
+    """
+    查詢嵌入快取服務（Decorator）
+
+    ABP 對比：
+    - ABP: public class CachedEmbeddingService : IEmbeddingService
+      內部注入 IMemoryCache 與原本的 IEmbeddingService
+    """
+
+    def __init__(
+        self,
+        inner: IEmbeddingService,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float | None = 3600,
+    ):
+        self._inner = inner
+        self._cache: BoundedLRUCache[QueryCacheKey, EmbeddingVector] = BoundedLRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=_estimate_size,
+        )
+
+    @property
+    def inner(self) -> IEmbeddingService:
+        return self._inner
+
+    @property
+    def dimension(self) -> int:
+        return self._inner.dimension
+
+    @property
+    def model_name(self) -> str:
+        return self._inner.model_name
+
+    def embed(self, texts: list[str]) -> EmbeddingMatrix:
+        return self._inner.embed(texts)
+
+    async def aembed(self, texts: list[str]) -> EmbeddingMatrix:
+        return await self._inner.aembed(texts)
+
+    def embed_single(self, text: str) -> EmbeddingVector:
+        normalized = normalize_query(text)
+        key = (self.model_name, normalized)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = self._freeze(self._inner.embed_single(normalized))
+        self._cache.set(key, embedding)
+        return embedding
+
+    async def aembed_single(self, text: str) -> EmbeddingVector:
+        normalized = normalize_query(text)
+        key = (self.model_name, normalized)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = self._freeze(await self._inner.aembed_single(normalized))
+        self._cache.set(key, embedding)
+        return embedding
+
+    @staticmethod
+    def _freeze(embedding: EmbeddingVector) -> EmbeddingVector:
+        """
+        複製成獨立的唯讀陣列再放入快取
+
+        批次 encode 回傳的是整個批次矩陣的一列（view），
+        複製後快取不會連帶保留整個矩陣，呼叫端也無法修改快取內容
+        """
+        frozen = embedding.copy()
+        frozen.flags.writeable = False
+        return frozen
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
@@ -0,0 +1,72 @@
+"""
+批次寫入工具（COPY / 多列 INSERT）
+
+ABP 對比：
+- ABP: IRepository.InsertManyAsync() 或 EFCore.BulkExtensions 的 BulkInsertAsync()
+- Python: asyncpg 的 copy_records_to_table（PostgreSQL COPY ... FROM STDIN BINARY）
+
+設計說明：
+- 以 session.add() 逐筆加入 ORM 物件會經過 Unit of Work 的追蹤，
+  flush 時每列各自產生 INSERT 參數
+- COPY 以二進位串流一次寫入所有列，向量欄位直接使用已註冊的 pgvector codec
+- 仍在呼叫端的交易內執行：交易 rollback 時，寫入的列一併撤銷
+"""
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.persistence.database import Base
+
+# 少於此筆數時，COPY 額外的欄位型別查詢不划算，改用多列 INSERT
+_COPY_MIN_ROWS = 32
+
+
+async def bulk_insert(
+    session: AsyncSession,
+    model: type[Base],
+    rows: list[dict[str, Any]],
+) -> None:
+    """
+    將多列資料寫入資料表（不建立 ORM 物件）
+
+    ABP 對比：
+    await _chunkRepository.InsertManyAsync(chunks, autoSave: false);
+
+    rows 的鍵為資料表欄位名稱，所有列的鍵必須相同
+    - 列數足夠且連線已在交易中時使用 COPY
+    - 否則使用單一 executemany（SQLAlchemy 會合併成多列 INSERT ... VALUES）
+    """
+    if not rows:
+        return
+
+    if len(rows) >= _COPY_MIN_ROWS:
+        driver = await _get_transactional_asyncpg(session)
+        if driver is not None:
+            columns = list(rows[0])
+            await driver.copy_records_to_table(
+                model.__tablename__,
+                records=[tuple(row[column] for column in columns) for row in rows],
+                columns=columns,
+            )
+            return
+
+    await session.execute(insert(model), rows)
+
+
+async def _get_transactional_asyncpg(session: AsyncSession) -> Any | None:
+    """
+    取得 session 目前使用的 asyncpg 連線
+
+    SQLAlchemy 的 asyncpg adapter 在第一次執行語句時才 BEGIN，
+    尚未開始交易時直接 COPY 會變成 autocommit，因此回傳 None 改走 INSERT
+    """
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    if driver is None or not hasattr(driver, "copy_records_to_table"):
+        return None
+    if not driver.is_in_transaction():
+        return None
+    return driver
@@ -1,5 +1,7 @@
-from collections.abc import AsyncGenerator
+import logging
+from collections.abc import AsyncGenerator, Callable
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -8,6 +10,10 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
+from src.infrastructure.persistence.types import register_vector_codecs
+from src.infrastructure.persistence.vector_index import apply_search_defaults
+
+logger = logging.getLogger(__name__)
 
 
 engine = create_async_engine(
@@ -24,6 +30,24 @@ async_session_factory = async_sessionmaker(
 )
 
 
+@event.listens_for(engine.sync_engine, "connect")
+def _configure_vector_connection(dbapi_connection, connection_record) -> None:
+    """
+    每條新連線的 pgvector 設定：
+    - 註冊二進位 codec（向量以 float32 bytes 傳輸）
+    - 設定 ANN 查詢參數的預設值（hnsw.ef_search / ivfflat.probes）
+
+    資料庫尚未建立 vector extension 時略過 codec，該連線維持文字格式
+    """
+    try:
+        dbapi_connection.run_async(register_vector_codecs)
+    except ValueError as e:
+        if not str(e).startswith("unknown type"):
+            raise
+        logger.warning("pgvector extension not installed, using text vector format")
+    dbapi_connection.run_async(apply_search_defaults)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -36,3 +60,18 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    在 session 下一次 commit 完成後執行 callback（只執行一次）
+
+    ABP 對比：
+    - ABP: IUnitOfWork.OnCompleted(() => ...)
+
+    用於程序內快取的失效：在 commit 前失效，並行的請求可能又把舊資料載入快取；
+    交易 rollback 時 callback 會延到下一次 commit 才執行（多失效一次不影響正確性）
+    """
+    event.listen(
+        session.sync_session, "after_commit", lambda _session: callback(), once=True
+    )
@@ -0,0 +1,90 @@
+"""
+嵌入模型一致性檢查（全庫重新嵌入切換後，停止仍以舊模型運作的行程）
+
+ABP 對比：
+- ABP: 通常只在部署時以設定檢查，或以 IDistributedEventBus 通知各節點
+- Python: 以 reembed_runs 中最近一次切換的模型為準，讀寫向量前比對本行程的設定
+
+設計說明：
+- 切換只改名欄位，仍在執行的舊行程會以舊模型產生查詢向量搜尋新向量，
+  並把舊模型的 chunk 向量寫進新的 embedding 欄位（維度相同時無法事後分辨）
+- 寫入：每次寫入向量後在同一個交易中檢查。寫入時已持有 document_chunks 的列鎖，
+  切換（ACCESS EXCLUSIVE）要不是已提交而被這次檢查看到，就是要等這個交易結束，
+  再由切換時的最後一次補齊把這些列嵌入新模型，不會有舊向量留在新欄位
+- 讀取：每個行程最多每 embedding_model_check_seconds 秒查詢一次，
+  切換後最多在這段時間內回傳舊模型的結果
+- 發現不一致後不再重新查詢，行程需以新設定重新啟動
+"""
+
+import time
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.domain.exceptions import ServiceUnavailableError
+from src.infrastructure.persistence.repositories.reembed_repository import (
+    ReembedRepository,
+)
+
+
+class EmbeddingModelMismatchError(ServiceUnavailableError):
+    message = "Stored embeddings use a different embedding model"
+    code = "EMBEDDING_MODEL_MISMATCH"
+
+
+class EmbeddingModelGuard:
+    """
+    比對本行程的嵌入設定與資料表中的向量（每個 (模型, 維度) 一個實例）
+
+    ABP 對比：
+    public class EmbeddingModelGuard : ISingletonDependency
+    {
+        public async Task CheckAsync() { ... }        // 每次查詢
+        public async Task CheckCachedAsync() { ... }  // 依間隔查詢
+    }
+    """
+
+    def __init__(self, model_name: str, dimension: int, interval_seconds: float):
+        self._configured = (model_name, dimension)
+        self._interval = interval_seconds
+        self._checked_at: float | None = None
+        self._mismatch: EmbeddingModelMismatchError | None = None
+
+    async def check(self, session: AsyncSession) -> None:
+        """在 session 目前的交易中查詢最近一次切換的模型，不一致時拋出錯誤"""
+        if self._mismatch is not None:
+            raise self._mismatch
+        run = await ReembedRepository(session).get_last_switched_run()
+        self._checked_at = time.monotonic()
+        if run is None or (run.model_name, run.dimension) == self._configured:
+            return
+
+        model_name, dimension = self._configured
+        self._mismatch = EmbeddingModelMismatchError(
+            f"Stored embeddings use {run.model_name} ({run.dimension}d) but "
+            f"{model_name} ({dimension}d) is configured; restart with the new "
+            "EMBEDDING_MODEL / EMBEDDING_DIMENSION",
+            details={"stored_model": run.model_name, "configured_model": model_name},
+        )
+        raise self._mismatch
+
+    async def check_cached(self, session: AsyncSession) -> None:
+        """距離上次查詢超過間隔時才查詢（讀取用）"""
+        if self._mismatch is not None:
+            raise self._mismatch
+        if (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self._interval
+        ):
+            await self.check(session)
+
+
+@lru_cache(maxsize=4)
+def get_embedding_model_guard(model_name: str) -> EmbeddingModelGuard:
+    """取得本行程的檢查（單例，依模型名稱區分）"""
+    return EmbeddingModelGuard(
+        model_name,
+        settings.embedding_dimension,
+        settings.embedding_model_check_seconds,
+    )
@@ -0,0 +1,105 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+與原本 Base.metadata.create_all 建立的結構相同；
+使用 IF NOT EXISTS，已由 create_all 建立的資料庫也可以直接套用
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+from src.config import settings
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("owner_id", sa.String(36), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "document_chunks",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "document_id",
+            sa.String(36),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("embedding", Vector(settings.embedding_dimension), nullable=True),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model_name", sa.String(255), primary_key=True),
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("embedding", Vector(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache")
+    op.drop_table("document_chunks")
+    op.drop_table("documents")
+    op.drop_table("users")
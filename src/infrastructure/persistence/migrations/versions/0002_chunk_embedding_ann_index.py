@@ -0,0 +1,39 @@
+"""chunk embedding ANN index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+依 VECTOR_INDEX_TYPE 建立 HNSW 或 IVFFlat 索引（cosine 距離）
+- 使用 CREATE INDEX CONCURRENTLY，建置期間不鎖住寫入
+- CONCURRENTLY 不能在交易中執行，因此放在 autocommit_block
+- 建置參數（HNSW_M / HNSW_EF_CONSTRUCTION / IVFFLAT_LISTS）於執行 migration 時讀取
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+from src.infrastructure.persistence.vector_index import (
+    create_vector_index_sql,
+    drop_vector_index_sql,
+)
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    sql = create_vector_index_sql()
+    if sql is None:
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(sql)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(drop_vector_index_sql())
@@ -0,0 +1,50 @@
+"""denormalize owner_id onto document_chunks
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+
+搜尋只需要依 owner 過濾 chunks，不再 join documents：
+1. 新增可為 NULL 的欄位並由 documents 回填
+2. 設為 NOT NULL
+3. 以 CONCURRENTLY 建立 owner_id 索引（小型使用者的精確搜尋會用到）
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_chunks",
+        sa.Column("owner_id", sa.String(36), nullable=True),
+        if_not_exists=True,
+    )
+    op.execute(
+        """
+        UPDATE document_chunks AS c
+        SET owner_id = d.owner_id
+        FROM documents AS d
+        WHERE d.id = c.document_id AND c.owner_id IS NULL
+        """
+    )
+    op.alter_column("document_chunks", "owner_id", nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_owner_id "
+            "ON document_chunks (owner_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_owner_id")
+    op.drop_column("document_chunks", "owner_id")
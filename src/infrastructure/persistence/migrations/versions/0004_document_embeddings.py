@@ -0,0 +1,78 @@
+"""document-level centroid embeddings
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+1. 建立 document_embeddings（每份文件一筆，chunk 向量的重心）
+2. 由現有 chunks 回填：預設模型（all-MiniLM-L6-v2、OpenAI）輸出已正規化的向量，
+   avg(embedding) 即為正規化向量的平均；之後由 index_document 維護
+3. 以 CONCURRENTLY 建立 ANN 索引（類型與參數同 chunks 索引）
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+from src.config import settings
+from src.infrastructure.persistence.vector_index import (
+    create_vector_index_sql,
+    drop_vector_index_sql,
+)
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX_NAME = "ix_document_embeddings_embedding"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_embeddings",
+        sa.Column(
+            "document_id",
+            sa.String(36),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("owner_id", sa.String(36), nullable=False),
+        sa.Column("embedding", Vector(settings.embedding_dimension), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_document_embeddings_owner_id",
+        "document_embeddings",
+        ["owner_id"],
+        if_not_exists=True,
+    )
+    op.execute(
+        """
+        INSERT INTO document_embeddings (document_id, owner_id, embedding)
+        SELECT document_id, owner_id, avg(embedding)
+        FROM document_chunks
+        WHERE embedding IS NOT NULL
+        GROUP BY document_id, owner_id
+        ON CONFLICT (document_id) DO NOTHING
+        """
+    )
+
+    sql = create_vector_index_sql(table="document_embeddings", name=INDEX_NAME)
+    if sql is not None:
+        with op.get_context().autocommit_block():
+            op.execute(sql)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(drop_vector_index_sql(INDEX_NAME))
+    op.drop_table("document_embeddings")
@@ -0,0 +1,47 @@
+"""full-text search column on document_chunks
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+
+混合搜尋的關鍵字部分：
+1. 新增產生的欄位 content_tsv = to_tsvector('simple', content)
+   （STORED 產生欄位會重寫整張表，大型資料庫請在離峰時段執行）
+2. 以 CONCURRENTLY 建立 GIN 索引
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_chunks",
+        sa.Column(
+            "content_tsv",
+            TSVECTOR,
+            sa.Computed("to_tsvector('simple', content)", persisted=True),
+            nullable=False,
+        ),
+        if_not_exists=True,
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_content_tsv "
+            "ON document_chunks USING gin (content_tsv)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_content_tsv")
+    op.drop_column("document_chunks", "content_tsv")
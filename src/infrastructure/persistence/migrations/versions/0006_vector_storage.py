@@ -0,0 +1,39 @@
+"""rebuild ANN indexes for VECTOR_STORAGE
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+
+依 VECTOR_STORAGE 重建 chunks 與文件層級嵌入的 ANN 索引：
+- "halfvec" / "binary" 建立精簡表示的運算式索引（需 pgvector 0.7+），
+  資料表中既有的完整精度向量不需轉換
+- 先以 CONCURRENTLY 建立新索引，再刪除其他精度的索引
+- 預設 "vector" 時索引已存在，不會有任何變更
+
+之後要切換儲存精度時，以 python -m src.cli.vector_storage rebuild 重建
+（只在執行 migration 時讀取 VECTOR_STORAGE，之後更改設定不會重建索引）
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+from src.config import settings
+from src.infrastructure.persistence.vector_index import rebuild_vector_indexes_sql
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for sql in rebuild_vector_indexes_sql(settings.vector_storage):
+            op.execute(sql)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for sql in rebuild_vector_indexes_sql("vector"):
+            op.execute(sql)
@@ -0,0 +1,39 @@
+"""keyset pagination indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+
+1. documents (owner_id, created_at DESC, id)：文件列表以 (created_at, id) 為 keyset，
+   每一頁都是同一個索引上的範圍掃描，不需要掃過前面的頁
+2. document_chunks (document_id)：搜尋分頁（ANN）時排除已在前面頁出現的文件，
+   刪除文件與列出文件 chunks 也會使用
+兩者皆以 CONCURRENTLY 建立，不鎖寫入
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_owner_id_created_at "
+            "ON documents (owner_id, created_at DESC, id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_document_id "
+            "ON document_chunks (document_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_document_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_owner_id_created_at")
@@ -0,0 +1,66 @@
+"""background indexing jobs (outbox)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+
+1. documents.indexing_status：pending / indexed / failed，現有文件已由同步索引處理，預設 indexed
+2. 建立 indexing_jobs：文件寫入時在同一個交易中 upsert（每份文件一筆），
+   背景 worker 以 SELECT ... FOR UPDATE SKIP LOCKED 取出，行程重新啟動後仍會繼續處理
+3. indexing_jobs (available_at) 索引：worker 依可處理時間取出工作
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 有常數預設值的 ADD COLUMN 在 PostgreSQL 11+ 只改 catalog，不重寫資料表
+    op.execute(
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS "
+        "indexing_status varchar(16) NOT NULL DEFAULT 'indexed'"
+    )
+    op.create_table(
+        "indexing_jobs",
+        sa.Column(
+            "document_id",
+            sa.String(36),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("owner_id", sa.String(36), nullable=False),
+        sa.Column("version", sa.Integer, nullable=False, server_default="1"),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("locked_until", sa.DateTime(timezone=True)),
+        sa.Column("last_error", sa.Text),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_indexing_jobs_available_at",
+        "indexing_jobs",
+        ["available_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("indexing_jobs")
+    op.drop_column("documents", "indexing_status")
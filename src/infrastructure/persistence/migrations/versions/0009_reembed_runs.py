@@ -0,0 +1,49 @@
+"""full-corpus re-embedding checkpoints
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16
+
+建立 reembed_runs：python -m src.cli.reembed 的進度（每次執行一筆）。
+影子欄位（embedding_next）的維度由新模型決定，由工具在執行時建立，不在 migration 中
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reembed_runs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("model_name", sa.String(255), nullable=False),
+        sa.Column("dimension", sa.Integer, nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("chunk_cursor", sa.String(36)),
+        sa.Column("document_cursor", sa.String(36)),
+        sa.Column("chunks_done", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("documents_done", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        sa.Column("switched_at", sa.DateTime(timezone=True)),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reembed_runs")
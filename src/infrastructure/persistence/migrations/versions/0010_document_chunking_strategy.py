@@ -0,0 +1,30 @@
+"""per-document chunking strategy
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16
+
+documents.chunking_strategy：text / markdown / code / cjk（見 ChunkingStrategy），
+現有文件都是以句子分塊，預設 text
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0010"
+down_revision: str | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 有常數預設值的 ADD COLUMN 在 PostgreSQL 11+ 只改 catalog，不重寫資料表
+    op.execute(
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS "
+        "chunking_strategy varchar(16) NOT NULL DEFAULT 'text'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "chunking_strategy")
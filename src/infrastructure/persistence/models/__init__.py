@@ -10,11 +10,23 @@ ABP 對比：
 from src.infrastructure.persistence.models.document_chunk_model import (
     DocumentChunkModel,
 )
+from src.infrastructure.persistence.models.document_embedding_model import (
+    DocumentEmbeddingModel,
+)
 from src.infrastructure.persistence.models.document_model import DocumentModel
+from src.infrastructure.persistence.models.embedding_cache_model import (
+    EmbeddingCacheModel,
+)
+from src.infrastructure.persistence.models.indexing_job_model import IndexingJobModel
+from src.infrastructure.persistence.models.reembed_run_model import ReembedRunModel
 from src.infrastructure.persistence.models.user_model import UserModel
 
 __all__ = [
     "UserModel",
     "DocumentModel",
     "DocumentChunkModel",
+    "DocumentEmbeddingModel",
+    "EmbeddingCacheModel",
+    "IndexingJobModel",
+    "ReembedRunModel",
 ]
@@ -4,21 +4,27 @@
 ABP 對比：
 - ABP: DocumentChunk : Entity<Guid>
 - ABP 配合 pgvector 擴展使用自訂類型
-- Python: 使用 pgvector.sqlalchemy 的 Vector 類型
+- Python: 使用 Float32Vector（pgvector 欄位，以 numpy float32 二進位傳輸）
 """
 
 from typing import TYPE_CHECKING
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import Computed, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.config import settings
+from src.domain.models.embedding import EmbeddingVector
 from src.infrastructure.persistence.database import Base
+from src.infrastructure.persistence.types import Float32Vector
 
 if TYPE_CHECKING:
     from src.infrastructure.persistence.models.document_model import DocumentModel
 
+# 全文檢索設定：simple 不做字根還原與停用詞過濾，
+# 錯誤代碼、識別字與產品名稱會原樣成為 token（改變時需要新的 migration）
+TEXT_SEARCH_CONFIG = "simple"
+
 
 class DocumentChunkModel(Base):
     """
@@ -28,27 +34,48 @@ class DocumentChunkModel(Base):
     public class DocumentChunk : Entity<Guid>
     {
         public Guid DocumentId { get; set; }
+        public Guid OwnerId { get; set; }  // 冗餘欄位，與 Document.OwnerId 相同
         public string Content { get; set; }
         public int ChunkIndex { get; set; }
         public Vector Embedding { get; set; }  // pgvector 類型
+        public NpgsqlTsVector ContentTsv { get; set; }  // 計算欄位（全文檢索）
         public virtual Document Document { get; set; }
     }
 
     pgvector 設定：
     - 使用 cosine 距離進行相似度搜尋
     - 向量維度由 embedding model 決定（預設 384 for all-MiniLM-L6-v2）
+
+    全文檢索：
+    - content_tsv 為 PostgreSQL 產生的欄位（GENERATED ALWAYS AS ... STORED），
+      寫入 chunks 時不需要（也不能）指定
+    - GIN 索引供混合搜尋的關鍵字查詢使用
     """
 
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_content_tsv", "content_tsv", postgresql_using="gin"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     document_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+        String(36),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
+    # 冗餘自 documents.owner_id：搜尋時直接在 chunks 上過濾，不需要 join
+    owner_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
-    embedding: Mapped[list[float]] = mapped_column(
-        Vector(settings.embedding_dimension), nullable=True
+    embedding: Mapped[EmbeddingVector] = mapped_column(
+        Float32Vector(settings.embedding_dimension), nullable=True
+    )
+    # 只在 SQL 中使用，載入 ORM 物件時不取回
+    content_tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)", persisted=True),
+        deferred=True,
     )
 
     # 關聯
@@ -0,0 +1,50 @@
+"""
+文件層級嵌入 ORM 模型（chunk 向量的重心）
+
+ABP 對比：
+- ABP: DocumentEmbedding : Entity（與 Document 一對一）
+- ABP 使用 EF Core 的 HasOne().WithOne() 設定一對一關聯
+- Python: 以 document_id 同時作為主鍵與外鍵
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.config import settings
+from src.domain.models.embedding import EmbeddingVector
+from src.infrastructure.persistence.database import Base
+from src.infrastructure.persistence.types import Float32Vector
+
+
+class DocumentEmbeddingModel(Base):
+    """
+    文件層級嵌入資料表模型
+
+    ABP 對比：
+    public class DocumentEmbedding : Entity<Guid>
+    {
+        public Guid DocumentId { get; set; }
+        public Guid OwnerId { get; set; }
+        public Vector Embedding { get; set; }  // 正規化後 chunk 向量的平均
+    }
+
+    設計說明：
+    - 由 index_document 維護，找相似文件時只需在文件層級做一次 kNN
+    - 獨立成資料表，讀取 documents 時不會連帶載入向量
+    - owner_id 冗餘自 documents，搜尋時不需要 join
+    """
+
+    __tablename__ = "document_embeddings"
+
+    document_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    owner_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    embedding: Mapped[EmbeddingVector] = mapped_column(
+        Float32Vector(settings.embedding_dimension), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -10,7 +10,7 @@ ABP 對比：
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.infrastructure.persistence.database import Base
@@ -32,12 +32,26 @@ class DocumentModel(Base):
         public string Title { get; set; }
         public string Content { get; set; }
         public Guid OwnerId { get; set; }
+        public ChunkingStrategy ChunkingStrategy { get; set; }
         public virtual AppUser Owner { get; set; }
         public virtual ICollection<DocumentChunk> Chunks { get; set; }
     }
+
+    索引：(owner_id, created_at DESC, id) 供文件列表的 keyset 分頁使用
     """
 
     __tablename__ = "documents"
+    __table_args__ = (
+        Index(
+            "ix_documents_owner_id_created_at",
+            "owner_id",
+            text("created_at DESC"),
+            "id",
+        ),
+    )
+    # 更新時以 RETURNING 取回 server 端產生的 updated_at，
+    # 避免 flush 後在 async session 中觸發延遲載入
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -51,6 +65,14 @@ class DocumentModel(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # pending / indexed / failed（見 IndexingStatus），由背景索引 worker 更新
+    indexing_status: Mapped[str] = mapped_column(
+        String(16), nullable=False, server_default="indexed"
+    )
+    # text / markdown / code / cjk（見 ChunkingStrategy），索引時依此選擇分塊器
+    chunking_strategy: Mapped[str] = mapped_column(
+        String(16), nullable=False, server_default="text"
+    )
 
     # 關聯
     owner: Mapped["UserModel"] = relationship("UserModel", back_populates="documents")
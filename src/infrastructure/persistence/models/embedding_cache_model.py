@@ -0,0 +1,44 @@
+"""
+嵌入快取 ORM 模型
+
+ABP 對比：
+- ABP: EmbeddingCacheItem : Entity（複合主鍵）
+- ABP 使用 EF Core 的 HasKey(x => new { x.ModelName, x.ContentHash })
+- Python: 使用 SQLAlchemy 的多欄位 primary_key
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.domain.models.embedding import EmbeddingVector
+from src.infrastructure.persistence.database import Base
+from src.infrastructure.persistence.types import Float32Vector
+
+
+class EmbeddingCacheModel(Base):
+    """
+    嵌入快取資料表模型
+
+    ABP 對比：
+    public class EmbeddingCacheItem : Entity
+    {
+        public string ModelName { get; set; }
+        public string ContentHash { get; set; }  // sha256(chunk text)
+        public Vector Embedding { get; set; }
+    }
+
+    設計說明：
+    - 以 (模型名稱, chunk 文本的 sha256) 為鍵，內容相同的 chunk 不需要重新嵌入
+    - 向量欄位不限定維度，不同模型（不同維度）的快取可共存
+    """
+
+    __tablename__ = "embedding_cache"
+
+    model_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[EmbeddingVector] = mapped_column(Float32Vector(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
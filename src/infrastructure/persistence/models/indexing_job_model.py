@@ -0,0 +1,55 @@
+"""
+背景索引工作（outbox）ORM 模型
+
+ABP 對比：
+- ABP: Outbox 模式（AbpEventOutbox），事件與實體在同一個交易中寫入
+- Python: 文件寫入時在同一個交易中 upsert 一筆索引工作，由背景 worker 取出處理
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.persistence.database import Base
+
+
+class IndexingJobModel(Base):
+    """
+    索引工作資料表模型
+
+    ABP 對比：
+    public class IndexingJob : Entity
+    {
+        public Guid DocumentId { get; set; }   // 主鍵：每份文件最多一筆待處理工作
+        public int Version { get; set; }       // 每次排入 +1
+        public int Attempts { get; set; }
+        public DateTime AvailableAt { get; set; }
+        public DateTime? LockedUntil { get; set; }
+    }
+
+    設計說明：
+    - 工作只記錄「哪份文件需要重新索引」，worker 處理時讀取文件的最新內容，
+      同一份文件在處理前被多次更新只需要索引一次
+    - 處理中的文件再次更新時 version 遞增；worker 完成時 version 不符就不刪除工作，
+      之後會以新內容再處理一次
+    - locked_until 為租約：worker 當掉（或行程重新啟動）後，租約到期的工作會被重新取出
+    - 文件刪除時工作隨之刪除（ON DELETE CASCADE）
+    """
+
+    __tablename__ = "indexing_jobs"
+
+    document_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    owner_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
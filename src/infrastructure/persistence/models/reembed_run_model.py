@@ -0,0 +1,77 @@
+"""
+全庫重新嵌入進度（checkpoint）ORM 模型
+
+ABP 對比：
+- ABP: BackgroundJobInfo 搭配自訂的 JobArgs 記錄進度
+- Python: 每次執行一筆，批次寫入時在同一個交易中更新游標
+"""
+
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.persistence.database import Base
+
+
+class ReembedStatus(StrEnum):
+    """
+    重新嵌入的階段
+
+    - CHUNKS: 依 chunk id 順序嵌入 document_chunks，寫入影子欄位
+    - DOCUMENTS: 依 document id 順序以新的 chunk 向量計算文件層級嵌入
+    - INDEXES: 在影子欄位上建立 ANN 索引（CONCURRENTLY）
+    - READY: 補上執行期間的寫入後即可切換
+    - SWITCHED: 影子欄位已改名為 embedding，搜尋改用新向量
+    - ABORTED: 已放棄，影子欄位已刪除
+    """
+
+    CHUNKS = "chunks"
+    DOCUMENTS = "documents"
+    INDEXES = "indexes"
+    READY = "ready"
+    SWITCHED = "switched"
+    ABORTED = "aborted"
+
+
+class ReembedRunModel(Base):
+    """
+    重新嵌入執行紀錄資料表模型
+
+    ABP 對比：
+    public class ReembedRun : Entity<Guid>
+    {
+        public string ModelName { get; set; }
+        public int Dimension { get; set; }
+        public ReembedStatus Status { get; set; }
+        public string? ChunkCursor { get; set; }     // 最後寫入的 chunk id
+        public string? DocumentCursor { get; set; }  // 最後寫入的 document id
+    }
+
+    設計說明：
+    - 游標與該批向量在同一個交易中寫入，中斷後從游標之後繼續，不會重複或遺漏
+    - 同時最多一筆未結束（非 switched / aborted）的執行
+    """
+
+    __tablename__ = "reembed_runs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    dimension: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    chunk_cursor: Mapped[str | None] = mapped_column(String(36))
+    document_cursor: Mapped[str | None] = mapped_column(String(36))
+    chunks_done: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    documents_done: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    switched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -1,10 +1,12 @@
+from datetime import UTC, datetime
 from uuid import uuid4
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.interfaces.document_repository import IDocumentRepository
-from src.domain.models.document import Document
+from src.domain.models.document import ChunkingStrategy, Document, IndexingStatus
+from src.infrastructure.persistence.bulk import bulk_insert
 from src.infrastructure.persistence.models.document_model import DocumentModel
 
 
@@ -41,11 +43,44 @@ class DocumentRepository(IDocumentRepository):
         models = result.scalars().all()
         return [self._to_domain(m) for m in models]
 
+    async def get_page_by_owner_id(
+        self,
+        owner_id: str,
+        limit: int = 10,
+        after: tuple[datetime, str] | None = None,
+    ) -> list[Document]:
+        """
+        keyset 分頁：依 (created_at DESC, id) 排序，after 為上一頁最後一筆
+
+        使用 ix_documents_owner_id_created_at，每一頁都從索引上的 after 位置開始掃描
+        """
+        query = select(DocumentModel).where(DocumentModel.owner_id == owner_id)
+        if after is not None:
+            after_created_at, after_id = after
+            query = query.where(
+                # 冗餘的 <= 讓 planner 以 created_at 作為索引掃描的起點
+                DocumentModel.created_at <= after_created_at,
+                or_(
+                    DocumentModel.created_at < after_created_at,
+                    and_(
+                        DocumentModel.created_at == after_created_at,
+                        DocumentModel.id > after_id,
+                    ),
+                ),
+            )
+        query = query.order_by(DocumentModel.created_at.desc(), DocumentModel.id).limit(
+            limit
+        )
+        result = await self._session.execute(query)
+        return [self._to_domain(m) for m in result.scalars()]
+
     async def save(self, document: Document) -> Document:
         existing = await self._session.get(DocumentModel, document.id)
         if existing:
             existing.title = document.title
             existing.content = document.content
+            existing.indexing_status = document.indexing_status
+            existing.chunking_strategy = document.chunking_strategy
             await self._session.flush()
             return self._to_domain(existing)
 
@@ -54,11 +89,52 @@ class DocumentRepository(IDocumentRepository):
             title=document.title,
             content=document.content,
             owner_id=document.owner_id,
+            indexing_status=document.indexing_status,
+            chunking_strategy=document.chunking_strategy,
         )
         self._session.add(model)
         await self._session.flush()
         return self._to_domain(model)
 
+    async def add_many(self, documents: list[Document]) -> list[Document]:
+        """
+        批次新增文件（COPY / 多列 INSERT，不建立 ORM 物件）
+
+        created_at / updated_at 在這裡指定（同一批相同），不需要 RETURNING 取回
+        """
+        now = datetime.now(UTC)
+        added = [
+            Document(
+                id=document.id or str(uuid4()),
+                title=document.title,
+                content=document.content,
+                owner_id=document.owner_id,
+                created_at=now,
+                updated_at=now,
+                indexing_status=document.indexing_status,
+                chunking_strategy=document.chunking_strategy,
+            )
+            for document in documents
+        ]
+        await bulk_insert(
+            self._session,
+            DocumentModel,
+            [
+                {
+                    "id": document.id,
+                    "title": document.title,
+                    "content": document.content,
+                    "owner_id": document.owner_id,
+                    "created_at": now,
+                    "updated_at": now,
+                    "indexing_status": document.indexing_status.value,
+                    "chunking_strategy": document.chunking_strategy.value,
+                }
+                for document in added
+            ],
+        )
+        return added
+
     async def delete(self, id: str) -> bool:
         model = await self._session.get(DocumentModel, id)
         if model:
@@ -74,4 +150,6 @@ class DocumentRepository(IDocumentRepository):
             owner_id=model.owner_id,
             created_at=model.created_at,
             updated_at=model.updated_at,
+            indexing_status=IndexingStatus(model.indexing_status),
+            chunking_strategy=ChunkingStrategy(model.chunking_strategy),
         )
@@ -0,0 +1,84 @@
+"""
+嵌入快取儲存庫
+
+ABP 對比：
+- ABP: IRepository<EmbeddingCacheItem> 搭配批次查詢 GetListAsync(x => hashes.Contains(x.ContentHash))
+- Python: 使用 PostgreSQL 的 = ANY(array) 查詢與 ON CONFLICT DO NOTHING
+"""
+
+import hashlib
+
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.models.embedding import EmbeddingVector
+from src.infrastructure.persistence.models.embedding_cache_model import (
+    EmbeddingCacheModel,
+)
+
+_INSERT_BATCH_SIZE = 1000
+
+
+def content_hash(text: str) -> str:
+    """計算 chunk 文本的 sha256（十六進位字串）"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCacheRepository:
+    """
+    嵌入快取儲存庫
+
+    ABP 對比：
+    - ABP: public class EmbeddingCacheRepository : EfCoreRepository<...>
+    - 只提供批次讀寫，避免逐筆查詢
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_many(
+        self,
+        model_name: str,
+        hashes: list[str],
+    ) -> dict[str, EmbeddingVector]:
+        """一次查出所有命中的嵌入向量，回傳 hash -> embedding"""
+        if not hashes:
+            return {}
+
+        stmt = select(
+            EmbeddingCacheModel.content_hash,
+            EmbeddingCacheModel.embedding,
+        ).where(
+            EmbeddingCacheModel.model_name == model_name,
+            # 以單一陣列參數查詢，避免 IN 展開成大量 bind 參數
+            EmbeddingCacheModel.content_hash
+            == any_(bindparam("hashes", hashes, type_=ARRAY(String(64)))),
+        )
+        result = await self._session.execute(stmt)
+        return {row.content_hash: row.embedding for row in result}
+
+    async def put_many(
+        self,
+        model_name: str,
+        embeddings: dict[str, EmbeddingVector],
+    ) -> None:
+        """批次寫入快取；已存在的鍵（例如並行寫入）直接略過"""
+        rows = [
+            {"model_name": model_name, "content_hash": hash_, "embedding": embedding}
+            for hash_, embedding in embeddings.items()
+        ]
+
+        # 分批寫入，避免單一語句超過 PostgreSQL 的 bind 參數上限
+        for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+            stmt = (
+                insert(EmbeddingCacheModel)
+                .values(rows[start : start + _INSERT_BATCH_SIZE])
+                .on_conflict_do_nothing(
+                    index_elements=[
+                        EmbeddingCacheModel.model_name,
+                        EmbeddingCacheModel.content_hash,
+                    ]
+                )
+            )
+            await self._session.execute(stmt)
@@ -0,0 +1,214 @@
+"""
+背景索引工作儲存庫（outbox）
+
+ABP 對比：
+- ABP: IEventOutbox / IEventInbox（EnqueueAsync、GetWaitingEventsAsync、DeleteAsync）
+- Python: PostgreSQL 的 INSERT ... ON CONFLICT 與 SELECT ... FOR UPDATE SKIP LOCKED
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import and_, delete, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.models.document import IndexingStatus
+from src.infrastructure.persistence.models.document_model import DocumentModel
+from src.infrastructure.persistence.models.indexing_job_model import IndexingJobModel
+
+
+@dataclass
+class IndexingJob:
+    """已取出的索引工作（version 用於判斷處理期間文件是否又被更新）"""
+
+    document_id: str
+    owner_id: str
+    version: int
+    attempts: int
+
+
+class IndexingJobRepository:
+    """
+    索引工作儲存庫
+
+    ABP 對比：
+    - ABP: public class IndexingJobRepository : EfCoreRepository<IndexingJob>
+    - 取出與完成各為一個短交易，處理（嵌入）期間不持有資料列鎖，
+      因此 mutation 寫入工作時不會被處理中的 worker 阻塞
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def enqueue(self, document_id: str, owner_id: str) -> None:
+        """
+        排入文件的索引工作（與文件寫入同一個交易）
+
+        已有工作時只遞增 version 並重設重試狀態，不會產生重複的工作；
+        處理中的工作保留租約，完成時發現 version 不符會再處理一次
+        """
+        await self.enqueue_many([document_id], owner_id)
+
+    async def enqueue_many(self, document_ids: list[str], owner_id: str) -> None:
+        """一次排入多份文件的索引工作（單一多列 upsert）"""
+        if not document_ids:
+            return
+        stmt = insert(IndexingJobModel).values(
+            [
+                {"document_id": document_id, "owner_id": owner_id}
+                for document_id in document_ids
+            ]
+        )
+        await self._session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[IndexingJobModel.document_id],
+                set_={
+                    "version": IndexingJobModel.version + 1,
+                    "attempts": 0,
+                    "available_at": func.now(),
+                    "last_error": None,
+                },
+            )
+        )
+
+    async def claim(self, limit: int, lease_seconds: float) -> list[IndexingJob]:
+        """
+        取出最多 limit 筆可處理的工作，設定租約並遞增嘗試次數
+
+        ABP 對比：
+        var jobs = await _dbContext.IndexingJobs
+            .FromSqlRaw("SELECT ... FOR UPDATE SKIP LOCKED LIMIT {0}", limit)
+            .ToListAsync();
+
+        - SKIP LOCKED：並行的 worker（包含其他行程）略過彼此正在取出的列，不互相等待
+        - 呼叫端應立即 commit，之後的處理不持有鎖；租約到期前其他 worker 不會取出
+        """
+        now = func.now()
+        candidates = (
+            select(IndexingJobModel.document_id)
+            .where(
+                IndexingJobModel.available_at <= now,
+                or_(
+                    IndexingJobModel.locked_until.is_(None),
+                    IndexingJobModel.locked_until < now,
+                ),
+            )
+            .order_by(IndexingJobModel.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(
+            update(IndexingJobModel)
+            .where(IndexingJobModel.document_id.in_(candidates.scalar_subquery()))
+            .values(
+                locked_until=now + timedelta(seconds=lease_seconds),
+                attempts=IndexingJobModel.attempts + 1,
+            )
+            .returning(
+                IndexingJobModel.document_id,
+                IndexingJobModel.owner_id,
+                IndexingJobModel.version,
+                IndexingJobModel.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return [IndexingJob(*row) for row in result]
+
+    async def complete(self, jobs: list[IndexingJob]) -> list[str]:
+        """
+        完成工作：刪除 version 未變的工作並將文件標記為 indexed，回傳這些文件的 id
+
+        處理期間又被更新的工作（version 已遞增）只釋放租約，之後以新內容再處理
+        """
+        if not jobs:
+            return []
+
+        result = await self._session.execute(
+            delete(IndexingJobModel)
+            .where(
+                tuple_(IndexingJobModel.document_id, IndexingJobModel.version).in_(
+                    [(job.document_id, job.version) for job in jobs]
+                )
+            )
+            .returning(IndexingJobModel.document_id)
+        )
+        completed = list(result.scalars())
+        await self._set_status(completed, IndexingStatus.INDEXED)
+
+        pending = [job.document_id for job in jobs if job.document_id not in completed]
+        if pending:
+            await self._session.execute(
+                update(IndexingJobModel)
+                .where(IndexingJobModel.document_id.in_(pending))
+                .values(locked_until=None)
+                .execution_options(synchronize_session=False)
+            )
+        return completed
+
+    async def release(self, jobs: list[IndexingJob]) -> None:
+        """
+        放回未處理的工作：釋放租約並還原這次取出遞增的嘗試次數
+
+        用於本行程無法處理（例如嵌入模型已切換）而非文件本身失敗的情況
+        """
+        if not jobs:
+            return
+        await self._session.execute(
+            update(IndexingJobModel)
+            .where(IndexingJobModel.document_id.in_([job.document_id for job in jobs]))
+            .values(
+                locked_until=None,
+                attempts=func.greatest(IndexingJobModel.attempts - 1, 0),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def retry(self, job: IndexingJob, error: str, delay_seconds: float) -> None:
+        """處理失敗：記錄錯誤並在 delay_seconds 後重新可取出"""
+        await self._session.execute(
+            update(IndexingJobModel)
+            .where(IndexingJobModel.document_id == job.document_id)
+            .values(
+                locked_until=None,
+                available_at=func.now() + timedelta(seconds=delay_seconds),
+                last_error=error,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def fail(self, job: IndexingJob, error: str) -> bool:
+        """
+        重試次數用盡：刪除工作並將文件標記為 failed
+
+        處理期間文件又被更新時不標記失敗（新內容重新計算嘗試次數），回傳 False
+        """
+        result = await self._session.execute(
+            delete(IndexingJobModel)
+            .where(
+                and_(
+                    IndexingJobModel.document_id == job.document_id,
+                    IndexingJobModel.version == job.version,
+                )
+            )
+            .returning(IndexingJobModel.document_id)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.retry(job, error, 0)
+            return False
+
+        await self._set_status([job.document_id], IndexingStatus.FAILED)
+        return True
+
+    async def _set_status(
+        self, document_ids: list[str], status: IndexingStatus
+    ) -> None:
+        if not document_ids:
+            return
+        await self._session.execute(
+            update(DocumentModel)
+            .where(DocumentModel.id.in_(document_ids))
+            # 明確沿用 updated_at：索引狀態的變更不算文件的修改
+            .values(indexing_status=status.value, updated_at=DocumentModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,466 @@
+"""
+程序內的使用者向量索引（熱門使用者的搜尋不經過 pgvector）
+
+ABP 對比：
+- ABP: 以 Decorator 包裝 IVectorRepository，搭配 IMemoryCache 快取每個租戶的向量
+- Python: 每個 owner 一個連續的 float32 numpy 矩陣，以矩陣乘法 + argpartition 取 top-k
+
+設計說明：
+- 第一次搜尋時載入該使用者所有 chunk 向量（正規化後依 document_id 排序），
+  之後的搜尋只需一次矩陣乘法，再以一次主鍵查詢取得標題與內容預覽
+- 所有使用者的索引共用一個記憶體上限，超過時淘汰最久未使用的使用者
+- 本行程寫入（建立 / 更新 / 刪除文件）在 commit 後失效該使用者的索引，
+  下一次搜尋重新載入；其他行程的寫入最晚在 TTL 後反映
+- 未載入、超過記憶體上限或其他查詢（分頁、混合、範圍、相似文件）一律交給 pgvector 實作
+- 與 VectorRepository 相同，搜尋前檢查嵌入模型是否已被全庫重新嵌入切換（見 embedding_guard）；
+  載入時記錄向量的模型與維度，與目前設定不同的索引不會被使用
+"""
+
+import itertools
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+from sqlalchemy import func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.domain.interfaces.vector_repository import IVectorRepository
+from src.domain.models.document import ChunkingStrategy, Document
+from src.domain.models.embedding import EmbeddingMatrix, EmbeddingVector
+from src.domain.models.search_result import DocumentChunk, SearchResult, SimilarDocument
+from src.infrastructure.caching.lru_cache import BoundedLRUCache, CacheStats
+from src.infrastructure.persistence.database import run_after_commit
+from src.infrastructure.persistence.embedding_guard import get_embedding_model_guard
+from src.infrastructure.persistence.models.document_chunk_model import (
+    DocumentChunkModel,
+)
+from src.infrastructure.persistence.models.document_model import DocumentModel
+
+logger = logging.getLogger(__name__)
+
+# 內容預覽長度，與 VectorRepository 相同
+_PREVIEW_LENGTH = 200
+
+# chunk / document id 為 UUID 字串，以固定長度 bytes 存放（nbytes 即實際大小）
+_ID_DTYPE = np.dtype("S36")
+
+
+@dataclass
+class TenantVectorIndex:
+    """
+    單一使用者的向量索引
+
+    - matrix: (chunks 數, 維度) 的 float32 矩陣，每列已正規化，依 document_id 排序
+    - chunk_ids: 與 matrix 同順序的 chunk id
+    - document_ids / starts: 每份文件的 id 與其第一個 chunk 在 matrix 中的位置
+    - model_name / dimension: 載入時資料表中向量的嵌入模型與維度
+    """
+
+    matrix: NDArray[np.float32]
+    chunk_ids: NDArray[np.bytes_]
+    document_ids: NDArray[np.bytes_]
+    starts: NDArray[np.intp]
+    model_name: str
+    dimension: int
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.matrix.nbytes
+            + self.chunk_ids.nbytes
+            + self.document_ids.nbytes
+            + self.starts.nbytes
+        )
+
+    def top_documents(
+        self,
+        query_embedding: EmbeddingVector,
+        limit: int,
+        threshold: float = 0.0,
+    ) -> list[tuple[str, float]]:
+        """
+        每份文件最相近的 chunk，取相似度最高的 limit 份文件：[(chunk_id, score)]
+
+        1. scores = matrix @ q（列已正規化，即 cosine 相似度）
+        2. np.maximum.reduceat 取每份文件的最高分
+        3. argpartition 取前 limit 名，只排序這 limit 筆
+        """
+        if not len(self.document_ids) or limit <= 0:
+            return []
+
+        norm = np.linalg.norm(query_embedding)
+        query = query_embedding / norm if norm else query_embedding
+        scores = self.matrix @ query.astype(np.float32, copy=False)
+        document_scores = np.maximum.reduceat(scores, self.starts)
+
+        if limit < len(document_scores):
+            top = np.argpartition(-document_scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(document_scores))
+        top = top[np.argsort(-document_scores[top], kind="stable")]
+        if threshold > 0:
+            top = top[document_scores[top] >= threshold]
+
+        ends = np.append(self.starts[1:], len(scores))
+        return [
+            (
+                self.chunk_ids[start + int(np.argmax(scores[start:end]))].decode(),
+                float(document_scores[position]),
+            )
+            for position, start, end in zip(
+                top.tolist(), self.starts[top].tolist(), ends[top].tolist()
+            )
+        ]
+
+
+def _estimate_size(owner_id: str, index: TenantVectorIndex) -> int:
+    return index.nbytes
+
+
+# owner_id -> 索引（跨請求共用）
+_tenant_indexes: BoundedLRUCache[str, TenantVectorIndex] = BoundedLRUCache(
+    max_entries=100_000,
+    max_bytes=settings.memory_index_max_mb * 1024 * 1024,
+    ttl_seconds=settings.memory_index_ttl_seconds,
+    sizeof=_estimate_size,
+)
+
+# 超過記憶體上限、不載入的使用者（一段時間後重新檢查）
+_oversized: BoundedLRUCache[str, bool] = BoundedLRUCache(
+    max_entries=100_000,
+    max_bytes=0,  # 只以筆數限制
+    ttl_seconds=settings.vector_tenant_size_ttl_seconds,
+)
+
+# owner_id -> 最後一次失效的序號：載入期間被失效時，不把載入結果放入快取
+_invalidations: BoundedLRUCache[str, int] = BoundedLRUCache(
+    max_entries=100_000,
+    max_bytes=0,
+)
+_invalidation_counter = itertools.count(1)
+
+
+def invalidate_tenant_index(owner_id: str) -> None:
+    """失效使用者的索引（下一次搜尋重新載入）"""
+    _tenant_indexes.invalidate(owner_id)
+    _invalidations.set(owner_id, next(_invalidation_counter))
+
+
+def tenant_index_stats() -> CacheStats:
+    return _tenant_indexes.stats()
+
+
+class InMemoryVectorRepository(IVectorRepository):
+    """
+    程序內索引的向量儲存庫（Decorator，未命中時使用 pgvector）
+
+    ABP 對比：
+    public class InMemoryVectorRepository : IVectorRepository
+    {
+        private readonly IVectorRepository _inner;  // VectorRepository（pgvector）
+        private readonly IMemoryCache _cache;
+    }
+
+    - search / search_batch：使用程序內索引（精確搜尋，ef_search / probes 不適用）
+    - index_document(s) / delete_document：交給 pgvector 實作，commit 後失效該使用者的索引
+    - 其他方法直接交給 pgvector 實作
+    """
+
+    def __init__(
+        self, inner: IVectorRepository, session: AsyncSession, model_name: str
+    ):
+        self._inner = inner
+        self._session = session
+        self._model = (model_name, settings.embedding_dimension)
+        self._model_guard = get_embedding_model_guard(model_name)
+
+    @property
+    def inner(self) -> IVectorRepository:
+        return self._inner
+
+    async def index_document(
+        self,
+        document_id: str,
+        title: str,
+        content: str,
+        owner_id: str,
+        chunking_strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
+    ) -> list[str]:
+        chunk_ids = await self._inner.index_document(
+            document_id, title, content, owner_id, chunking_strategy
+        )
+        run_after_commit(self._session, lambda: invalidate_tenant_index(owner_id))
+        return chunk_ids
+
+    async def index_documents(
+        self,
+        documents: list[Document],
+        chunks: list[list[str]] | None = None,
+    ) -> list[list[str]]:
+        chunk_ids = await self._inner.index_documents(documents, chunks)
+        for owner_id in {document.owner_id for document in documents}:
+            run_after_commit(
+                self._session,
+                lambda owner_id=owner_id: invalidate_tenant_index(owner_id),
+            )
+        return chunk_ids
+
+    async def delete_document(self, document_id: str) -> bool:
+        owner_id = await self._session.scalar(
+            select(DocumentModel.owner_id).where(DocumentModel.id == document_id)
+        )
+        deleted = await self._inner.delete_document(document_id)
+        if owner_id is not None:
+            run_after_commit(self._session, lambda: invalidate_tenant_index(owner_id))
+        return deleted
+
+    async def search(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SearchResult]:
+        """
+        語意搜尋：優先使用程序內索引
+
+        ABP 對比：
+        var index = await _cache.GetOrCreateAsync(ownerId, LoadIndexAsync);
+        if (index is null) return await _inner.SearchAsync(...);
+        var hits = index.TopDocuments(queryVector, limit, threshold);
+        return await HydrateAsync(hits);  // 一次主鍵查詢取得標題與預覽
+        """
+        await self._model_guard.check_cached(self._session)
+        index = await self._get_index(owner_id)
+        if index is None:
+            return await self._inner.search(
+                query_embedding, owner_id, limit, threshold, ef_search, probes
+            )
+
+        hits = index.top_documents(query_embedding, limit, threshold)
+        return (await self._hydrate([hits]))[0]
+
+    async def search_batch(
+        self,
+        query_embeddings: EmbeddingMatrix,
+        owner_id: str,
+        limits: list[int],
+        thresholds: list[float],
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[SearchResult]]:
+        """批次語意搜尋：每個查詢各自取 top-k，所有結果以一次主鍵查詢取得標題與預覽"""
+        await self._model_guard.check_cached(self._session)
+        index = await self._get_index(owner_id)
+        if index is None:
+            return await self._inner.search_batch(
+                query_embeddings, owner_id, limits, thresholds, ef_search, probes
+            )
+
+        return await self._hydrate(
+            [
+                index.top_documents(query_embedding, limit, threshold)
+                for query_embedding, limit, threshold in zip(
+                    query_embeddings, limits, thresholds
+                )
+            ]
+        )
+
+    async def _hydrate(
+        self,
+        hits_per_query: list[list[tuple[str, float]]],
+    ) -> list[list[SearchResult]]:
+        """以一次主鍵查詢取得命中 chunks 的文件 id、標題與內容預覽"""
+        chunk_ids = {chunk_id for hits in hits_per_query for chunk_id, _ in hits}
+        if not chunk_ids:
+            return [[] for _ in hits_per_query]
+
+        stmt = (
+            select(
+                DocumentChunkModel.id,
+                DocumentChunkModel.document_id,
+                func.left(DocumentChunkModel.content, _PREVIEW_LENGTH + 1),
+                DocumentModel.title,
+            )
+            .join(DocumentModel, DocumentModel.id == DocumentChunkModel.document_id)
+            .where(DocumentChunkModel.id.in_(list(chunk_ids)))
+        )
+        connection = await self._session.connection()
+        rows = {row[0]: row for row in await connection.execute(stmt)}
+
+        # 載入後才被其他請求刪除的 chunk 不會出現在 rows 中
+        return [
+            [
+                SearchResult(
+                    document_id=rows[chunk_id][1],
+                    title=rows[chunk_id][3],
+                    content_preview=self._truncate(rows[chunk_id][2], _PREVIEW_LENGTH),
+                    score=score,
+                    chunk_id=chunk_id,
+                )
+                for chunk_id, score in hits
+                if chunk_id in rows
+            ]
+            for hits in hits_per_query
+        ]
+
+    async def _get_index(self, owner_id: str) -> TenantVectorIndex | None:
+        """
+        取得使用者的索引，尚未載入時從資料庫載入
+
+        同一使用者同時的第一次搜尋可能各自載入一次，結果相同，只有其中一份留在快取
+        """
+        index = _tenant_indexes.get(owner_id)
+        if index is not None:
+            if (index.model_name, index.dimension) == self._model:
+                return index
+            # 以其他模型的向量載入（例如切換前），重新載入
+            _tenant_indexes.invalidate(owner_id)
+        if _oversized.get(owner_id):
+            return None
+
+        # 先只數到上限可容納的筆數，避免載入放不下的使用者
+        dimension = settings.embedding_dimension
+        row_bytes = dimension * 4 + _ID_DTYPE.itemsize
+        max_rows = settings.memory_index_max_mb * 1024 * 1024 // row_bytes
+        capped = (
+            select(literal(1))
+            .where(DocumentChunkModel.owner_id == owner_id)
+            .limit(max_rows + 1)
+            .subquery()
+        )
+        count = await self._session.scalar(select(func.count()).select_from(capped))
+        if (count or 0) > max_rows:
+            _oversized.set(owner_id, True)
+            return None
+
+        generation = _invalidations.get(owner_id)
+        index = await self._load_index(owner_id)
+        if _invalidations.get(owner_id) == generation:
+            _tenant_indexes.set(owner_id, index)
+        logger.debug(
+            f"Loaded in-memory vector index for {owner_id}: "
+            f"{len(index.chunk_ids)} chunks, {index.nbytes / 1024 / 1024:.1f} MB"
+        )
+        return index
+
+    async def _load_index(self, owner_id: str) -> TenantVectorIndex:
+        """
+        讀取使用者所有 chunk 向量，組成依 document_id 排序的正規化矩陣
+
+        讀取前在同一個交易中確認資料表中的向量仍是本行程設定的模型
+        """
+        await self._model_guard.check(self._session)
+        model_name, dimension = self._model
+        stmt = (
+            select(
+                DocumentChunkModel.document_id,
+                DocumentChunkModel.id,
+                DocumentChunkModel.embedding,
+            )
+            .where(
+                DocumentChunkModel.owner_id == owner_id,
+                DocumentChunkModel.embedding.is_not(None),
+            )
+            .order_by(DocumentChunkModel.document_id)
+        )
+        connection = await self._session.connection()
+        rows = (await connection.execute(stmt)).all()
+
+        if not rows:
+            return TenantVectorIndex(
+                matrix=np.empty((0, dimension), dtype=np.float32),
+                chunk_ids=np.empty(0, dtype=_ID_DTYPE),
+                document_ids=np.empty(0, dtype=_ID_DTYPE),
+                starts=np.empty(0, dtype=np.intp),
+                model_name=model_name,
+                dimension=dimension,
+            )
+
+        document_column = np.array([row[0] for row in rows], dtype=_ID_DTYPE)
+        matrix = np.stack([row[2] for row in rows]).astype(np.float32, copy=False)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        # 每份文件第一個 chunk 的位置（rows 已依 document_id 排序）
+        starts = np.flatnonzero(
+            np.concatenate(([True], document_column[1:] != document_column[:-1]))
+        )
+        return TenantVectorIndex(
+            matrix=np.ascontiguousarray(matrix),
+            chunk_ids=np.array([row[1] for row in rows], dtype=_ID_DTYPE),
+            document_ids=document_column[starts],
+            starts=starts,
+            model_name=model_name,
+            dimension=dimension,
+        )
+
+    async def search_page(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        after: tuple[float, str] | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[tuple[float, SearchResult]]:
+        # cursor 為 SQL 計算的距離，分頁一律由 pgvector 實作執行
+        return await self._inner.search_page(
+            query_embedding, owner_id, limit, threshold, after, ef_search, probes
+        )
+
+    async def hybrid_search(
+        self,
+        query_embedding: EmbeddingVector,
+        query_text: str,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SearchResult]:
+        return await self._inner.hybrid_search(
+            query_embedding, query_text, owner_id, limit, threshold, ef_search, probes
+        )
+
+    async def range_search(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        threshold: float,
+        limit: int = 100,
+        after: tuple[float, str] | None = None,
+    ) -> list[SearchResult]:
+        return await self._inner.range_search(
+            query_embedding, owner_id, threshold, limit, after
+        )
+
+    async def find_similar(
+        self,
+        document_id: str,
+        owner_id: str,
+        limit: int = 5,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SimilarDocument]:
+        return await self._inner.find_similar(
+            document_id, owner_id, limit, ef_search, probes
+        )
+
+    async def get_document_chunks(self, document_id: str) -> list[DocumentChunk]:
+        return await self._inner.get_document_chunks(document_id)
+
+    async def get_chunk_contents(self, chunk_ids: list[str]) -> dict[str, str]:
+        return await self._inner.get_chunk_contents(chunk_ids)
+
+    @staticmethod
+    def _truncate(text: str, max_length: int) -> str:
+        """截斷文本並加省略號"""
+        if len(text) <= max_length:
+            return text
+        return text[: max_length - 3] + "..."
@@ -0,0 +1,309 @@
+"""
+全庫重新嵌入儲存庫（影子欄位與 checkpoint）
+
+ABP 對比：
+- ABP: 自訂 Repository 搭配 ExecuteSqlRawAsync 執行 DDL
+- Python: 以 keyset 分批讀取，影子欄位以 executemany 更新，DDL 在同一個交易中執行
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import (
+    ColumnElement,
+    String,
+    any_,
+    bindparam,
+    delete,
+    func,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.models.embedding import EmbeddingVector
+from src.infrastructure.persistence.models.reembed_run_model import (
+    ReembedRunModel,
+    ReembedStatus,
+)
+from src.infrastructure.persistence.shadow_embeddings import (
+    SHADOW_COLUMN,
+    SHADOW_SOURCE_COLUMN,
+    shadow_chunks,
+    shadow_document_embeddings,
+)
+
+# 未結束的執行（同時最多一筆）
+ACTIVE_STATUSES = (
+    ReembedStatus.CHUNKS,
+    ReembedStatus.DOCUMENTS,
+    ReembedStatus.INDEXES,
+    ReembedStatus.READY,
+)
+
+
+class ReembedRepository:
+    """
+    重新嵌入儲存庫
+
+    ABP 對比：
+    - ABP: public class ReembedRepository : EfCoreRepository<ReembedRun>
+    - chunks 與文件都以主鍵 keyset 分批：每批都是主鍵索引上的範圍掃描，
+      不需要 OFFSET，也不需要在執行期間保留資料表快照
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    # ========== 執行紀錄 ==========
+
+    async def get_active_run(self) -> ReembedRunModel | None:
+        result = await self._session.execute(
+            select(ReembedRunModel).where(ReembedRunModel.status.in_(ACTIVE_STATUSES))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_latest_run(self) -> ReembedRunModel | None:
+        result = await self._session.execute(
+            select(ReembedRunModel).order_by(ReembedRunModel.started_at.desc()).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_last_switched_run(self) -> ReembedRunModel | None:
+        """最近一次切換的執行（即目前 embedding 欄位的模型）"""
+        result = await self._session.execute(
+            select(ReembedRunModel)
+            .where(ReembedRunModel.status == ReembedStatus.SWITCHED)
+            .order_by(ReembedRunModel.switched_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def create_run(self, model_name: str, dimension: int) -> ReembedRunModel:
+        run = ReembedRunModel(
+            id=str(uuid4()),
+            model_name=model_name,
+            dimension=dimension,
+            status=ReembedStatus.CHUNKS.value,
+            chunks_done=0,
+            documents_done=0,
+        )
+        self._session.add(run)
+        await self._session.flush()
+        return run
+
+    async def set_status(
+        self,
+        run_id: str,
+        status: ReembedStatus,
+        switched: bool = False,
+    ) -> None:
+        values: dict[str, object] = {"status": status.value}
+        if switched:
+            values["switched_at"] = func.now()
+        await self._session.execute(
+            update(ReembedRunModel)
+            .where(ReembedRunModel.id == run_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def advance_chunks(self, run_id: str, cursor: str, count: int) -> None:
+        """與該批向量在同一個交易中更新游標"""
+        await self._session.execute(
+            update(ReembedRunModel)
+            .where(ReembedRunModel.id == run_id)
+            .values(
+                chunk_cursor=cursor,
+                chunks_done=ReembedRunModel.chunks_done + count,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def advance_documents(self, run_id: str, cursor: str, count: int) -> None:
+        await self._session.execute(
+            update(ReembedRunModel)
+            .where(ReembedRunModel.id == run_id)
+            .values(
+                document_cursor=cursor,
+                documents_done=ReembedRunModel.documents_done + count,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    # ========== chunks ==========
+
+    async def get_chunks_after(
+        self,
+        cursor: str | None,
+        limit: int,
+        pending_only: bool = False,
+    ) -> list[tuple[str, str]]:
+        """
+        依 id 順序取出 cursor 之後的 (chunk_id, content)
+
+        pending_only：只取影子欄位仍為 NULL 的 chunks（執行期間線上新增的 chunks）
+        """
+        chunks = shadow_chunks.c
+        stmt = select(chunks.id, chunks.content).order_by(chunks.id).limit(limit)
+        if cursor is not None:
+            stmt = stmt.where(chunks.id > cursor)
+        if pending_only:
+            stmt = stmt.where(chunks[SHADOW_COLUMN].is_(None))
+        result = await self._session.execute(stmt)
+        return [(chunk_id, content) for chunk_id, content in result]
+
+    async def set_chunk_embeddings(
+        self,
+        embeddings: list[tuple[str, EmbeddingVector]],
+    ) -> None:
+        """寫入影子欄位（單一 executemany，已被線上刪除的 chunk 直接略過）"""
+        if not embeddings:
+            return
+        chunks = shadow_chunks.c
+        await self._session.execute(
+            update(shadow_chunks)
+            .where(chunks.id == bindparam("chunk_id"))
+            .values({SHADOW_COLUMN: bindparam("embedding")}),
+            [
+                {"chunk_id": chunk_id, "embedding": embedding}
+                for chunk_id, embedding in embeddings
+            ],
+        )
+
+    async def count_pending_chunks(self) -> int:
+        chunks = shadow_chunks.c
+        result = await self._session.execute(
+            select(func.count())
+            .select_from(shadow_chunks)
+            .where(chunks[SHADOW_COLUMN].is_(None))
+        )
+        return result.scalar_one()
+
+    # ========== 文件層級嵌入 ==========
+
+    async def get_documents_after(
+        self,
+        cursor: str | None,
+        limit: int,
+        pending_only: bool = False,
+    ) -> list[tuple[str, datetime]]:
+        """
+        依 document_id 順序取出 cursor 之後的 (document_id, updated_at)
+
+        pending_only：只取影子欄位為 NULL 或計算後又被線上更新過的列
+        """
+        embeddings = shadow_document_embeddings.c
+        stmt = (
+            select(embeddings.document_id, embeddings.updated_at)
+            .order_by(embeddings.document_id)
+            .limit(limit)
+        )
+        if cursor is not None:
+            stmt = stmt.where(embeddings.document_id > cursor)
+        if pending_only:
+            stmt = stmt.where(self._document_pending())
+        result = await self._session.execute(stmt)
+        return [(document_id, updated_at) for document_id, updated_at in result]
+
+    async def get_chunk_embeddings(
+        self,
+        document_ids: list[str],
+    ) -> dict[str, list[EmbeddingVector | None]]:
+        """取出這些文件所有 chunks 的影子向量（尚未嵌入的為 None）"""
+        chunks = shadow_chunks.c
+        result = await self._session.execute(
+            select(chunks.document_id, chunks[SHADOW_COLUMN]).where(
+                chunks.document_id
+                == any_(bindparam("document_ids", document_ids, type_=ARRAY(String)))
+            )
+        )
+        vectors: dict[str, list[EmbeddingVector | None]] = {}
+        for document_id, embedding in result:
+            vectors.setdefault(document_id, []).append(embedding)
+        return vectors
+
+    async def set_document_embeddings(
+        self,
+        embeddings: list[tuple[str, datetime, EmbeddingVector]],
+    ) -> None:
+        """
+        寫入 (document_id, 計算時的 updated_at, 重心)
+
+        只更新影子欄位，不改 updated_at：線上寫入的 updated_at 才能用來判斷是否過期
+        """
+        if not embeddings:
+            return
+        columns = shadow_document_embeddings.c
+        await self._session.execute(
+            update(shadow_document_embeddings)
+            .where(columns.document_id == bindparam("key"))
+            .values(
+                {
+                    SHADOW_COLUMN: bindparam("embedding"),
+                    SHADOW_SOURCE_COLUMN: bindparam("source"),
+                }
+            ),
+            [
+                {"key": document_id, "source": updated_at, "embedding": embedding}
+                for document_id, updated_at, embedding in embeddings
+            ],
+        )
+
+    async def delete_document_embeddings(self, document_ids: list[str]) -> None:
+        """刪除已沒有任何 chunk 的文件層級嵌入（與 VectorRepository 的處理相同）"""
+        if not document_ids:
+            return
+        columns = shadow_document_embeddings.c
+        await self._session.execute(
+            delete(shadow_document_embeddings).where(
+                columns.document_id.in_(document_ids)
+            )
+        )
+
+    async def count_pending_documents(self) -> int:
+        result = await self._session.execute(
+            select(func.count())
+            .select_from(shadow_document_embeddings)
+            .where(self._document_pending())
+        )
+        return result.scalar_one()
+
+    @staticmethod
+    def _document_pending() -> ColumnElement[bool]:
+        embeddings = shadow_document_embeddings.c
+        return or_(
+            embeddings[SHADOW_COLUMN].is_(None),
+            embeddings[SHADOW_SOURCE_COLUMN].is_distinct_from(embeddings.updated_at),
+        )
+
+    # ========== DDL ==========
+
+    async def execute_ddl(self, statements: list[str]) -> None:
+        """在目前交易中執行 DDL（PostgreSQL 的 DDL 可以 rollback）"""
+        for statement in statements:
+            await self._session.execute(text(statement))
+
+    async def lock_vector_tables(self, lock_timeout_seconds: float) -> None:
+        """
+        取得兩個向量資料表的 ACCESS EXCLUSIVE 鎖（到交易結束）
+
+        lock_timeout 只影響目前交易：等不到鎖時失敗，
+        不會讓排在後面的線上查詢一直等下去
+        """
+        await self._session.execute(
+            select(
+                func.set_config(
+                    "lock_timeout", f"{int(lock_timeout_seconds * 1000)}ms", True
+                )
+            )
+        )
+        await self._session.execute(
+            text(
+                "LOCK TABLE document_chunks, document_embeddings "
+                "IN ACCESS EXCLUSIVE MODE"
+            )
+        )
@@ -7,20 +7,149 @@ ABP 對比：
 - Python: 使用 SQLAlchemy + pgvector.sqlalchemy
 """
 
-import re
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import delete, select
+import numpy as np
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    FromClause,
+    Integer,
+    Row,
+    Select,
+    Subquery,
+    and_,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from src.config import settings
 from src.domain.interfaces.vector_repository import IVectorRepository
+from src.domain.models.document import ChunkingStrategy, Document
+from src.domain.models.embedding import EmbeddingMatrix, EmbeddingVector
 from src.domain.models.search_result import DocumentChunk, SearchResult, SimilarDocument
+from src.infrastructure.caching.lru_cache import BoundedLRUCache
+from src.infrastructure.chunking.registry import get_text_chunker
 from src.infrastructure.embeddings.base import IEmbeddingService
+from src.infrastructure.persistence.bulk import bulk_insert
+from src.infrastructure.persistence.embedding_guard import get_embedding_model_guard
 from src.infrastructure.persistence.models.document_chunk_model import (
+    TEXT_SEARCH_CONFIG,
     DocumentChunkModel,
 )
+from src.infrastructure.persistence.models.document_embedding_model import (
+    DocumentEmbeddingModel,
+)
 from src.infrastructure.persistence.models.document_model import DocumentModel
+from src.infrastructure.persistence.repositories.embedding_cache_repository import (
+    EmbeddingCacheRepository,
+    content_hash,
+)
+from src.infrastructure.persistence.types import Float32Vector
+from src.infrastructure.persistence.vector_index import (
+    VectorSearchTuner,
+    compact_distance,
+)
+
+logger = logging.getLogger(__name__)
+
+# 搜尋結果的內容預覽長度（字元）
+_PREVIEW_LENGTH = 200
+
+# ANN 候選 chunks 數 = limit * 倍數，文件數不足時依倍數擴大，最多到上限
+_CANDIDATE_MULTIPLIER = 4
+_MAX_CANDIDATES = 1000
+
+# RRF 常數：score = Σ 1 / (k + rank)，k 越大，排名靠後的結果權重越接近前面的結果
+_RRF_K = 60
+
+# owner_id -> chunks 數（最多數到 vector_exact_search_max_chunks + 1），跨請求共用
+_tenant_sizes: BoundedLRUCache[str, int] = BoundedLRUCache(
+    max_entries=100_000,
+    max_bytes=0,  # 每筆只有一個整數，只以筆數限制
+    ttl_seconds=settings.vector_tenant_size_ttl_seconds,
+)
+
+
+def _shortlist(
+    id_column: Any,
+    embedding_column: Any,
+    query_embedding: EmbeddingVector | ColumnElement[Any],
+    limit: int | ColumnElement[int],
+    *conditions: ColumnElement[bool],
+    correlate: FromClause | None = None,
+) -> Subquery:
+    """
+    精簡索引（halfvec / bit）的候選 id：取 limit * oversampling 筆，
+    呼叫端再以完整精度的距離重新排序
+    """
+    shortlist = (
+        select(id_column.label("id"))
+        .where(*conditions)
+        .order_by(compact_distance(embedding_column, query_embedding))
+        .limit(limit * settings.vector_rescore_oversampling)
+    )
+    if correlate is not None:
+        shortlist = shortlist.correlate(correlate)
+    return shortlist.subquery("shortlist")
+
+
+def _is_after(
+    distance: ColumnElement[float],
+    chunk_id: ColumnElement[str],
+    after: tuple[float, str],
+) -> ColumnElement[bool]:
+    """keyset：(distance, chunk_id) 排在 after 之後"""
+    after_distance, after_chunk_id = after
+    return or_(
+        distance > after_distance,
+        and_(distance == after_distance, chunk_id > after_chunk_id),
+    )
+
+
+@dataclass
+class _ChunkPlan:
+    """單一文件的增量索引計畫：保留 / 重新編號 / 新增 / 刪除的 chunks"""
+
+    document_id: str
+    owner_id: str
+    chunk_ids: list[str] = field(default_factory=list)
+    renumbered: list[dict[str, object]] = field(default_factory=list)
+    # (chunk_id, chunk_index, text)
+    to_insert: list[tuple[str, int, str]] = field(default_factory=list)
+    stale_ids: list[str] = field(default_factory=list)
+
+
+def _without_count(
+    row: Row[tuple[str, str, str, float, int, str]],
+) -> tuple[str, str, str, float, str]:
+    document_id, chunk_id, preview, distance, _, title = row
+    return document_id, chunk_id, preview, distance, title
+
+
+def document_centroid(vectors: list[EmbeddingVector]) -> EmbeddingVector:
+    """文件層級嵌入：正規化後 chunk 向量的平均（vectors 不可為空）"""
+    matrix = np.stack(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    centroid = (matrix / np.where(norms == 0, 1, norms)).mean(axis=0)
+    return centroid.astype(np.float32)
 
 
 class VectorRepository(IVectorRepository):
@@ -53,6 +182,9 @@ class VectorRepository(IVectorRepository):
         """
         self._session = session
         self._embedding = embedding_service
+        self._embedding_cache = EmbeddingCacheRepository(session)
+        self._tuner = VectorSearchTuner(session)
+        self._model_guard = get_embedding_model_guard(embedding_service.model_name)
 
     async def index_document(
         self,
@@ -60,6 +192,7 @@ class VectorRepository(IVectorRepository):
         title: str,
         content: str,
         owner_id: str,
+        chunking_strategy: ChunkingStrategy = ChunkingStrategy.TEXT,
     ) -> list[str]:
         """
         將文件索引到向量儲存
@@ -67,53 +200,260 @@ class VectorRepository(IVectorRepository):
         ABP 對比：
         public async Task<List<string>> IndexDocumentAsync(...)
         {
-            // 1. 刪除舊的 chunks
-            await _chunkRepo.DeleteManyAsync(x => x.DocumentId == documentId);
-
-            // 2. 分塊並生成嵌入
+            // 1. 分塊並與現有 chunks 比對
             var chunks = ChunkText(content);
-            var embeddings = await _embeddingService.GenerateEmbeddingsAsync(chunks);
+            var diff = DiffChunks(existingChunks, chunks);
 
-            // 3. 儲存新的 chunks
-            var entities = chunks.Zip(embeddings, (c, e) => new DocumentChunk { ... });
-            await _chunkRepo.InsertManyAsync(entities);
+            // 2. 只嵌入並儲存變更的 chunks
+            var embeddings = await _embeddingService.GenerateEmbeddingsAsync(diff.Added);
+            await _chunkRepo.DeleteManyAsync(diff.Removed);
+            await _chunkRepo.InsertManyAsync(...);  // bulk insert，不追蹤實體
         }
+
+        增量索引：
+        - 以 chunk 內容的 sha256 比對新舊 chunks
+        - 內容相同的 chunk 保留原本的列（必要時只更新 chunk_index）
+        - 只刪除消失的 chunk、只嵌入並新增新出現的 chunk
+        - 新 chunks 以 COPY / 多列 INSERT 寫入，不建立 ORM 物件
         """
-        # 1. 刪除現有的 chunks（如果有的話）
-        await self._session.execute(
-            delete(DocumentChunkModel).where(
-                DocumentChunkModel.document_id == document_id
-            )
+        document = Document(
+            id=document_id,
+            title=title,
+            content=content,
+            owner_id=owner_id,
+            chunking_strategy=chunking_strategy,
         )
+        (chunk_ids,) = await self.index_documents([document])
+        return chunk_ids
+
+    async def index_documents(
+        self,
+        documents: list[Document],
+        chunks: list[list[str]] | None = None,
+    ) -> list[list[str]]:
+        """
+        批次索引多份文件：所有文件的新 chunks 以一次嵌入呼叫取得向量
+
+        ABP 對比：
+        public async Task<List<List<string>>> IndexDocumentsAsync(List<Document> documents)
+        {
+            var diffs = documents.Select(d => DiffChunks(existing[d.Id], ChunkText(d)));
+            var embeddings = await _embeddingService.GenerateEmbeddingsAsync(
+                diffs.SelectMany(d => d.Added));
+            ...
+        }
 
-        # 2. 分塊文本
-        chunks = self._chunk_text(f"{title}\n\n{content}")
-        if not chunks:
+        - 每份文件的比對規則與 index_document 相同
+        - 現有 chunks 的雜湊、刪除、重新編號與寫入都是跨文件的單一語句
+        - chunks 為呼叫端已分好的塊（與 documents 一一對應，例如在 Process Pool 中分塊），
+          None 時在 worker thread 中分塊（tokenizer 載入與 token 計算不佔用 event loop）
+        - 回傳與 documents 同順序的 chunk IDs
+        """
+        if not documents:
             return []
+        if chunks is None:
+            chunks = await asyncio.to_thread(self._chunk_documents, documents)
 
-        # 3. 生成嵌入向量
-        embeddings = self._embedding.embed(chunks)
+        # 1. 取得所有文件現有 chunks 的雜湊（由資料庫計算，不傳回內容與向量）
+        existing = await self._get_chunk_hashes([str(doc.id) for doc in documents])
 
-        # 4. 建立 chunk 實體並儲存
-        chunk_ids = []
-        for index, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk_id = str(uuid4())
-            chunk_model = DocumentChunkModel(
-                id=chunk_id,
-                document_id=document_id,
-                content=chunk_text,
-                chunk_index=index,
-                embedding=embedding,
+        # 2. 分塊並逐一比對：保留 / 重新編號 / 新增
+        plans = [
+            self._plan_chunks(doc, document_chunks, existing.get(str(doc.id), []))
+            for doc, document_chunks in zip(documents, chunks, strict=True)
+        ]
+
+        # 3. 套用差異（跨文件合併成單一語句）
+        stale_ids = [chunk_id for plan in plans for chunk_id in plan.stale_ids]
+        if stale_ids:
+            await self._session.execute(
+                delete(DocumentChunkModel).where(DocumentChunkModel.id.in_(stale_ids))
             )
-            self._session.add(chunk_model)
-            chunk_ids.append(chunk_id)
 
-        await self._session.flush()
-        return chunk_ids
+        renumbered = [row for plan in plans for row in plan.renumbered]
+        if renumbered:
+            # ORM bulk UPDATE by primary key（executemany）
+            await self._session.execute(update(DocumentChunkModel), renumbered)
+
+        to_insert = [
+            (plan, chunk_id, index, chunk_text)
+            for plan in plans
+            for chunk_id, index, chunk_text in plan.to_insert
+        ]
+        embeddings: list[EmbeddingVector] = []
+        if to_insert:
+            # 只有新內容需要嵌入（且仍會先查詢內容雜湊快取）
+            embeddings = await self._embed_chunks([text for *_, text in to_insert])
+            # 先寫出 session 中尚未 flush 的變更（例如新文件本身），再批次寫入 chunks
+            await self._session.flush()
+            await bulk_insert(
+                self._session,
+                DocumentChunkModel,
+                [
+                    {
+                        "id": chunk_id,
+                        "document_id": plan.document_id,
+                        "owner_id": plan.owner_id,
+                        "content": chunk_text,
+                        "chunk_index": index,
+                        "embedding": embedding,
+                    }
+                    for (plan, chunk_id, index, chunk_text), embedding in zip(
+                        to_insert, embeddings
+                    )
+                ],
+            )
+
+        # 4. chunks 有增減的文件更新文件層級嵌入（重心）
+        changed: list[tuple[_ChunkPlan, list[EmbeddingVector]]] = []
+        offset = 0
+        for plan in plans:
+            new_embeddings = embeddings[offset : offset + len(plan.to_insert)]
+            offset += len(plan.to_insert)
+            if plan.to_insert or plan.stale_ids:
+                changed.append((plan, new_embeddings))
+
+            logger.debug(
+                f"Indexed document {plan.document_id}: {len(plan.chunk_ids)} chunks "
+                f"({len(plan.to_insert)} inserted, {len(plan.stale_ids)} deleted, "
+                f"{len(plan.renumbered)} renumbered)"
+            )
+        if changed:
+            await self._update_document_embeddings(changed)
+            # 寫入向量後才檢查：已持有列鎖，全庫重新嵌入的切換不會發生在檢查之後
+            await self._model_guard.check(self._session)
+        return [plan.chunk_ids for plan in plans]
+
+    def _plan_chunks(
+        self,
+        document: Document,
+        chunks: list[str],
+        existing: list[tuple[str, int, str]],
+    ) -> _ChunkPlan:
+        """新的 chunks 與現有 chunks 的 (id, chunk_index, sha256) 比對，不存取資料庫"""
+        hashes = [content_hash(chunk) for chunk in chunks]
+
+        # hash -> [(chunk_id, chunk_index)]，同內容可能出現多次
+        reusable: dict[str, list[tuple[str, int]]] = {}
+        for chunk_id, chunk_index, hash_ in existing:
+            reusable.setdefault(hash_, []).append((chunk_id, chunk_index))
+
+        plan = _ChunkPlan(document_id=str(document.id), owner_id=document.owner_id)
+        for index, (chunk_text, hash_) in enumerate(zip(chunks, hashes)):
+            candidates = reusable.get(hash_)
+            if candidates:
+                # 優先保留原本就在同一位置的 chunk，避免不必要的重新編號
+                position = next(
+                    (i for i, (_, old) in enumerate(candidates) if old == index), 0
+                )
+                chunk_id, old_index = candidates.pop(position)
+                if old_index != index:
+                    plan.renumbered.append({"id": chunk_id, "chunk_index": index})
+            else:
+                chunk_id = str(uuid4())
+                plan.to_insert.append((chunk_id, index, chunk_text))
+            plan.chunk_ids.append(chunk_id)
+
+        plan.stale_ids = [
+            chunk_id for candidates in reusable.values() for chunk_id, _ in candidates
+        ]
+        return plan
+
+    async def _update_document_embeddings(
+        self,
+        changed: list[tuple[_ChunkPlan, list[EmbeddingVector]]],
+    ) -> None:
+        """
+        重新計算並寫入文件層級嵌入：正規化後 chunk 向量的平均
+
+        ABP 對比：
+        var centroid = chunks.Select(c => Normalize(c.Embedding)).Average();
+        await _documentEmbeddingRepo.UpsertAsync(documentId, centroid);
+
+        changed 為 (計畫, 新 chunks 的向量)：新向量已在記憶體中，
+        保留下來的 chunks 的向量以一次查詢讀回，所有文件的重心以一次 upsert 寫入
+        """
+        kept_ids_by_plan: list[list[str]] = []
+        for plan, _ in changed:
+            inserted = {chunk_id for chunk_id, _, _ in plan.to_insert}
+            kept_ids_by_plan.append(
+                [chunk_id for chunk_id in plan.chunk_ids if chunk_id not in inserted]
+            )
+        kept_ids = [chunk_id for ids in kept_ids_by_plan for chunk_id in ids]
+        kept: dict[str, EmbeddingVector] = {}
+        if kept_ids:
+            result = await self._session.execute(
+                select(DocumentChunkModel.id, DocumentChunkModel.embedding).where(
+                    DocumentChunkModel.id.in_(kept_ids),
+                    DocumentChunkModel.embedding.is_not(None),
+                )
+            )
+            kept = {chunk_id: embedding for chunk_id, embedding in result}
+
+        rows: list[dict[str, Any]] = []
+        emptied: list[str] = []
+        for (plan, new_embeddings), plan_kept_ids in zip(changed, kept_ids_by_plan):
+            vectors = list(new_embeddings)
+            vectors.extend(kept[cid] for cid in plan_kept_ids if cid in kept)
+            if not vectors:
+                emptied.append(plan.document_id)
+                continue
+
+            rows.append(
+                {
+                    "document_id": plan.document_id,
+                    "owner_id": plan.owner_id,
+                    "embedding": document_centroid(vectors),
+                }
+            )
+
+        if emptied:
+            await self._session.execute(
+                delete(DocumentEmbeddingModel).where(
+                    DocumentEmbeddingModel.document_id.in_(emptied)
+                )
+            )
+        if rows:
+            stmt = insert(DocumentEmbeddingModel)
+            await self._session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[DocumentEmbeddingModel.document_id],
+                    set_={
+                        "embedding": stmt.excluded.embedding,
+                        "updated_at": func.now(),
+                    },
+                ),
+                rows,
+            )
+
+    async def _get_chunk_hashes(
+        self,
+        document_ids: list[str],
+    ) -> dict[str, list[tuple[str, int, str]]]:
+        """
+        取得文件現有 chunks 的 document_id -> [(id, chunk_index, sha256)]
+
+        雜湊在 PostgreSQL 端計算（sha256() 需要 PostgreSQL 11+），
+        與 Python 端的 content_hash() 結果一致
+        """
+        stmt = select(
+            DocumentChunkModel.document_id,
+            DocumentChunkModel.id,
+            DocumentChunkModel.chunk_index,
+            func.encode(
+                func.sha256(func.convert_to(DocumentChunkModel.content, "UTF8")),
+                "hex",
+            ),
+        ).where(DocumentChunkModel.document_id.in_(document_ids))
+        result = await self._session.execute(stmt)
+        hashes: dict[str, list[tuple[str, int, str]]] = {}
+        for document_id, chunk_id, chunk_index, hash_ in result:
+            hashes.setdefault(document_id, []).append((chunk_id, chunk_index, hash_))
+        return hashes
 
     async def delete_document(self, document_id: str) -> bool:
         """
-        從向量儲存刪除文件的所有 chunks
+        從向量儲存刪除文件的所有 chunks（與文件層級嵌入）
 
         ABP 對比：
         public async Task<bool> DeleteDocumentAsync(Guid documentId)
@@ -122,6 +462,11 @@ class VectorRepository(IVectorRepository):
             return count > 0;
         }
         """
+        await self._session.execute(
+            delete(DocumentEmbeddingModel).where(
+                DocumentEmbeddingModel.document_id == document_id
+            )
+        )
         result = await self._session.execute(
             delete(DocumentChunkModel).where(
                 DocumentChunkModel.document_id == document_id
@@ -131,10 +476,12 @@ class VectorRepository(IVectorRepository):
 
     async def search(
         self,
-        query_embedding: list[float],
+        query_embedding: EmbeddingVector,
         owner_id: str,
         limit: int = 10,
         threshold: float = 0.0,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[SearchResult]:
         """
         語意搜尋（使用預先計算的嵌入向量）
@@ -152,57 +499,386 @@ class VectorRepository(IVectorRepository):
         pgvector 相似度計算：
         - cosine_distance: 1 - cosine_similarity（越小越相似）
         - 我們轉換為 score: 1 - distance（越大越相似）
+        - 有 ANN 索引時為近似結果，召回率由 ef_search / probes 控制
+        - 只取回 document_id、距離與內容預覽（left(content, ...)），不傳回向量與完整內容
+        """
+        await self._model_guard.check_cached(self._session)
+        await self._tuner.apply(ef_search, probes)
+
+        # 使用 pgvector 的 cosine_distance 進行向量搜尋（每份文件只取最相近的 chunk）
+        # threshold 轉為距離上限，在 SQL 中過濾
+        max_distance = 1.0 - threshold if threshold > 0 else None
+        rows = await self._nearest_documents(
+            query_embedding, owner_id, limit, max_distance
+        )
+
+        results = [self._to_search_result(row) for row in rows]
+
+        return results
+
+    async def search_page(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        after: tuple[float, str] | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[tuple[float, SearchResult]]:
+        """
+        語意搜尋的一頁：依 (distance, chunk_id) 排序，回傳 [(distance, 結果)]
+
+        ABP 對比：
+        public async Task<List<SearchResultDto>> SearchPageAsync(...)
+        {
+            return await _context.DocumentChunks
+                .OrderBy(c => c.Embedding.CosineDistance(queryVector)).ThenBy(c => c.Id)
+                .Where(/* keyset: 排在 after 之後 */)
+                .Take(limit)
+                .ToListAsync();
+        }
+
+        - after 為上一頁最後一筆的 (distance, chunk_id)，None 表示第一頁
+        - distance 為 SQL 計算的原始值，作為 after 傳回時比較不會有浮點誤差
+        - 與 search 相同的策略（見 _nearest_documents）：
+          exact 每一頁都是同一次 owner 範圍掃描；ann 的候選從 cursor 之後開始取，
+          深頁的召回受 ef_search 限制（pgvector 0.8+ 的 iterative scan 會繼續掃描）
+        """
+        await self._model_guard.check_cached(self._session)
+        await self._tuner.apply(ef_search, probes)
+
+        max_distance = 1.0 - threshold if threshold > 0 else None
+        rows = await self._nearest_documents(
+            query_embedding, owner_id, limit, max_distance, after
+        )
+        return [(float(row[3]), self._to_search_result(row)) for row in rows]
+
+    def _to_search_result(self, row: tuple[str, str, str, float, str]) -> SearchResult:
+        document_id, chunk_id, preview, distance, title = row
+        return SearchResult(
+            document_id=document_id,
+            title=title,
+            content_preview=self._truncate(preview, _PREVIEW_LENGTH),
+            score=1.0 - float(distance),  # 轉換為相似度分數
+            chunk_id=chunk_id,
+        )
+
+    async def search_batch(
+        self,
+        query_embeddings: EmbeddingMatrix,
+        owner_id: str,
+        limits: list[int],
+        thresholds: list[float],
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[SearchResult]]:
+        """
+        批次語意搜尋：所有查詢在同一個語句中執行（LATERAL join）
+
+        ABP 對比：
+        public async Task<List<List<SearchResultDto>>> SearchManyAsync(...)
+        {
+            // EF Core 無法表達 LATERAL，改以 FromSqlRaw 執行：
+            // SELECT ... FROM (VALUES ...) AS queries
+            // CROSS JOIN LATERAL (/* 與 SearchAsync 相同的查詢 */) AS hits
+        }
+
+        SELECT queries.position, hits.*
+        FROM (VALUES (:position, :embedding::vector, :limit, ...), ...) AS queries
+        JOIN LATERAL (
+            每份文件最相近的 chunk（同 search，query 向量改為 queries.embedding）
+            ORDER BY distance LIMIT queries.result_limit
+        ) AS hits ON true
+
+        - 一次往返取得所有查詢的結果；每個查詢列仍各自使用 ANN 索引 / owner_id 索引
+        - ANN 時候選數固定為 limit * 倍數；文件數不足且候選數已滿的查詢，
+          再個別以 search 的方式擴大候選數重新查詢
+        """
+        if not limits:
+            return []
+
+        await self._model_guard.check_cached(self._session)
+        await self._tuner.apply(ef_search, probes)
+        strategy = await self._choose_search_strategy(owner_id)
+
+        dimension = settings.embedding_dimension
+        candidate_counts = [
+            min(limit * _CANDIDATE_MULTIPLIER, _MAX_CANDIDATES) for limit in limits
+        ]
+        max_distances = [
+            1.0 - threshold if threshold > 0 else None for threshold in thresholds
+        ]
+        queries = values(
+            column("position", Integer),
+            column("embedding", VECTOR(dimension)),
+            column("result_limit", Integer),
+            column("candidates", Integer),
+            column("max_distance", Float),
+            name="queries",
+        ).data(
+            [
+                (
+                    position,
+                    # 明確轉型：VALUES 中的參數不會依使用處推斷型別
+                    cast(
+                        literal(embedding, Float32Vector(dimension)), VECTOR(dimension)
+                    ),
+                    limit,
+                    candidates,
+                    # cosine 距離最大為 2，沒有門檻的查詢不會被過濾
+                    2.0 if max_distance is None else max_distance,
+                )
+                for position, (embedding, limit, candidates, max_distance) in enumerate(
+                    zip(query_embeddings, limits, candidate_counts, max_distances)
+                )
+            ]
+        )
+
+        best = self._best_chunks(
+            queries.c.embedding,
+            owner_id,
+            queries.c.candidates if strategy == "ann" else None,
+            # 所有查詢都沒有門檻時不加入距離條件
+            None if all(d is None for d in max_distances) else queries.c.max_distance,
+            correlate=queries,
+        )
+        hits = (
+            self._with_titles(best)
+            .order_by(best.c.distance)
+            .limit(queries.c.result_limit)
+            .lateral("hits")
+        )
+        stmt = (
+            select(queries.c.position, hits)
+            .select_from(queries)
+            .join(hits, true())
+            .order_by(queries.c.position, hits.c.distance)
+        )
+
+        connection = await self._session.connection()
+        rows: list[list[tuple[str, str, str, float, str]]] = [[] for _ in limits]
+        candidate_totals = [0] * len(limits)
+        for position, *row in await connection.execute(stmt):
+            document_id, chunk_id, preview, distance, candidate_count, title = row
+            rows[position].append((document_id, chunk_id, preview, distance, title))
+            candidate_totals[position] = candidate_count
+
+        results: list[list[SearchResult]] = []
+        for position, limit in enumerate(limits):
+            # 與 _nearest_documents 相同的條件：候選已滿但文件數不足時擴大候選數
+            if (
+                strategy == "ann"
+                and 0 < len(rows[position]) < limit
+                and candidate_totals[position] >= candidate_counts[position]
+                and candidate_counts[position] < _MAX_CANDIDATES
+            ):
+                rows[position] = await self._nearest_documents(
+                    query_embeddings[position], owner_id, limit, max_distances[position]
+                )
+            results.append([self._to_search_result(row) for row in rows[position]])
+        return results
+
+    async def hybrid_search(
+        self,
+        query_embedding: EmbeddingVector,
+        query_text: str,
+        owner_id: str,
+        limit: int = 10,
+        threshold: float = 0.0,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SearchResult]:
         """
-        # 使用 pgvector 的 cosine_distance 進行向量搜尋
+        混合搜尋：向量排名 + 全文檢索排名，以 RRF 合併
+
+        ABP 對比：
+        public async Task<List<SearchResultDto>> HybridSearchAsync(...)
+        {
+            var vectorHits = _context.DocumentChunks
+                .OrderBy(c => c.Embedding.CosineDistance(queryVector)).Take(depth);
+            var lexicalHits = _context.DocumentChunks
+                .Where(c => c.ContentTsv.Matches(EF.Functions.WebSearchToTsQuery(query)))
+                .OrderByDescending(c => c.ContentTsv.RankCoverDensity(...)).Take(depth);
+            return Fuse(vectorHits, lexicalHits);  // reciprocal rank fusion
+        }
+
+        WITH vector AS (每份文件最相近的 chunk，依距離排名，取前 depth 名),
+             lexical AS (每份文件 ts_rank_cd 最高的 chunk，依分數排名，取前 depth 名)
+        SELECT ..., coalesce(1 / (k + vector.rank), 0)
+                  + coalesce(1 / (k + lexical.rank), 0) AS score
+        FROM vector FULL OUTER JOIN lexical USING (document_id)
+        ORDER BY score DESC
+
+        - 兩組候選在同一個語句中計算並合併，只需一次往返
+          （同一個 AsyncSession 無法同時執行兩個語句）
+        - 關鍵字部分使用 websearch_to_tsquery（支援 "片語"、OR、-排除）與 GIN 索引
+        - threshold 只過濾向量候選；只靠關鍵字命中的文件仍會出現在結果中
+        - score 為 RRF 分數，只用於排序
+        """
+        await self._model_guard.check_cached(self._session)
+        await self._tuner.apply(ef_search, probes)
+
+        depth = limit * _CANDIDATE_MULTIPLIER
+        max_distance = 1.0 - threshold if threshold > 0 else None
+        strategy = await self._choose_search_strategy(owner_id)
+
+        # 1. 向量候選：ANN 時先取固定數量的 chunks，再去重複成文件
+        candidates = (
+            min(depth * _CANDIDATE_MULTIPLIER, _MAX_CANDIDATES)
+            if strategy == "ann"
+            else None
+        )
+        best = self._best_chunks(query_embedding, owner_id, candidates, max_distance)
+        vector = (
+            select(
+                best.c.document_id,
+                best.c.chunk_id,
+                best.c.preview,
+                func.row_number().over(order_by=best.c.distance).label("rank"),
+            )
+            .order_by(best.c.distance)
+            .limit(depth)
+            .cte("vector")
+        )
+
+        # 2. 關鍵字候選：content_tsv @@ tsquery（GIN 索引）
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query_text)
+        text_rank = func.ts_rank_cd(DocumentChunkModel.content_tsv, tsquery)
+        matches = (
+            select(
+                DocumentChunkModel.document_id,
+                DocumentChunkModel.id.label("chunk_id"),
+                func.left(DocumentChunkModel.content, _PREVIEW_LENGTH + 1).label(
+                    "preview"
+                ),
+                text_rank.label("text_rank"),
+            )
+            .where(
+                DocumentChunkModel.owner_id == owner_id,
+                DocumentChunkModel.content_tsv.bool_op("@@")(tsquery),
+            )
+            .distinct(DocumentChunkModel.document_id)
+            .order_by(DocumentChunkModel.document_id, text_rank.desc())
+            .subquery("matches")
+        )
+        text_order = (matches.c.text_rank.desc(), matches.c.document_id)
+        lexical = (
+            select(
+                matches.c.document_id,
+                matches.c.chunk_id,
+                matches.c.preview,
+                func.row_number().over(order_by=text_order).label("rank"),
+            )
+            .order_by(*text_order)
+            .limit(depth)
+            .cte("lexical")
+        )
+
+        # 3. RRF 合併（任一邊沒有命中時該項為 0）
+        document_id = func.coalesce(vector.c.document_id, lexical.c.document_id)
+        score = (
+            func.coalesce(1.0 / (_RRF_K + vector.c.rank), 0.0)
+            + func.coalesce(1.0 / (_RRF_K + lexical.c.rank), 0.0)
+        ).label("score")
         stmt = (
             select(
-                DocumentChunkModel,
+                document_id.label("document_id"),
+                func.coalesce(vector.c.chunk_id, lexical.c.chunk_id).label("chunk_id"),
+                func.coalesce(vector.c.preview, lexical.c.preview).label("preview"),
+                score,
                 DocumentModel.title,
-                DocumentChunkModel.embedding.cosine_distance(query_embedding).label(
-                    "distance"
-                ),
             )
-            .join(DocumentModel)
-            .where(DocumentModel.owner_id == owner_id)
-            .order_by("distance")
-            .limit(limit * 2)  # 取多一些，因為要去重複
+            .select_from(
+                vector.join(
+                    lexical,
+                    vector.c.document_id == lexical.c.document_id,
+                    full=True,
+                )
+            )
+            .join(DocumentModel, DocumentModel.id == document_id)
+            .order_by(score.desc(), document_id)
+            .limit(limit)
         )
 
-        result = await self._session.execute(stmt)
-        rows = result.all()
+        connection = await self._session.connection()
+        return [
+            SearchResult(
+                document_id=result_id,
+                title=title,
+                content_preview=self._truncate(preview, _PREVIEW_LENGTH),
+                score=float(score),
+                chunk_id=chunk_id,
+            )
+            for result_id, chunk_id, preview, score, title in await connection.execute(
+                stmt
+            )
+        ]
 
-        # 轉換為 SearchResult 並去重複（同一文件可能有多個 chunk）
-        seen_docs: set[str] = set()
-        results: list[SearchResult] = []
+    async def range_search(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        threshold: float,
+        limit: int = 100,
+        after: tuple[float, str] | None = None,
+    ) -> list[SearchResult]:
+        """
+        範圍搜尋：相似度 >= threshold 的所有文件，依分數分頁
 
-        for chunk, title, distance in rows:
-            if chunk.document_id in seen_docs:
-                continue
+        ABP 對比：
+        public async Task<List<SearchResultDto>> RangeSearchAsync(...)
+        {
+            return await _context.DocumentChunks
+                .Where(c => c.Embedding.CosineDistance(queryVector) <= 1 - threshold)
+                .OrderByDescending(...).ThenBy(x => x.DocumentId)
+                .Where(/* keyset: 排在 after 之後 */)
+                .Take(limit)
+                .ToListAsync();
+        }
 
-            score = 1.0 - float(distance)  # 轉換為相似度分數
-            if score < threshold:
-                continue
+        - 一律精確搜尋：ANN 索引無法保證列出「所有」超過門檻的文件
+        - keyset 分頁：排序鍵為 (score DESC, document_id)，after 為上一頁最後一筆
+        - score 在 SQL 中計算並原樣傳回，作為 after 傳入時的比較不會有浮點誤差
+        """
+        await self._model_guard.check_cached(self._session)
+        best = self._best_chunks(query_embedding, owner_id, None, 1.0 - threshold)
+        score = 1 - best.c.distance
 
-            seen_docs.add(chunk.document_id)
-            results.append(
-                SearchResult(
-                    document_id=chunk.document_id,
-                    title=title,
-                    content_preview=self._truncate(chunk.content, 200),
-                    score=score,
+        stmt = select(
+            best.c.document_id,
+            best.c.preview,
+            score.label("score"),
+            DocumentModel.title,
+        ).join(DocumentModel, DocumentModel.id == best.c.document_id)
+        if after is not None:
+            after_score, after_id = after
+            stmt = stmt.where(
+                or_(
+                    score < after_score,
+                    and_(score == after_score, best.c.document_id > after_id),
                 )
             )
+        stmt = stmt.order_by(score.desc(), best.c.document_id).limit(limit)
 
-            if len(results) >= limit:
-                break
-
-        return results
+        connection = await self._session.connection()
+        return [
+            SearchResult(
+                document_id=document_id,
+                title=title,
+                content_preview=self._truncate(preview, _PREVIEW_LENGTH),
+                score=score,
+            )
+            for document_id, preview, score, title in await connection.execute(stmt)
+        ]
 
     async def find_similar(
         self,
         document_id: str,
         owner_id: str,
         limit: int = 5,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[SimilarDocument]:
         """
         找出相似文件
@@ -210,73 +886,273 @@ class VectorRepository(IVectorRepository):
         ABP 對比：
         public async Task<List<SimilarDocumentDto>> FindSimilarAsync(...)
         {
-            // 1. 取得文件的第一個 chunk 嵌入
-            var sourceChunk = await _chunkRepo.FirstOrDefaultAsync(
-                x => x.DocumentId == documentId);
-
-            // 2. 搜尋相似的 chunks（排除自己）
-            var similar = await _context.DocumentChunks
-                .Where(c => c.DocumentId != documentId)
-                .OrderBy(c => c.Embedding.CosineDistance(sourceChunk.Embedding))
+            // 1. 取得文件層級嵌入（chunk 向量的重心）
+            var source = await _documentEmbeddingRepo.GetAsync(documentId);
+
+            // 2. 在文件層級搜尋相似的文件（排除自己）
+            var similar = await _context.DocumentEmbeddings
+                .Where(d => d.OwnerId == ownerId && d.DocumentId != documentId)
+                .OrderBy(d => d.Embedding.CosineDistance(source.Embedding))
                 .Take(limit)
                 .ToListAsync();
         }
+
+        以整份文件的重心代表文件（而非第一個 chunk），
+        並且只在 document_embeddings 上做一次 kNN，成本與文件數而非 chunks 數相關
         """
-        # 1. 取得來源文件的第一個 chunk
-        source_stmt = (
-            select(DocumentChunkModel)
-            .where(DocumentChunkModel.document_id == document_id)
-            .order_by(DocumentChunkModel.chunk_index)
-            .limit(1)
+        # 1. 取得來源文件的文件層級嵌入
+        source_embedding = await self._session.scalar(
+            select(DocumentEmbeddingModel.embedding).where(
+                DocumentEmbeddingModel.document_id == document_id
+            )
         )
-        source_result = await self._session.execute(source_stmt)
-        source_chunk = source_result.scalar_one_or_none()
 
-        if not source_chunk:
+        if source_embedding is None:
             return []
 
         # 2. 搜尋相似的文件（排除自己）
-        stmt = (
+        await self._model_guard.check_cached(self._session)
+        await self._tuner.apply(ef_search, probes)
+        distance = DocumentEmbeddingModel.embedding.cosine_distance(source_embedding)
+        strategy = await self._choose_search_strategy(owner_id)
+        # 小型使用者精確搜尋：ORDER BY 運算式不是「欄位 <=> 常數」時不會使用 ANN 索引
+        order_by = distance + 0 if strategy == "exact" else distance
+
+        similar = (
             select(
-                DocumentChunkModel,
-                DocumentModel.title,
-                DocumentChunkModel.embedding.cosine_distance(
-                    source_chunk.embedding
-                ).label("distance"),
+                DocumentEmbeddingModel.document_id,
+                distance.label("distance"),
             )
-            .join(DocumentModel)
             .where(
-                DocumentModel.owner_id == owner_id,
-                DocumentChunkModel.document_id != document_id,
+                DocumentEmbeddingModel.owner_id == owner_id,
+                DocumentEmbeddingModel.document_id != document_id,
             )
-            .order_by("distance")
-            .limit(limit * 2)
+            .order_by(order_by)
+            .limit(limit)
+        )
+        if strategy == "ann" and settings.vector_storage != "vector":
+            # 精簡索引取出候選，再以完整精度的距離排序
+            shortlist = _shortlist(
+                DocumentEmbeddingModel.document_id,
+                DocumentEmbeddingModel.embedding,
+                source_embedding,
+                limit,
+                DocumentEmbeddingModel.owner_id == owner_id,
+                DocumentEmbeddingModel.document_id != document_id,
+            )
+            similar = similar.join(
+                shortlist, shortlist.c.id == DocumentEmbeddingModel.document_id
+            )
+        nearest = similar.subquery("nearest")
+        stmt = (
+            select(nearest.c.document_id, nearest.c.distance, DocumentModel.title)
+            .join(DocumentModel, DocumentModel.id == nearest.c.document_id)
+            .order_by(nearest.c.distance)
         )
 
-        result = await self._session.execute(stmt)
-        rows = result.all()
+        connection = await self._session.connection()
+        return [
+            SimilarDocument(
+                document_id=similar_id,
+                title=title,
+                similarity_score=1.0 - float(distance),
+            )
+            for similar_id, distance, title in await connection.execute(stmt)
+        ]
 
-        # 去重複
-        seen_docs: set[str] = set()
-        results: list[SimilarDocument] = []
+    async def _nearest_documents(
+        self,
+        query_embedding: EmbeddingVector,
+        owner_id: str,
+        limit: int,
+        max_distance: float | None = None,
+        after: tuple[float, str] | None = None,
+    ) -> list[tuple[str, str, str, float, str]]:
+        """
+        依 owner 過濾的 kNN 文件：每份文件取最相近的 chunk，
+        回傳最多 limit 筆 (document_id, chunk_id, preview, distance, title)
 
-        for chunk, title, distance in rows:
-            if chunk.document_id in seen_docs:
-                continue
+        去重複在 PostgreSQL 端完成（DISTINCT ON document_id），
+        同一文件的其他 chunks 不會傳回應用程式，也不會佔掉 limit 的名額；
+        max_distance（= 1 - threshold）同樣在 SQL 中過濾
+
+        策略依使用者的 chunks 數決定（見 _choose_search_strategy）：
+        - exact: 以 owner_id 索引取出該使用者所有 chunks，結果精確
+        - ann: 先由 ANN 索引取出候選 chunks 再去重複；
+          候選數已滿但文件數不足 limit 時，擴大候選數重新查詢
+
+        after（分頁）：只回傳 (distance, chunk_id) 排在 after 之後的文件；
+        文件以最相近的 chunk 為準，去重複之後才比較，前面頁出現過的文件不會重複出現
+        """
+        strategy = await self._choose_search_strategy(owner_id)
+        # 熱路徑：直接以 Core 連線執行，只取回 tuple，不經過 ORM 的結果處理與 identity map
+        connection = await self._session.connection()
+        if strategy == "exact":
+            best = self._best_chunks(query_embedding, owner_id, None, max_distance)
+            stmt = self._page(best, limit, after)
+            return [_without_count(row) for row in await connection.execute(stmt)]
+
+        candidates = limit * _CANDIDATE_MULTIPLIER
+        while True:
+            best = self._best_chunks(
+                query_embedding, owner_id, candidates, max_distance, after=after
+            )
+            stmt = self._page(best, limit, after, query_embedding)
+            rows = (await connection.execute(stmt)).all()
+            # candidate_count < candidates：符合條件的 chunks 已全部在候選內，擴大也沒用
+            if (
+                len(rows) >= limit
+                or not rows
+                or rows[0].candidate_count < candidates
+                or candidates >= _MAX_CANDIDATES
+            ):
+                return [_without_count(row) for row in rows]
+            candidates = min(candidates * _CANDIDATE_MULTIPLIER, _MAX_CANDIDATES)
 
-            seen_docs.add(chunk.document_id)
-            results.append(
-                SimilarDocument(
-                    document_id=chunk.document_id,
-                    title=title,
-                    similarity_score=1.0 - float(distance),
+    def _best_chunks(
+        self,
+        query_embedding: EmbeddingVector | ColumnElement[Any],
+        owner_id: str,
+        candidates: int | ColumnElement[int] | None,
+        max_distance: float | ColumnElement[float] | None,
+        correlate: FromClause | None = None,
+        after: tuple[float, str] | None = None,
+    ) -> Subquery:
+        """
+        每份文件最相近的 chunk（document_id, chunk_id, preview, distance, candidate_count）
+
+        SELECT DISTINCT ON (document_id) *, count(*) OVER () AS candidate_count
+        FROM (
+            SELECT document_id, id AS chunk_id, left(content, ...) AS preview, distance
+            FROM document_chunks
+            WHERE owner_id = :owner [AND distance <= :max_distance]
+            [ORDER BY distance LIMIT :candidates]
+        ) AS candidates
+        ORDER BY document_id, distance
+
+        candidates 為 None 時不限制候選數（精確搜尋）：
+        內層沒有 ORDER BY distance LIMIT，planner 不會使用 ANN 索引
+
+        VECTOR_STORAGE 為 halfvec / binary 時，候選來自精簡索引的
+        candidates * oversampling 筆，再以完整精度的距離取前 candidates 筆
+
+        批次搜尋時 query_embedding / candidates / max_distance 為外層查詢列的欄位，
+        correlate 為該查詢列的 FROM（放在 LATERAL 中，每個查詢列各執行一次）
+
+        after（分頁，只用於有候選數限制時）：候選直接從 (distance, chunk_id) 排在
+        after 之後的 chunks 開始取（仍是 ORDER BY distance LIMIT，可使用 ANN 索引）；
+        精確搜尋不需要，由呼叫端在去重複之後比較（見 _page）
+        """
+        distance = DocumentChunkModel.embedding.cosine_distance(query_embedding)
+        conditions = [DocumentChunkModel.owner_id == owner_id]
+        if max_distance is not None:
+            conditions.append(distance <= max_distance)
+
+        keyset: list[ColumnElement[bool]] = []
+        if after is not None and candidates is not None:
+            keyset = [_is_after(distance, DocumentChunkModel.id, after)]
+            conditions.extend(keyset)
+
+        chunks = select(
+            DocumentChunkModel.document_id,
+            DocumentChunkModel.id.label("chunk_id"),
+            # 只傳回預覽需要的前幾個字元（多取 1 個字元以判斷是否需要截斷）
+            func.left(DocumentChunkModel.content, _PREVIEW_LENGTH + 1).label("preview"),
+            distance.label("distance"),
+        ).where(*conditions)
+        if candidates is not None:
+            if settings.vector_storage != "vector":
+                shortlist = _shortlist(
+                    DocumentChunkModel.id,
+                    DocumentChunkModel.embedding,
+                    query_embedding,
+                    candidates,
+                    DocumentChunkModel.owner_id == owner_id,
+                    *keyset,
+                    correlate=correlate,
                 )
+                chunks = chunks.join(shortlist, shortlist.c.id == DocumentChunkModel.id)
+            chunks = chunks.order_by(distance).limit(candidates)
+        if correlate is not None:
+            chunks = chunks.correlate(correlate)
+        chunk_rows = chunks.subquery("candidates")
+
+        return (
+            select(chunk_rows, func.count().over().label("candidate_count"))
+            .distinct(chunk_rows.c.document_id)
+            .order_by(
+                chunk_rows.c.document_id, chunk_rows.c.distance, chunk_rows.c.chunk_id
             )
+            .subquery("best")
+        )
 
-            if len(results) >= limit:
-                break
+    def _page(
+        self,
+        best: Subquery,
+        limit: int,
+        after: tuple[float, str] | None,
+        query_embedding: EmbeddingVector | None = None,
+    ) -> Select[tuple[str, str, str, float, int, str]]:
+        """
+        依 (distance, chunk_id) 排序取前 limit 筆，after 不為 None 時從其後開始
 
-        return results
+        query_embedding 不為 None 時（ANN 的候選已從 after 之後開始取），
+        另外排除有 chunk 排在 after 之前的文件：這些文件已出現在前面的頁。
+        只對去重複後的少量文件檢查（document_id 索引），不影響候選的 ANN 索引掃描
+        """
+        stmt = self._with_titles(best)
+        if after is not None:
+            stmt = stmt.where(_is_after(best.c.distance, best.c.chunk_id, after))
+            if query_embedding is not None:
+                earlier = aliased(DocumentChunkModel)
+                stmt = stmt.where(
+                    ~exists().where(
+                        earlier.document_id == best.c.document_id,
+                        ~_is_after(
+                            earlier.embedding.cosine_distance(query_embedding),
+                            earlier.id,
+                            after,
+                        ),
+                    )
+                )
+        return stmt.order_by(best.c.distance, best.c.chunk_id).limit(limit)
+
+    @staticmethod
+    def _with_titles(
+        best: Subquery,
+    ) -> Select[tuple[str, str, str, float, int, str]]:
+        """只對最後的結果 join documents 取得標題"""
+        return select(best, DocumentModel.title).join(
+            DocumentModel, DocumentModel.id == best.c.document_id
+        )
+
+    async def _choose_search_strategy(self, owner_id: str) -> str:
+        """
+        依使用者的 chunks 數選擇搜尋策略
+
+        - 小型使用者：ANN 索引掃描後大部分的列都會被 owner 過濾掉，
+          精確搜尋只需掃描自己的 chunks，反而更快且不會少結果
+        - 大型使用者：精確搜尋的成本與 chunks 數成正比，改走 ANN 索引
+        """
+        if settings.vector_index_type == "none":
+            return "exact"
+
+        size = _tenant_sizes.get(owner_id)
+        if size is None:
+            # 只數到門檻 + 1 筆，成本不會隨大型使用者的資料量成長
+            cap = settings.vector_exact_search_max_chunks + 1
+            capped = (
+                select(literal(1))
+                .where(DocumentChunkModel.owner_id == owner_id)
+                .limit(cap)
+                .subquery()
+            )
+            size = await self._session.scalar(select(func.count()).select_from(capped))
+            _tenant_sizes.set(owner_id, size or 0)
+
+        return (
+            "exact" if (size or 0) <= settings.vector_exact_search_max_chunks else "ann"
+        )
 
     async def get_document_chunks(
         self,
@@ -310,67 +1186,77 @@ class VectorRepository(IVectorRepository):
             for m in models
         ]
 
-    def _chunk_text(self, text: str) -> list[str]:
+    async def get_chunk_contents(self, chunk_ids: list[str]) -> dict[str, str]:
         """
-        將文本分塊
+        依 id 取得 chunks 的完整內容（chunk_id -> content）
 
         ABP 對比：
-        private List<string> ChunkText(string text)
-        {
-            // ABP 可能會抽取到獨立的 ITextChunker 服務
-            // 使用 Semantic Kernel 或自訂實作
+        return await _chunkRepo.Where(x => chunkIds.Contains(x.Id))
+            .ToDictionaryAsync(x => x.Id, x => x.Content);
+        """
+        if not chunk_ids:
+            return {}
+
+        stmt = select(DocumentChunkModel.id, DocumentChunkModel.content).where(
+            DocumentChunkModel.id.in_(chunk_ids)
+        )
+        connection = await self._session.connection()
+        return {
+            chunk_id: content for chunk_id, content in await connection.execute(stmt)
         }
 
-        策略：
-        - 按句子邊界分割
-        - 每塊約 chunk_size 字元
-        - chunk_overlap 字元重疊（提高語意連貫性）
+    async def _embed_chunks(self, chunks: list[str]) -> list[EmbeddingVector]:
         """
-        if not text or not text.strip():
-            return []
+        取得 chunks 的嵌入向量，優先使用持久化的內容雜湊快取
 
-        # 按句子分割（中英文句號、問號、驚嘆號）
-        sentences = re.split(r"(?<=[。！？.!?])\s*", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        ABP 對比：
+        - ABP 可能以 IDistributedCache<EmbeddingCacheItem> 實作
+        - 這裡使用資料表，重新索引與重新匯入時只嵌入真正變更的內容
 
-        if not sentences:
-            return []
+        流程：
+        1. 計算每個 chunk 的 sha256，一次查出所有命中
+        2. 只把未命中（且不重複）的文本送進模型
+        3. 把新的嵌入寫回快取
+        """
+        if not settings.embedding_cache_enabled:
+            return list(await self._embedding.aembed(chunks))
+
+        model_name = self._embedding.model_name
+        hashes = [content_hash(chunk) for chunk in chunks]
+        cached = await self._embedding_cache.get_many(model_name, list(set(hashes)))
+
+        # 未命中的 chunk（相同內容只嵌入一次）
+        misses = {
+            hash_: chunk for hash_, chunk in zip(hashes, chunks) if hash_ not in cached
+        }
+        if misses:
+            vectors = await self._embedding.aembed(list(misses.values()))
+            computed = dict(zip(misses.keys(), vectors))
+            await self._embedding_cache.put_many(model_name, computed)
+            cached.update(computed)
+
+        return [cached[hash_] for hash_ in hashes]
+
+    def _chunk_documents(self, documents: list[Document]) -> list[list[str]]:
+        """
+        依各文件的分塊方式將 title + content 分塊（同步，在 worker thread 中執行）
 
-        chunks: list[str] = []
-        current_chunk: list[str] = []
-        current_length = 0
-
-        for sentence in sentences:
-            sentence_length = len(sentence)
-
-            if current_length + sentence_length > settings.chunk_size:
-                if current_chunk:
-                    chunks.append(" ".join(current_chunk))
-
-                    # 重疊：保留最後幾個句子
-                    overlap_text = " ".join(current_chunk)
-                    if len(overlap_text) > settings.chunk_overlap:
-                        # 從後面取重疊部分
-                        current_chunk = []
-                        overlap_length = 0
-                        for s in reversed(current_chunk):
-                            if overlap_length + len(s) > settings.chunk_overlap:
-                                break
-                            current_chunk.insert(0, s)
-                            overlap_length += len(s)
-                        current_length = overlap_length
-                    else:
-                        current_chunk = []
-                        current_length = 0
-
-            current_chunk.append(sentence)
-            current_length += sentence_length
-
-        # 最後一塊
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-
-        return chunks
+        ABP 對比：
+        private List<List<string>> ChunkDocuments(List<Document> documents)
+        {
+            return documents
+                .Select(d => _chunkerProvider.Get(d.ChunkingStrategy).Chunk(d.Text).ToList())
+                .ToList();
+        }
+        """
+        return [
+            list(
+                get_text_chunker(doc.chunking_strategy).chunk(
+                    f"{doc.title}\n\n{doc.content}"
+                )
+            )
+            for doc in documents
+        ]
 
     def _truncate(self, text: str, max_length: int) -> str:
         """截斷文本並加省略號"""
@@ -0,0 +1,60 @@
+"""
+資料庫結構版本檢查（Alembic）
+
+ABP 對比：
+- ABP: DbMigrator 專案執行 migration，應用程式本身不修改資料庫結構
+- Python: 啟動時比對 alembic_version 與 migration 腳本的 head，不一致時拒絕啟動
+
+設計說明：
+- 資料庫結構只由 Alembic 建立與升級（alembic upgrade head），
+  Base.metadata.create_all 不會為既有資料表新增欄位，也不會建立 migration 中的索引
+- 升級到新版本卻沒有執行 migration 時，缺少的欄位要到查詢時才會失敗，
+  這裡在啟動時就以明確的訊息失敗
+- DATABASE_AUTO_MIGRATE 時啟動前先升級（適合單一行程的開發環境；
+  多個 replica 應由部署流程執行一次 alembic upgrade head）
+"""
+
+import asyncio
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+_MIGRATIONS = Path(__file__).parent / "migrations"
+
+
+def _alembic_config() -> Config:
+    """與 alembic.ini 相同的 script_location（不依賴工作目錄）"""
+    config = Config()
+    config.set_main_option("script_location", str(_MIGRATIONS))
+    return config
+
+
+def _current_revisions(connection: Connection) -> set[str]:
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+async def check_schema_revision(connection: AsyncConnection) -> None:
+    """資料庫必須已升級到 migration 腳本的 head，否則拋出 RuntimeError"""
+    heads = set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+    current = await connection.run_sync(_current_revisions)
+    if current == heads:
+        return
+    raise RuntimeError(
+        f"Database schema is at {', '.join(sorted(current)) or 'no revision'} "
+        f"but the code requires {', '.join(sorted(heads))}; "
+        "run `alembic upgrade head` (or set DATABASE_AUTO_MIGRATE=true)"
+    )
+
+
+async def upgrade_schema() -> None:
+    """
+    執行 alembic upgrade head
+
+    migrations/env.py 以 asyncio.run 連線，因此在另一個 thread 中執行
+    """
+    await asyncio.to_thread(command.upgrade, _alembic_config(), "head")
@@ -0,0 +1,150 @@
+"""
+影子向量欄位（全庫重新嵌入用）
+
+ABP 對比：
+- ABP: 通常以新的資料表 + 部署時切換連線字串或 DbContext 設定
+- Python: 同一資料表上的影子欄位，切換時在單一交易中改名
+
+設計說明：
+- 重新嵌入期間新向量寫入 embedding_next，線上搜尋與索引仍只讀寫 embedding
+- ANN 索引以 CONCURRENTLY 建在 embedding_next 上，切換前就已建好
+- 切換在持有 ACCESS EXCLUSIVE 鎖的交易中改名欄位與索引（只改 catalog），
+  其他交易看到的不是全部舊向量就是全部新向量
+- 舊欄位改名為 embedding_previous 保留到下一次切換或 cleanup
+- document_embeddings.embedding_next_source 記錄計算重心時該列的 updated_at，
+  線上寫入會更新 updated_at，兩者不同即表示重心需要重新計算
+"""
+
+from sqlalchemy import DateTime, String, Text, column, table
+
+from src.infrastructure.persistence.types import Float32Vector
+from src.infrastructure.persistence.vector_index import (
+    CHUNK_EMBEDDING_INDEX,
+    DOCUMENT_EMBEDDING_INDEX,
+    VECTOR_STORAGE_MODES,
+    create_vector_index_sql,
+    drop_vector_index_sql,
+    vector_index_name,
+)
+
+SHADOW_COLUMN = "embedding_next"
+
+SHADOW_SOURCE_COLUMN = "embedding_next_source"
+
+PREVIOUS_COLUMN = "embedding_previous"
+
+# (資料表, 現有 ANN 索引名稱)
+_VECTOR_TABLES = (
+    ("document_chunks", CHUNK_EMBEDDING_INDEX),
+    ("document_embeddings", DOCUMENT_EMBEDDING_INDEX),
+)
+
+# 只宣告重新嵌入需要的欄位（ORM 模型上沒有影子欄位）
+shadow_chunks = table(
+    "document_chunks",
+    column("id", String),
+    column("document_id", String),
+    column("content", Text),
+    column(SHADOW_COLUMN, Float32Vector()),
+)
+
+shadow_document_embeddings = table(
+    "document_embeddings",
+    column("document_id", String),
+    column("updated_at", DateTime(timezone=True)),
+    column(SHADOW_COLUMN, Float32Vector()),
+    column(SHADOW_SOURCE_COLUMN, DateTime(timezone=True)),
+)
+
+
+def _shadow_index_name(name: str, storage: str) -> str:
+    return vector_index_name(f"{name}_next", storage)
+
+
+def add_shadow_columns_sql(dimension: int) -> list[str]:
+    """新增可為 NULL、沒有預設值的欄位只改 catalog，不重寫資料表"""
+    dimension = int(dimension)
+    return [
+        f"ALTER TABLE {name} ADD COLUMN IF NOT EXISTS {SHADOW_COLUMN} vector({dimension})"
+        for name, _ in _VECTOR_TABLES
+    ] + [
+        (
+            f"ALTER TABLE document_embeddings "
+            f"ADD COLUMN IF NOT EXISTS {SHADOW_SOURCE_COLUMN} timestamptz"
+        )
+    ]
+
+
+def drop_shadow_columns_sql() -> list[str]:
+    """放棄重新嵌入：欄位上的索引隨欄位一併刪除"""
+    return [
+        f"ALTER TABLE {name} DROP COLUMN IF EXISTS {SHADOW_COLUMN}"
+        for name, _ in _VECTOR_TABLES
+    ] + [
+        f"ALTER TABLE document_embeddings DROP COLUMN IF EXISTS {SHADOW_SOURCE_COLUMN}"
+    ]
+
+
+def create_shadow_indexes_sql(storage: str) -> list[str]:
+    """
+    在影子欄位上建立 ANN 索引（CONCURRENTLY，不在交易中執行）
+
+    先刪除同名索引：上次建置中斷時留下的是 INVALID 索引，IF NOT EXISTS 會直接略過它；
+    索引運算式的維度取自目前（新模型）的 EMBEDDING_DIMENSION
+    """
+    statements: list[str] = []
+    for name, index in _VECTOR_TABLES:
+        sql = create_vector_index_sql(
+            table=name,
+            column=SHADOW_COLUMN,
+            name=f"{index}_next",
+            storage=storage,
+        )
+        if sql is None:
+            continue
+        statements.append(drop_vector_index_sql(_shadow_index_name(index, storage)))
+        statements.append(sql)
+    return statements
+
+
+def switch_columns_sql(storage: str) -> list[str]:
+    """
+    切換：影子欄位與其索引改名為 embedding 與原本的索引名稱（在同一個交易中執行）
+
+    ABP 對比：
+    migrationBuilder.RenameColumn("Embedding", "EmbeddingPrevious");
+    migrationBuilder.RenameColumn("EmbeddingNext", "Embedding");
+
+    - 上一次切換留下的 embedding_previous 先刪除
+    - 舊欄位的 ANN 索引刪除（各種儲存精度），舊欄位改為可 NULL，新寫入的列不會填它
+    """
+    statements: list[str] = []
+    for name, index in _VECTOR_TABLES:
+        statements.append(f"ALTER TABLE {name} DROP COLUMN IF EXISTS {PREVIOUS_COLUMN}")
+        statements.extend(
+            drop_vector_index_sql(vector_index_name(index, mode), concurrently=False)
+            for mode in VECTOR_STORAGE_MODES
+        )
+        statements += [
+            f"ALTER TABLE {name} RENAME COLUMN embedding TO {PREVIOUS_COLUMN}",
+            f"ALTER TABLE {name} ALTER COLUMN {PREVIOUS_COLUMN} DROP NOT NULL",
+            f"ALTER TABLE {name} RENAME COLUMN {SHADOW_COLUMN} TO embedding",
+            (
+                f"ALTER INDEX IF EXISTS {_shadow_index_name(index, storage)} "
+                f"RENAME TO {vector_index_name(index, storage)}"
+            ),
+        ]
+    statements += [
+        f"ALTER TABLE document_embeddings DROP COLUMN {SHADOW_SOURCE_COLUMN}",
+        # 與 DocumentEmbeddingModel 一致（切換前已確認沒有 NULL）
+        "ALTER TABLE document_embeddings ALTER COLUMN embedding SET NOT NULL",
+    ]
+    return statements
+
+
+def drop_previous_columns_sql() -> list[str]:
+    """確認新向量沒有問題後，刪除切換前的向量（只改 catalog，空間由 VACUUM 回收）"""
+    return [
+        f"ALTER TABLE {name} DROP COLUMN IF EXISTS {PREVIOUS_COLUMN}"
+        for name, _ in _VECTOR_TABLES
+    ]
@@ -0,0 +1,83 @@
+"""
+pgvector 的 float32 / 二進位傳輸型別
+
+ABP 對比：
+- ABP: EF Core 的 ValueConverter + Npgsql 的 pgvector 型別對應
+- Python: 自訂 SQLAlchemy 型別 + asyncpg 二進位 codec
+
+設計說明：
+- pgvector.sqlalchemy.Vector 預設以文字格式傳輸（"[0.1,0.2,...]"），
+  寫入時每個 float 都要轉成字串，讀取時再解析成 Python float 物件
+- 這裡改用 pgvector 的二進位格式：
+  寫入時 numpy float32 陣列直接轉成 big-endian bytes，
+  讀取時以 np.frombuffer 解碼，不會產生任何 Python float 物件
+"""
+
+import struct
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy.engine import Dialect
+
+# pgvector 二進位格式：uint16 維度 + uint16 保留欄位 + big-endian float32 陣列
+_HEADER = struct.Struct(">HH")
+_WIRE_DTYPE = np.dtype(">f4")
+
+
+def encode_vector(value: Any) -> bytes:
+    """numpy 陣列（或任何 array-like）→ pgvector 二進位格式"""
+    array = np.asarray(value, dtype=_WIRE_DTYPE)
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-D vector, got shape {array.shape}")
+    return _HEADER.pack(array.shape[0], 0) + array.tobytes()
+
+
+def decode_vector(data: bytes) -> NDArray[np.float32]:
+    """pgvector 二進位格式 → float32 numpy 陣列"""
+    dim, _ = _HEADER.unpack_from(data)
+    wire = np.frombuffer(data, dtype=_WIRE_DTYPE, count=dim, offset=_HEADER.size)
+    # 轉為本機位元組序，之後的運算不需要再做 byteswap
+    return wire.astype(np.float32)
+
+
+async def register_vector_codecs(connection: Any) -> None:
+    """
+    在 asyncpg 連線上註冊 vector 型別的二進位 codec
+
+    ABP 對比：
+    - ABP: NpgsqlDataSourceBuilder.UseVector()
+    """
+    await connection.set_type_codec(
+        "vector",
+        schema="public",
+        encoder=encode_vector,
+        decoder=decode_vector,
+        format="binary",
+    )
+
+
+class Float32Vector(VECTOR):
+    """
+    以 numpy float32 陣列表示的 pgvector 欄位
+
+    ABP 對比：
+    - ABP: modelBuilder.Property(x => x.Embedding).HasColumnType("vector(384)")
+    - 與 pgvector.sqlalchemy.Vector 的 DDL 與距離運算子相同，
+      但不做文字轉換：值原樣交給 asyncpg 的二進位 codec
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect: Dialect) -> Any:
+        return None
+
+    def result_processor(self, dialect: Dialect, coltype: Any) -> Any:
+        def process(value: Any) -> NDArray[np.float32] | None:
+            if value is None or isinstance(value, np.ndarray):
+                return value
+            # 未註冊 codec 的連線（例如第一次建立 extension 前）仍是文字格式
+            return np.array(value[1:-1].split(","), dtype=np.float32)
+
+        return process
@@ -0,0 +1,330 @@
+"""
+向量索引（ANN）管理
+
+ABP 對比：
+- ABP: EF Core Migration 中以 migrationBuilder.Sql("CREATE INDEX ...") 建立 pgvector 索引
+- Python: Alembic migration 呼叫這裡產生的 SQL；查詢參數以 set_config 設定
+
+設計說明：
+- 沒有索引時，每次搜尋都要對所有 chunks 計算 cosine 距離（sequential scan）
+- HNSW：查詢快、召回率高，建置較慢且較佔記憶體，可在空表上建立
+- IVFFlat：建置快、索引小，但分群依建立當下的資料而定，應在資料匯入後建立
+- 索引只由 migration 建立（CONCURRENTLY，不鎖寫入），不放在 ORM 模型上，
+  避免 Base.metadata.create_all 在啟動時以阻塞方式建置
+
+儲存精度（VECTOR_STORAGE，pgvector 0.7+）：
+- 資料表保留完整精度（float32）的向量，索引改建在精簡表示的運算式上：
+  halfvec（float16，索引約為一半大小）或 binary_quantize（每維 1 bit，約 1/32）
+- 查詢時以相同運算式排序才會使用索引，取出 oversampling 倍的候選後，
+  再以完整精度的 cosine 距離重新排序（見 compact_distance）
+- 更改 VECTOR_STORAGE 時以 python -m src.cli.vector_storage rebuild 建立對應的索引；
+  索引名稱帶有儲存精度的後綴，啟動時檢查設定的精度有可用的索引（check_vector_storage），
+  沒有時拒絕啟動，不會在沒有索引的運算式上逐列計算距離
+"""
+
+from typing import Any
+
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    String,
+    bindparam,
+    cast,
+    func,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.config import settings
+from src.domain.exceptions import ValidationError
+from src.domain.models.embedding import EmbeddingVector
+from src.infrastructure.persistence.types import Float32Vector
+
+VECTOR_INDEX_TYPES = ("hnsw", "ivfflat", "none")
+
+VECTOR_STORAGE_MODES = ("vector", "halfvec", "binary")
+
+ITERATIVE_SCAN_MODES = ("off", "strict_order", "relaxed_order")
+# ivfflat.iterative_scan 只接受 off / relaxed_order
+_IVFFLAT_ITERATIVE_SCAN = "relaxed_order"
+
+CHUNK_EMBEDDING_INDEX = "ix_document_chunks_embedding"
+
+DOCUMENT_EMBEDDING_INDEX = "ix_document_embeddings_embedding"
+
+# 有 ANN 索引的 (資料表, 索引名稱)
+_VECTOR_INDEXES = (
+    ("document_chunks", CHUNK_EMBEDDING_INDEX),
+    ("document_embeddings", DOCUMENT_EMBEDDING_INDEX),
+)
+
+# 各儲存精度的索引名稱後綴：切換時可先建立新索引再刪除舊索引
+_STORAGE_INDEX_SUFFIXES = {"vector": "", "halfvec": "_halfvec", "binary": "_bit"}
+
+# pgvector 允許的 hnsw.ef_search 範圍
+_EF_SEARCH_RANGE = (1, 1000)
+
+
+def _check_storage(storage: str) -> str:
+    if storage not in VECTOR_STORAGE_MODES:
+        raise ValueError(f"Unknown vector storage: {storage}")
+    return storage
+
+
+def vector_index_name(name: str, storage: str = "vector") -> str:
+    """依儲存精度決定索引名稱（"vector" 沿用原本的名稱）"""
+    return name + _STORAGE_INDEX_SUFFIXES[_check_storage(storage)]
+
+
+def _index_expression(column: str, storage: str) -> str:
+    """索引運算式與 operator class（查詢必須使用相同運算式，見 compact_distance）"""
+    dimension = int(settings.embedding_dimension)
+    if storage == "halfvec":
+        return f"(({column})::halfvec({dimension})) halfvec_cosine_ops"
+    if storage == "binary":
+        return f"((binary_quantize({column}))::bit({dimension})) bit_hamming_ops"
+    return f"{column} vector_cosine_ops"
+
+
+def create_vector_index_sql(
+    index_type: str | None = None,
+    *,
+    table: str = "document_chunks",
+    column: str = "embedding",
+    name: str = CHUNK_EMBEDDING_INDEX,
+    concurrently: bool = True,
+    storage: str = "vector",
+) -> str | None:
+    """
+    產生建立 cosine 距離 ANN 索引的 SQL（index_type 為 "none" 時回傳 None）
+
+    ABP 對比：
+    migrationBuilder.Sql(
+        "CREATE INDEX CONCURRENTLY ... USING hnsw (embedding vector_cosine_ops)");
+
+    storage 不是 "vector" 時建立精簡表示的運算式索引，名稱加上對應的後綴
+    """
+    index_type = index_type or settings.vector_index_type
+    if index_type not in VECTOR_INDEX_TYPES:
+        raise ValueError(f"Unknown vector index type: {index_type}")
+    if index_type == "none":
+        return None
+    name = vector_index_name(name, storage)
+
+    if index_type == "hnsw":
+        options = (
+            f"m = {int(settings.hnsw_m)}, "
+            f"ef_construction = {int(settings.hnsw_ef_construction)}"
+        )
+    else:
+        options = f"lists = {int(settings.ivfflat_lists)}"
+
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON {table} USING {index_type} ({_index_expression(column, storage)}) "
+        f"WITH ({options})"
+    )
+
+
+def drop_vector_index_sql(
+    name: str = CHUNK_EMBEDDING_INDEX,
+    *,
+    concurrently: bool = True,
+) -> str:
+    return f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}"
+
+
+def rebuild_vector_indexes_sql(storage: str, drop_others: bool = True) -> list[str]:
+    """
+    切換儲存精度：為 chunks 與文件層級嵌入建立新索引，之後再刪除其他精度的索引
+
+    ABP 對比：
+    - ABP: 在 migration 中依序執行多個 migrationBuilder.Sql(...)
+
+    先建後刪，切換期間搜尋仍有索引可用；
+    資料表中的完整精度向量不需要轉換，運算式索引建置時直接由現有的列計算
+    drop_others=False 時只建立新索引（仍以舊設定運作的行程繼續使用舊索引）
+    """
+    _check_storage(storage)
+    statements: list[str] = []
+    for table, name in _VECTOR_INDEXES:
+        sql = create_vector_index_sql(table=table, name=name, storage=storage)
+        if sql is None:
+            continue
+        statements.append(sql)
+        if drop_others:
+            statements.extend(
+                drop_vector_index_sql(vector_index_name(name, other))
+                for other in VECTOR_STORAGE_MODES
+                if other != storage
+            )
+    return statements
+
+
+async def vector_index_status(connection: AsyncConnection) -> dict[str, bool]:
+    """
+    現有的向量索引名稱 → 是否可用
+
+    CONCURRENTLY 建置中斷或失敗時會留下 invalid 的索引（planner 不會使用，
+    CREATE INDEX IF NOT EXISTS 也不會重建），視為不可用
+    """
+    names = [
+        vector_index_name(name, storage)
+        for _, name in _VECTOR_INDEXES
+        for storage in VECTOR_STORAGE_MODES
+    ]
+    result = await connection.execute(
+        text(
+            "SELECT c.relname, i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = ANY(:names)"
+        ).bindparams(bindparam("names", names, type_=ARRAY(String)))
+    )
+    return {name: valid for name, valid in result}
+
+
+def missing_vector_indexes(status: dict[str, bool], storage: str) -> list[str]:
+    """storage 需要、但不存在或不可用的索引名稱"""
+    _check_storage(storage)
+    return [
+        index
+        for _, name in _VECTOR_INDEXES
+        if not status.get(index := vector_index_name(name, storage))
+    ]
+
+
+async def check_vector_storage(connection: AsyncConnection) -> None:
+    """啟動時檢查：VECTOR_STORAGE 的 ANN 索引必須存在且可用，否則拋出 RuntimeError"""
+    if settings.vector_index_type == "none":
+        return
+    storage = _check_storage(settings.vector_storage)
+    missing = missing_vector_indexes(await vector_index_status(connection), storage)
+    if missing:
+        raise RuntimeError(
+            f"VECTOR_STORAGE={storage} needs the ANN indexes {', '.join(missing)}, "
+            "which do not exist or are invalid; run "
+            f"`python -m src.cli.vector_storage rebuild {storage}`"
+        )
+
+
+def compact_distance(
+    column: Any,
+    query_embedding: EmbeddingVector | ColumnElement[Any],
+    storage: str | None = None,
+) -> ColumnElement[float]:
+    """
+    與 ANN 索引運算式相同的距離（ORDER BY 此運算式時 planner 才會使用索引）
+
+    - vector: embedding <=> :query（即完整精度的 cosine 距離）
+    - halfvec: embedding::halfvec(n) <=> :query::halfvec(n)
+    - binary: binary_quantize(embedding)::bit(n) <~> binary_quantize(:query)::bit(n)
+      （Hamming 距離，只用於取出候選）
+
+    query_embedding 也可以是 SQL 運算式（例如批次搜尋中外層查詢列的向量欄位）
+    """
+    storage = _check_storage(storage or settings.vector_storage)
+    if storage == "vector":
+        return column.cosine_distance(query_embedding)
+
+    dimension = settings.embedding_dimension
+    # 明確轉型為 vector：參數以已註冊的 vector codec 傳輸，binary_quantize 也不會有多載歧義
+    if not isinstance(query_embedding, ColumnElement):
+        query_embedding = literal(query_embedding, Float32Vector(dimension))
+    query = cast(query_embedding, VECTOR(dimension))
+    if storage == "halfvec":
+        compact_type: Any = HALFVEC(dimension)
+        operator = "<=>"
+    else:
+        compact_type = BIT(dimension)
+        operator = "<~>"
+        column = func.binary_quantize(column)
+        query = func.binary_quantize(query)
+
+    return cast(column, compact_type).op(operator, return_type=Float)(
+        cast(query, compact_type)
+    )
+
+
+async def apply_search_defaults(connection: Any) -> None:
+    """
+    在 asyncpg 連線上設定查詢參數的預設值（session 層級）
+
+    ABP 對比：
+    - ABP: NpgsqlConnection 開啟後執行 "SET hnsw.ef_search = ..."
+
+    pgvector 0.8+ 另外開啟 iterative index scan：
+    所有搜尋都會依 owner_id 過濾，ANN 索引掃描後被過濾掉的列
+    會讓結果少於 limit，iterative scan 會繼續掃描直到湊滿為止
+    （ivfflat 只支援 relaxed_order，strict_order 時 ivfflat 改用 relaxed_order）
+    """
+    statements = [
+        f"SET hnsw.ef_search = {int(settings.hnsw_ef_search)}",
+        f"SET ivfflat.probes = {int(settings.ivfflat_probes)}",
+    ]
+
+    mode = settings.vector_iterative_scan
+    if mode not in ITERATIVE_SCAN_MODES:
+        raise ValueError(f"Unknown iterative scan mode: {mode}")
+    if mode != "off" and await _pgvector_version(connection) >= (0, 8):
+        statements.append(f"SET hnsw.iterative_scan = {mode}")
+        statements.append(f"SET ivfflat.iterative_scan = {_IVFFLAT_ITERATIVE_SCAN}")
+
+    await connection.execute("; ".join(statements))
+
+
+async def _pgvector_version(connection: Any) -> tuple[int, ...]:
+    version = await connection.fetchval(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )
+    if version is None:
+        return ()
+    return tuple(int(part) for part in version.split(".") if part.isdigit())
+
+
+class VectorSearchTuner:
+    """
+    單次搜尋的召回率 / 延遲參數（hnsw.ef_search / ivfflat.probes）
+
+    ABP 對比：
+    - ABP: 在同一個 DbTransaction 中執行 "SET LOCAL ..." 後再查詢
+
+    設計說明：
+    - 連線預設值來自 Settings（見 apply_search_defaults）
+    - 有覆寫時以 set_config(..., is_local => true) 設定，只影響目前交易
+    - 覆寫過之後，下一次沒有覆寫的搜尋會還原成預設值，避免沿用上一次的參數
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._overridden = False
+
+    async def apply(
+        self,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> None:
+        if ef_search is None and probes is None and not self._overridden:
+            return
+
+        ef_search = settings.hnsw_ef_search if ef_search is None else ef_search
+        probes = settings.ivfflat_probes if probes is None else probes
+        low, high = _EF_SEARCH_RANGE
+        if not low <= ef_search <= high:
+            raise ValidationError(f"ef_search must be between {low} and {high}")
+        if probes < 1:
+            raise ValidationError("probes must be at least 1")
+
+        await self._session.execute(
+            select(
+                func.set_config("hnsw.ef_search", str(ef_search), True),
+                func.set_config("ivfflat.probes", str(probes), True),
+            )
+        )
+        self._overridden = (ef_search, probes) != (
+            settings.hnsw_ef_search,
+            settings.ivfflat_probes,
+        )
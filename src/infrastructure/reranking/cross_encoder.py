@@ -0,0 +1,181 @@
+"""
+Cross-encoder 重新排序（第二階段排序）
+
+ABP 對比：
+- ABP: public class CrossEncoderReranker : IReranker, ISingletonDependency
+- Python: sentence-transformers 的 CrossEncoder，在 EmbeddingExecutor 中批次推論
+
+設計說明：
+- 第一階段（bi-encoder 向量搜尋）只比較查詢與 chunk 各自的向量，速度快但較粗略
+- cross-encoder 把 (查詢, chunk 內容) 一起送進模型評分，較準確但成本與候選數成正比，
+  因此只用於第一階段的前 K 名
+- 分數以 (查詢雜湊, chunk_id) 快取：chunk 內容改變時會產生新的 chunk_id，不會讀到舊分數
+- 每次評分有時間預算，逾時回傳 None，由呼叫端改用第一階段的排序
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache, partial
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.config import settings
+from src.infrastructure.caching.lru_cache import BoundedLRUCache, CacheStats
+from src.infrastructure.embeddings.executor import get_embedding_executor
+from src.infrastructure.embeddings.query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# (查詢雜湊, chunk_id)
+RerankCacheKey = tuple[str, str]
+
+
+@lru_cache(maxsize=2)
+def _load_model(model_name: str):
+    """依模型名稱載入並快取 CrossEncoder（每個 worker 行程各載入一次）"""
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name)
+
+
+def _predict(model_name: str, query: str, passages: list[str]) -> NDArray[np.float32]:
+    """模組層級的推論函式（可被 pickle，供 Process Pool 使用）"""
+    model = _load_model(model_name)
+    scores = model.predict([(query, passage) for passage in passages])
+    return np.asarray(scores, dtype=np.float32)
+
+
+@dataclass
+class RerankerStats:
+    """
+    重新排序指標快照
+
+    ABP 對比：
+    - ABP 通常透過 IMetrics / OpenTelemetry Meter 暴露類似數值
+    """
+
+    model_name: str
+    batches: int
+    scored_pairs: int
+    fallbacks: int
+    cache: CacheStats
+
+
+class CrossEncoderReranker:
+    """
+    Cross-encoder 重新排序器（Singleton，快取跨請求共用）
+
+    ABP 對比：
+    public class CrossEncoderReranker
+    {
+        public Dictionary<Guid, float> GetCachedScores(string query, List<Guid> chunkIds);
+        public Task<Dictionary<Guid, float>?> ScoreAsync(
+            string query, Dictionary<Guid, string> passages, TimeSpan budget);
+    }
+    """
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        max_entries: int = 100_000,
+        ttl_seconds: float | None = 3600,
+    ):
+        self._model_name = model_name or settings.rerank_model
+        self._cache: BoundedLRUCache[RerankCacheKey, float] = BoundedLRUCache(
+            max_entries=max_entries,
+            max_bytes=0,  # 每筆只有一個分數，只以筆數限制
+            ttl_seconds=ttl_seconds,
+        )
+
+        self._batches = 0
+        self._scored_pairs = 0
+        self._fallbacks = 0
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    def query_key(self, query: str) -> str:
+        """查詢雜湊（含模型名稱，換模型不會誤用舊分數）"""
+        payload = f"{self._model_name}\0{normalize_query(query)}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def cached_scores(self, query: str, chunk_ids: list[str]) -> dict[str, float]:
+        """取得已快取的分數（chunk_id -> score），未命中的 chunk 不在結果中"""
+        query_key = self.query_key(query)
+        scores: dict[str, float] = {}
+        for chunk_id in chunk_ids:
+            score = self._cache.get((query_key, chunk_id))
+            if score is not None:
+                scores[chunk_id] = score
+        return scores
+
+    async def score(
+        self,
+        query: str,
+        passages: dict[str, str],
+        timeout: float,
+    ) -> dict[str, float] | None:
+        """
+        以一次批次推論為 (查詢, chunk 內容) 評分並寫入快取
+
+        ABP 對比：
+        using var cts = new CancellationTokenSource(budget);
+        var scores = await Task.Run(() => _model.Predict(pairs), cts.Token);
+
+        - 在 EmbeddingExecutor 中執行，不阻塞 event loop，並共用其排隊上限
+        - 超過 timeout 秒回傳 None（呼叫端改用第一階段的排序）；
+          已送進 worker 的推論無法中斷，結果會被丟棄
+        """
+        if not passages:
+            return {}
+
+        chunk_ids = list(passages)
+        task = partial(_predict, self._model_name, normalize_query(query))
+        try:
+            async with asyncio.timeout(max(timeout, 0.0)):
+                values = await get_embedding_executor().run(
+                    task, [passages[chunk_id] for chunk_id in chunk_ids]
+                )
+        except TimeoutError:
+            self._fallbacks += 1
+            logger.warning(
+                f"Reranking {len(chunk_ids)} chunks exceeded the "
+                f"{timeout * 1000:.0f} ms budget, using first-stage order"
+            )
+            return None
+
+        self._batches += 1
+        self._scored_pairs += len(chunk_ids)
+
+        query_key = self.query_key(query)
+        scores = dict(zip(chunk_ids, values.tolist()))
+        for chunk_id, value in scores.items():
+            self._cache.set((query_key, chunk_id), value)
+        return scores
+
+    def stats(self) -> RerankerStats:
+        return RerankerStats(
+            model_name=self._model_name,
+            batches=self._batches,
+            scored_pairs=self._scored_pairs,
+            fallbacks=self._fallbacks,
+            cache=self._cache.stats(),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_reranker() -> CrossEncoderReranker:
+    """
+    取得重新排序器（Singleton，模型在第一次評分時才載入）
+
+    ABP 對比：
+    - ABP: services.AddSingleton<CrossEncoderReranker>()
+    """
+    return CrossEncoderReranker(
+        max_entries=settings.rerank_cache_max_entries,
+        ttl_seconds=settings.rerank_cache_ttl_seconds,
+    )
@@ -6,9 +6,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.graphql.router import graphql_router
+from src.application.services.indexing_worker import get_indexing_worker_pool
+from src.application.services.reembed_service import check_embedding_settings
 from src.config import settings
-from src.infrastructure.persistence.database import Base, engine, async_session_factory
+from src.infrastructure.embeddings.executor import get_embedding_executor
+from src.infrastructure.embeddings.local_embeddings import get_embedding_service
+from src.infrastructure.persistence.database import engine, async_session_factory
+from src.infrastructure.persistence.schema import check_schema_revision, upgrade_schema
 from src.infrastructure.persistence.seeding import DataSeederManager
+from src.infrastructure.persistence.vector_index import check_vector_storage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,10 +22,20 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create data directory and tables
+    # Startup: Create data directory and check the database schema
     Path("data").mkdir(exist_ok=True)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # ABP 對比：DbMigrator 執行 migration；資料表只由 Alembic 建立與升級
+    if settings.database_auto_migrate:
+        logger.info("Running database migrations...")
+        await upgrade_schema()
+    async with engine.connect() as conn:
+        await check_schema_revision(conn)
+        # VECTOR_STORAGE 的 ANN 索引必須存在（更改後以 src.cli.vector_storage 建立）
+        await check_vector_storage(conn)
+
+    # 全庫重新嵌入切換後，查詢向量必須使用切換後的模型
+    async with async_session_factory() as session:
+        await check_embedding_settings(session, get_embedding_service())
 
     # ABP 對比：ABP 在 OnApplicationInitializationAsync 中執行種子資料
     # 執行資料種子
@@ -34,8 +50,14 @@ async def lifespan(app: FastAPI):
             logger.error(f"Data seeding failed: {e}")
             raise
 
+    # 背景索引 worker：處理 indexing_jobs 中（包含上次關閉前）尚未完成的工作
+    if settings.indexing_workers > 0:
+        get_indexing_worker_pool().start()
+
     yield
-    # Shutdown
+    # Shutdown：先讓 worker 完成處理中的批次，再關閉嵌入執行器與連線
+    await get_indexing_worker_pool().stop()
+    get_embedding_executor().shutdown()
     await engine.dispose()
 
 
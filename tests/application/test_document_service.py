@@ -0,0 +1,44 @@
+"""DocumentService.update_document：只有 title、content 與分塊方式都未變時才視為 no-op"""
+
+import asyncio
+
+from src.application.services.document_service import DocumentService
+from src.domain.models.document import Document
+
+
+class _FakeDocumentRepository:
+    def __init__(self, document: Document):
+        self.document = document
+        self.saved: list[Document] = []
+
+    async def get_by_id(self, id: str) -> Document | None:
+        return self.document if id == self.document.id else None
+
+    async def save(self, document: Document) -> Document:
+        self.saved.append(document)
+        return document
+
+
+def _update(
+    document: Document, title: str | None, content: str | None
+) -> list[Document]:
+    service = DocumentService(session=None)  # type: ignore[arg-type]
+    repository = _FakeDocumentRepository(document)
+    service._doc_repo = repository  # type: ignore[assignment]
+
+    asyncio.run(service.update_document(document.id, title, content, "owner"))
+    return repository.saved
+
+
+def test_moving_text_between_title_and_content_is_saved():
+    document = Document(id="doc", title="a", content="b\n\nc", owner_id="owner")
+
+    saved = _update(document, "a\n\nb", "c")
+
+    assert [(doc.title, doc.content) for doc in saved] == [("a\n\nb", "c")]
+
+
+def test_resending_the_same_title_and_content_is_a_no_op():
+    document = Document(id="doc", title="a", content="b", owner_id="owner")
+
+    assert _update(document, "a", "b") == []
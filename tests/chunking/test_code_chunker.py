@@ -0,0 +1,47 @@
+"""CodeChunker：過長定義切開後的重疊只由外層視窗加入一次"""
+
+import itertools
+
+from src.infrastructure.chunking.code_chunker import CodeChunker
+from src.infrastructure.chunking.token_counters import CharacterCounter
+
+_CLASS = """\
+class A:
+    def one(self):
+        x = 1
+        return x
+
+    def two(self):
+        y = 2
+        return y
+"""
+
+
+def _chunks() -> list[str]:
+    return list(CodeChunker(CharacterCounter(), 45, 20).chunk(_CLASS))
+
+
+def test_split_class_has_no_duplicated_or_stray_fragments():
+    chunks = _chunks()
+
+    assert all(len(chunk) <= 45 for chunk in chunks)
+    for chunk in chunks:
+        lines = [line.strip() for line in chunk.split("\n") if line.strip()]
+        assert len(lines) == len(set(lines)), chunk
+        # 只有完整的行，不會有從行中間切開的片段（例如 "self):"）
+        assert all(
+            any(source.strip() == line for source in _CLASS.splitlines())
+            for line in lines
+        ), chunk
+
+
+def test_every_line_is_kept_and_adjacent_chunks_overlap():
+    chunks = _chunks()
+
+    for line in _CLASS.splitlines():
+        if line.strip():
+            assert any(line.strip() in chunk for chunk in chunks), line
+    for previous, current in itertools.pairwise(chunks):
+        first_line = current.split("\n")[0].strip()
+        assert first_line
+        assert first_line in previous
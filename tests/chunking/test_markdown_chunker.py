@@ -0,0 +1,31 @@
+"""MarkdownChunker：過長段落切開後的重疊只由外層視窗加入一次"""
+
+from src.infrastructure.chunking.markdown_chunker import MarkdownChunker
+from src.infrastructure.chunking.token_counters import CharacterCounter
+
+
+def test_split_paragraph_overlap_is_not_duplicated():
+    chunker = MarkdownChunker(CharacterCounter(), 50, 20)
+
+    chunks = list(
+        chunker.chunk("Alpha beta gamma delta epsilon zeta eta theta. Iota kappa.")
+    )
+
+    assert chunks == [
+        "Alpha beta gamma delta epsilon zeta eta theta.",
+        "zeta eta theta.\n\nIota kappa.",
+    ]
+
+
+def test_split_list_keeps_each_line_once_per_chunk():
+    chunker = MarkdownChunker(CharacterCounter(), 40, 15)
+    items = [f"- item number {i} with some words" for i in range(6)]
+
+    chunks = list(chunker.chunk("\n".join(items)))
+
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    for chunk in chunks:
+        lines = [line for line in chunk.split("\n") if line]
+        assert len(lines) == len(set(lines)), chunk
+    # 每一項都至少出現在一個 chunk 中
+    assert all(any(item in chunk for chunk in chunks) for item in items)
@@ -0,0 +1,58 @@
+"""SentenceChunker：過長的句子在詞之間切開，相鄰兩塊之間仍保留重疊"""
+
+import itertools
+
+from src.infrastructure.chunking.sentence_chunker import SentenceChunker
+from src.infrastructure.chunking.token_counters import CharacterCounter
+
+_TEXT = (
+    "alpha beta gamma delta epsilon zeta eta theta iota kappa "
+    "lambda mu nu xi omicron pi rho sigma tau upsilon"
+)
+_WORDS = _TEXT.split()
+
+
+def _chunks() -> list[str]:
+    return list(SentenceChunker(CharacterCounter(), 40, 10).chunk(_TEXT))
+
+
+def test_long_sentence_is_split_between_words():
+    chunks = _chunks()
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert all(word in _WORDS for chunk in chunks for word in chunk.split())
+
+
+def _shared(previous: list[str], current: list[str]) -> int:
+    """previous 的結尾與 current 的開頭相同的詞數"""
+    return max(
+        (n for n in range(1, len(current)) if previous[-n:] == current[:n]),
+        default=0,
+    )
+
+
+def test_long_sentence_pieces_share_overlap():
+    chunks = [chunk.split() for chunk in _chunks()]
+
+    for previous, current in itertools.pairwise(chunks):
+        assert _shared(previous, current) > 0, (previous, current)
+
+
+def test_long_sentence_keeps_every_word_in_order():
+    chunks = [chunk.split() for chunk in _chunks()]
+
+    words = list(chunks[0])
+    for previous, current in itertools.pairwise(chunks):
+        words.extend(current[_shared(previous, current) :])
+
+    assert words == _WORDS
+
+
+def test_long_word_is_not_used_as_a_partial_overlap():
+    text = "Splitting supercalifragilisticexpialidocious words across chunks"
+
+    chunks = list(SentenceChunker(CharacterCounter(), 20, 6).chunk(text))
+
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert "".join("".join(chunks).split()) == "".join(text.split())
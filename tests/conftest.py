@@ -0,0 +1,5 @@
+"""測試共用設定：Settings 的必填欄位在匯入 src 之前提供"""
+
+import os
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")